@@ -1,64 +1,83 @@
-import pandas as pd
+from __future__ import annotations
+import argparse
 import numpy as np
 
-# Analyze exhaustive results
-df_ex = pd.read_csv('results/exhaustive_results.csv')
+from results_store import load_table, groupby, select
 
-print("=" * 60)
-print("EXHAUSTIVE RESULTS ANALYSIS")
-print("=" * 60)
+def report_exhaustive(df_ex):
+    """Approximation ratios and optimality counts of the greedy rules per alpha."""
+    print("=" * 60)
+    print("EXHAUSTIVE RESULTS ANALYSIS")
+    print("=" * 60)
 
-for alpha in sorted(df_ex['alpha'].unique()):
-    subset = df_ex[df_ex['alpha'] == alpha]
-    print(f"\n\nAlpha = {alpha} (n={sorted(subset['n'].unique())})")
-    print("-" * 40)
-    
-    eft_ratio = (subset['greedy_EFT_count'] / subset['opt_count']).mean()
-    est_ratio = (subset['greedy_EST_count'] / subset['opt_count']).mean()
-    sd_ratio = (subset['greedy_SD_count'] / subset['opt_count']).mean()
-    
-    print(f"  EFT approximation ratio: {eft_ratio:.4f} (perfect={eft_ratio==1.0})")
-    print(f"  EST approximation ratio: {est_ratio:.4f}")
-    print(f"  SD  approximation ratio: {sd_ratio:.4f}")
-    
-    # Check EFT optimality
-    eft_optimal = (subset['greedy_EFT_count'] == subset['opt_count']).all()
-    print(f"\n  EFT always optimal: {eft_optimal}")
-    print(f"  EST matches optimal: {(subset['greedy_EST_count'] == subset['opt_count']).sum()}/{len(subset)} cases")
-    print(f"  SD matches optimal:  {(subset['greedy_SD_count'] == subset['opt_count']).sum()}/{len(subset)} cases")
+    for alpha in np.unique(df_ex['alpha']):
+        subset = select(df_ex, df_ex['alpha'] == alpha)
+        print(f"\n\nAlpha = {alpha} (n={sorted(np.unique(subset['n']).tolist())})")
+        print("-" * 40)
 
-# Analyze greedy results - runtime scaling
-print("\n\n" + "=" * 60)
-print("GREEDY RUNTIME ANALYSIS")
-print("=" * 60)
+        eft_ratio = (subset['greedy_EFT_count'] / subset['opt_count']).mean()
+        est_ratio = (subset['greedy_EST_count'] / subset['opt_count']).mean()
+        sd_ratio = (subset['greedy_SD_count'] / subset['opt_count']).mean()
 
-df_gr = pd.read_csv('results/greedy_results.csv')
+        print(f"  EFT approximation ratio: {eft_ratio:.4f} (perfect={eft_ratio==1.0})")
+        print(f"  EST approximation ratio: {est_ratio:.4f}")
+        print(f"  SD  approximation ratio: {sd_ratio:.4f}")
 
-for alpha in sorted(df_gr['alpha'].unique()):
-    subset = df_gr[df_gr['alpha'] == alpha]
-    grouped = subset.groupby('n').agg({
-        't_EFT': 'mean',
-        't_EST': 'mean',
-        't_SD': 'mean'
-    })
-    
-    print(f"\n\nAlpha = {alpha}")
-    print("-" * 40)
-    print(f"{'n':<10} {'EFT (s)':<12} {'EST (s)':<12} {'SD (s)':<12}")
-    print("-" * 40)
-    for n in sorted(grouped.index):
-        print(f"{n:<10} {grouped.loc[n, 't_EFT']:.6f}    {grouped.loc[n, 't_EST']:.6f}    {grouped.loc[n, 't_SD']:.6f}")
+        # Check EFT optimality
+        eft_optimal = (subset['greedy_EFT_count'] == subset['opt_count']).all()
+        print(f"\n  EFT always optimal: {eft_optimal}")
+        print(f"  EST matches optimal: {(subset['greedy_EST_count'] == subset['opt_count']).sum()}/{len(subset['n'])} cases")
+        print(f"  SD matches optimal:  {(subset['greedy_SD_count'] == subset['opt_count']).sum()}/{len(subset['n'])} cases")
 
-# Exhaustive runtime scaling
-print("\n\n" + "=" * 60)
-print("EXHAUSTIVE RUNTIME SCALING")
-print("=" * 60)
+def report_greedy_runtime(df_gr):
+    """Mean greedy runtimes per (alpha, n)."""
+    print("\n\n" + "=" * 60)
+    print("GREEDY RUNTIME ANALYSIS")
+    print("=" * 60)
 
-for alpha in sorted(df_ex['alpha'].unique()):
-    subset = df_ex[df_ex['alpha'] == alpha]
-    grouped = subset.groupby('n')['t_exhaustive'].mean()
-    
-    print(f"\nAlpha = {alpha}")
-    print("-" * 40)
-    for n in sorted(grouped.index):
-        print(f"  n={n:2d}: {grouped[n]:.6f} seconds")
+    grouped = groupby(df_gr, keys=['alpha', 'n'], values=['t_EFT', 't_EST', 't_SD'])
+    for alpha in np.unique(grouped['alpha']):
+        subset = select(grouped, grouped['alpha'] == alpha)
+
+        print(f"\n\nAlpha = {alpha}")
+        print("-" * 40)
+        print(f"{'n':<10} {'EFT (s)':<12} {'EST (s)':<12} {'SD (s)':<12}")
+        print("-" * 40)
+        for n, t_eft, t_est, t_sd in zip(subset['n'], subset['t_EFT_mean'], subset['t_EST_mean'], subset['t_SD_mean']):
+            print(f"{n:<10} {t_eft:.6f}    {t_est:.6f}    {t_sd:.6f}")
+
+def report_exhaustive_runtime(df_ex):
+    """Mean exhaustive runtimes per (alpha, n)."""
+    print("\n\n" + "=" * 60)
+    print("EXHAUSTIVE RUNTIME SCALING")
+    print("=" * 60)
+
+    grouped = groupby(df_ex, keys=['alpha', 'n'], values=['t_exhaustive'])
+    for alpha in np.unique(grouped['alpha']):
+        subset = select(grouped, grouped['alpha'] == alpha)
+
+        print(f"\nAlpha = {alpha}")
+        print("-" * 40)
+        for n, t in zip(subset['n'], subset['t_exhaustive_mean']):
+            print(f"  n={n:2d}: {t:.6f} seconds")
+
+def analyze(results_dir: str="results", source: str="csv"):
+    """Print the exhaustive and greedy summaries for one results directory (tables that are missing are skipped)."""
+    df_ex = load_table(results_dir, 'exhaustive', source=source)
+    df_gr = load_table(results_dir, 'greedy', source=source)
+    if df_ex is not None:
+        report_exhaustive(df_ex)
+    if df_gr is not None:
+        report_greedy_runtime(df_gr)
+    if df_ex is not None:
+        report_exhaustive_runtime(df_ex)
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--results_dir", default="results")
+    ap.add_argument("--source", choices=["csv", "store"], default="csv")
+    args = ap.parse_args()
+    analyze(args.results_dir, source=args.source)
+
+if __name__ == "__main__":
+    main()
@@ -1,139 +1,43 @@
 from __future__ import annotations
-import argparse, os, time, csv, statistics
-import numpy as np
+import argparse
 
-from datasets import generate_uniform_intervals
-from greedy import greedy_earliest_finish, greedy_earliest_start, greedy_shortest_duration
-from exhaustive import exhaustive_optimal
-
-def _now():
-    return time.perf_counter()
-
-def run_greedy_suite(intervals: np.ndarray):
-    # Return counts for all three greedy criteria
-    return {
-        "EFT": greedy_earliest_finish(intervals).count,
-        "EST": greedy_earliest_start(intervals).count,
-        "SD":  greedy_shortest_duration(intervals).count,
-    }
-
-def time_fn(fn, *args, warmup: bool=True, repeat: int=1):
-    # High-resolution timer; optional warmup call
-    if warmup:
-        fn(*args)
-    t0 = _now()
-    for _ in range(repeat):
-        fn(*args)
-    t1 = _now()
-    return (t1 - t0) / repeat
-
-def ensure_dir(p: str):
-    os.makedirs(p, exist_ok=True)
-
-def benchmark_greedy(results_dir: str, trials: int, D: int, alphas: list[float], n_pows: list[int], seed: int):
-    ensure_dir(results_dir)
-    out_csv = os.path.join(results_dir, "greedy_results.csv")
-
-    rng = np.random.default_rng(seed)
-
-    # CSV header
-    header = [
-        "alpha","D","n","trial",
-        "t_EFT","t_EST","t_SD",
-        "count_EFT","count_EST","count_SD"
-    ]
-
-    total_runs = len(alphas) * len(n_pows) * trials
-    run_count = 0
-
-    with open(out_csv, "w", newline="", encoding="utf-8") as f:
-        w = csv.writer(f)
-        w.writerow(header)
-
-        for alpha in alphas:
-            for p in n_pows:
-                n = 2 ** p
-                print(f"\n[Progress] alpha={alpha}, n=2^{p}={n}")
-                # Generate once per trial but EXCLUDE generation time from timing
-                for trial in range(1, trials+1):
-                    run_count += 1
-                    print(f"  Trial {trial}/{trials} (Run {run_count}/{total_runs})...", end=" ", flush=True)
-                    intervals, _ = generate_uniform_intervals(n=n, D=D, alpha=alpha, rng=rng)
-
-                    # Warm-up run (excluded): call each algo once on a small slice to "warm" Python internals.
-                    _ = run_greedy_suite(intervals[: min(2000, n)])
-
-                    # Time each greedy algorithm (exclude generation time)
-                    t_eft = time_fn(greedy_earliest_finish, intervals, warmup=False)
-                    t_est = time_fn(greedy_earliest_start,  intervals, warmup=False)
-                    t_sd  = time_fn(greedy_shortest_duration, intervals, warmup=False)
-
-                    counts = run_greedy_suite(intervals)
-
-                    w.writerow([
-                        alpha, D, n, trial,
-                        t_eft, t_est, t_sd,
-                        counts["EFT"], counts["EST"], counts["SD"]
-                    ])
-                    print(f"Done! (EFT: {t_eft:.6f}s, EST: {t_est:.6f}s, SD: {t_sd:.6f}s)")
-                f.flush()  # Flush after each n value to save progress
-
-    print(f"[OK] Saved greedy trials to: {out_csv}")
-
-def benchmark_exhaustive(results_dir: str, trials: int, D: int, alphas: list[float], n_list: list[int], seed: int):
-    ensure_dir(results_dir)
-    out_csv = os.path.join(results_dir, "exhaustive_results.csv")
-
-    rng = np.random.default_rng(seed)
-
-    header = [
-        "alpha","D","n","trial",
-        "t_exhaustive","opt_count",
-        "greedy_EFT_count","greedy_EST_count","greedy_SD_count"
-    ]
-
-    total_runs = len(alphas) * len(n_list) * trials
-    run_count = 0
-
-    with open(out_csv, "w", newline="", encoding="utf-8") as f:
-        w = csv.writer(f)
-        w.writerow(header)
-
-        for alpha in alphas:
-            for n in n_list:
-                print(f"\n[Progress] alpha={alpha}, n={n}")
-                for trial in range(1, trials+1):
-                    run_count += 1
-                    print(f"  Trial {trial}/{trials} (Run {run_count}/{total_runs})...", end=" ", flush=True)
-                    intervals, _ = generate_uniform_intervals(n=n, D=D, alpha=alpha, rng=rng)
-
-                    # Warm-up (excluded)
-                    _ = exhaustive_optimal(intervals[: min(n, 10)], return_selected=False)
-
-                    # Time exhaustive (exclude generation time)
-                    t_opt = time_fn(exhaustive_optimal, intervals, False, warmup=False)
-
-                    opt = exhaustive_optimal(intervals, return_selected=False).count
-                    greedy_counts = run_greedy_suite(intervals)
-
-                    w.writerow([
-                        alpha, D, n, trial,
-                        t_opt, opt,
-                        greedy_counts["EFT"], greedy_counts["EST"], greedy_counts["SD"]
-                    ])
-                    print(f"Done! (Exhaustive: {t_opt:.6f}s, opt_count={opt})")
-                f.flush()  # Flush after each n value to save progress
-
-    print(f"[OK] Saved exhaustive trials to: {out_csv}")
+import benchmark_suites as suites
+from datasets import DatasetStore, INTERVAL_DTYPES
+from exhaustive import ENGINES as EXHAUSTIVE_ENGINES
+from generators import FAMILIES
+from sorting import SORT_ENGINES
 
 def main():
     ap = argparse.ArgumentParser()
-    ap.add_argument("--mode", choices=["greedy","exhaustive"], required=True)
+    ap.add_argument("--mode", choices=["greedy","exhaustive","weighted","updates","partition","precision","sort","ratio"],
+                    required=True)
     ap.add_argument("--results_dir", default="results")
     ap.add_argument("--trials", type=int, default=10)
     ap.add_argument("--D", type=int, default=10)
     ap.add_argument("--alphas", type=float, nargs="+", default=[0.1, 1.0, 5.0])
     ap.add_argument("--seed", type=int, default=0)
+    # Reuse datasets across runs: cells are written once as .npy and reopened memory-mapped
+    ap.add_argument("--dataset_cache", default=None)
+    # Parallel cells: 1 = sequential, 0 = one worker per physical core
+    ap.add_argument("--workers", type=int, default=1)
+    ap.add_argument("--pin_cpus", action="store_true", help="pin each worker to its own physical core")
+    ap.add_argument("--resume", action="store_true", help="append to the CSV, skipping cells already in it")
+    # Timing: each measurement repeats until it has covered at least this much wall time
+    ap.add_argument("--min_time", type=float, default=0.2)
+    # Add per-phase time / allocation columns (greedy and exhaustive modes)
+    ap.add_argument("--phases", action="store_true")
+    # Weighted mode: priorities drawn from Uniform[1, W]
+    ap.add_argument("--W", type=int, default=10)
+    # Precision mode: interval column dtypes to compare (float64 / float32 / integer ticks)
+    ap.add_argument("--dtypes", nargs="+", choices=list(INTERVAL_DTYPES), default=list(INTERVAL_DTYPES))
+    # Sort mode: stable sort engines to compare, on datasets of this dtype (radix/counting need integer ticks)
+    ap.add_argument("--sort_engines", nargs="+", choices=list(SORT_ENGINES), default=list(SORT_ENGINES))
+    ap.add_argument("--dtype", choices=list(INTERVAL_DTYPES), default="int64")
+    # Ratio mode: dataset families (see generators.py) and the largest n cross-checked by exhaustive search
+    ap.add_argument("--families", nargs="+", choices=list(FAMILIES), default=["uniform"])
+    ap.add_argument("--check_n", type=int, default=32)
+    # Updates mode: number of insert/remove operations per cell
+    ap.add_argument("--updates", type=int, default=1000)
 
     # Greedy input sizes: 2^10..2^20
     ap.add_argument("--n_pow_min", type=int, default=10)
@@ -141,27 +45,144 @@ def main():
 
     # Exhaustive input sizes (you can override)
     ap.add_argument("--exhaustive_n", type=int, nargs="+", default=[5,10,15,20])
+    # Optimal solver engine: "enumerate" is the O(n 2^n) study; "dp"/"bnb" give exact counts at large n,
+    # "parallel" is a generic bitmask search over a process pool for ground truth up to n ~ 40
+    ap.add_argument("--exhaustive_engine", choices=list(EXHAUSTIVE_ENGINES), default="enumerate")
+    # Processes inside one "parallel" search (0 = one per CPU); keep --workers 1 so the two do not compete
+    ap.add_argument("--exhaustive_workers", type=int, default=0)
 
     args = ap.parse_args()
+    store = DatasetStore(args.dataset_cache) if args.dataset_cache else None
 
     if args.mode == "greedy":
         n_pows = list(range(args.n_pow_min, args.n_pow_max+1))
-        benchmark_greedy(
+        suites.benchmark_greedy(
+            results_dir=args.results_dir,
+            trials=args.trials,
+            D=args.D,
+            alphas=args.alphas,
+            n_pows=n_pows,
+            seed=args.seed,
+            store=store,
+            workers=args.workers,
+            resume=args.resume,
+            pin_cpus=args.pin_cpus,
+            min_time=args.min_time,
+            phases=args.phases
+        )
+    elif args.mode == "updates":
+        n_pows = list(range(args.n_pow_min, args.n_pow_max+1))
+        suites.benchmark_updates(
+            results_dir=args.results_dir,
+            trials=args.trials,
+            D=args.D,
+            alphas=args.alphas,
+            n_pows=n_pows,
+            seed=args.seed,
+            updates=args.updates,
+            store=store,
+            workers=args.workers,
+            resume=args.resume,
+            pin_cpus=args.pin_cpus,
+            min_time=args.min_time
+        )
+    elif args.mode == "weighted":
+        n_pows = list(range(args.n_pow_min, args.n_pow_max+1))
+        suites.benchmark_weighted(
+            results_dir=args.results_dir,
+            trials=args.trials,
+            D=args.D,
+            W=args.W,
+            alphas=args.alphas,
+            n_pows=n_pows,
+            seed=args.seed,
+            store=store,
+            workers=args.workers,
+            resume=args.resume,
+            pin_cpus=args.pin_cpus,
+            min_time=args.min_time
+        )
+    elif args.mode == "sort":
+        n_pows = list(range(args.n_pow_min, args.n_pow_max+1))
+        suites.benchmark_sort(
+            results_dir=args.results_dir,
+            trials=args.trials,
+            D=args.D,
+            alphas=args.alphas,
+            n_pows=n_pows,
+            seed=args.seed,
+            sort_engines=args.sort_engines,
+            dtype=args.dtype,
+            store=store,
+            workers=args.workers,
+            resume=args.resume,
+            pin_cpus=args.pin_cpus,
+            min_time=args.min_time
+        )
+    elif args.mode == "ratio":
+        # Small --exhaustive_n sizes are cross-checked (up to --check_n), 2^n_pow_min..2^n_pow_max use EFT alone
+        n_list = sorted(set(args.exhaustive_n) | {2 ** p for p in range(args.n_pow_min, args.n_pow_max+1)})
+        suites.benchmark_ratio(
+            results_dir=args.results_dir,
+            trials=args.trials,
+            D=args.D,
+            alphas=args.alphas,
+            n_list=n_list,
+            seed=args.seed,
+            families=args.families,
+            check_n=args.check_n,
+            store=store,
+            workers=args.workers,
+            resume=args.resume,
+            pin_cpus=args.pin_cpus
+        )
+    elif args.mode == "precision":
+        n_pows = list(range(args.n_pow_min, args.n_pow_max+1))
+        suites.benchmark_precision(
+            results_dir=args.results_dir,
+            trials=args.trials,
+            D=args.D,
+            alphas=args.alphas,
+            n_pows=n_pows,
+            seed=args.seed,
+            dtypes=args.dtypes,
+            store=store,
+            workers=args.workers,
+            resume=args.resume,
+            pin_cpus=args.pin_cpus,
+            min_time=args.min_time
+        )
+    elif args.mode == "partition":
+        n_pows = list(range(args.n_pow_min, args.n_pow_max+1))
+        suites.benchmark_partition(
             results_dir=args.results_dir,
             trials=args.trials,
             D=args.D,
             alphas=args.alphas,
             n_pows=n_pows,
-            seed=args.seed
+            seed=args.seed,
+            store=store,
+            workers=args.workers,
+            resume=args.resume,
+            pin_cpus=args.pin_cpus,
+            min_time=args.min_time
         )
     else:
-        benchmark_exhaustive(
+        suites.benchmark_exhaustive(
             results_dir=args.results_dir,
             trials=args.trials,
             D=args.D,
             alphas=args.alphas,
             n_list=args.exhaustive_n,
-            seed=args.seed
+            seed=args.seed,
+            engine=args.exhaustive_engine,
+            store=store,
+            workers=args.workers,
+            resume=args.resume,
+            pin_cpus=args.pin_cpus,
+            min_time=args.min_time,
+            phases=args.phases,
+            search_workers=args.exhaustive_workers
         )
 
 if __name__ == "__main__":
@@ -0,0 +1,520 @@
+"""
+Benchmark suites behind benchmark.py: one benchmark_<mode> per --mode, each a list of
+cells run by run_cells through its _<mode>_cell function, plus the shared load_cell.
+"""
+from __future__ import annotations
+import os, time, csv
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Optional
+import numpy as np
+
+from datasets import (DatasetStore, cell_seed_sequence, generate_cell_intervals, generate_uniform_weights,
+                      max_tick, tick_limit)
+from exhaustive import exhaustive_optimal
+from generators import generate_cell_family
+from greedy import greedy_earliest_finish, greedy_earliest_start, greedy_shortest_duration
+from incremental import IncrementalEFT
+from intervals import IntervalSet
+from partitioning import interval_partitioning
+from profiling import EXHAUSTIVE_PHASES, GREEDY_PHASES, phase_columns, phase_row, profile_phases
+from results_store import ResultsStore, columns_from_rows, run_metadata
+from sorting import resolve_sort_engine
+from timing import measure, stat_columns
+from weighted import weighted_interval_scheduling
+
+def run_greedy_suite(intervals: np.ndarray):
+    # Return counts for all three greedy criteria; one IntervalSet so each key is sorted once
+    intervals = IntervalSet.from_array(intervals)
+    return {
+        "EFT": greedy_earliest_finish(intervals).count,
+        "EST": greedy_earliest_start(intervals).count,
+        "SD":  greedy_shortest_duration(intervals).count,
+    }
+
+def ensure_dir(p: str):
+    os.makedirs(p, exist_ok=True)
+
+def load_cell(n: int, D: int, alpha: float, seed: int, trial: int, store: Optional[DatasetStore]=None,
+              dtype: str="float64"):
+    # Each (n, D, alpha, trial) cell has its own seed, so cells are reproducible on their own
+    if store is not None:
+        return store.get(n=n, D=D, alpha=alpha, seed=seed, trial=trial, dtype=dtype)
+    return generate_cell_intervals(n=n, D=D, alpha=alpha, seed=seed, trial=trial, dtype=dtype)
+
+def _physical_cpus() -> list[int]:
+    """One CPU id per physical core among the CPUs this process may run on (Linux topology, else all)."""
+    if hasattr(os, "sched_getaffinity"):
+        allowed = sorted(os.sched_getaffinity(0))
+    else:
+        allowed = list(range(os.cpu_count() or 1))
+    seen, cpus = set(), []
+    for c in allowed:
+        try:
+            with open(f"/sys/devices/system/cpu/cpu{c}/topology/thread_siblings_list", encoding="utf-8") as fh:
+                siblings = fh.read().strip()
+        except OSError:
+            siblings = str(c)
+        if siblings not in seen:
+            seen.add(siblings)
+            cpus.append(c)
+    return cpus
+
+def _init_worker(cpu_queue):
+    # Pin this worker to its own core so concurrent cells don't share one and distort timings
+    if cpu_queue is not None and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, {cpu_queue.get()})
+
+def _cell_key(values) -> tuple:
+    # Numeric columns compare as floats (CSV text vs cell values); labels such as a dtype stay strings
+    key = []
+    for v in values:
+        try:
+            key.append(float(v))
+        except ValueError:
+            key.append(v)
+    return tuple(key)
+
+def _completed_cells(out_csv: str, header: list[str], n_keys: int) -> Optional[set]:
+    """Keys of cells already in out_csv, or None if the file is missing or has another header."""
+    if not os.path.exists(out_csv):
+        return None
+    with open(out_csv, "r", newline="", encoding="utf-8") as f:
+        r = csv.reader(f)
+        if next(r, None) != header:
+            return None
+        return {_cell_key(row[:n_keys]) for row in r if len(row) == len(header)}
+
+# Rows buffered before they are appended to the results store as one part
+STORE_FLUSH_ROWS = 256
+
+def run_cells(out_csv: str, header: list[str], cells: list[tuple], cell_fn, workers: int=1,
+              resume: bool=False, pin_cpus: bool=False, seed: Optional[int]=None):
+    """
+    Run cell_fn over every cell and write its rows to out_csv in cell order.
+
+    Each cell is a tuple of the leading header columns (e.g. alpha, D, n, trial) and
+    cell_fn(cell) returns (row, message). With workers > 1 (0 = one per physical core)
+    cells run on a ProcessPoolExecutor; rows are still written in cell order, each as
+    soon as every earlier cell has finished. resume=True appends to an existing file
+    with the same header and skips the cells it already contains.
+
+    The CSV holds the current sweep; every row is also appended to the columnar
+    ResultsStore in <results_dir>/store (table = CSV name without "_results.csv"),
+    tagged with this run's metadata, so earlier sweeps are kept.
+    """
+    done = _completed_cells(out_csv, header, len(cells[0]) if cells else 0) if resume else None
+    todo = [c for c in cells if done is None or _cell_key(c) not in done]
+    if done is not None:
+        print(f"[Resume] {len(cells) - len(todo)} of {len(cells)} cells already in {out_csv}")
+
+    cpus = _physical_cpus()
+    if workers <= 0:
+        workers = len(cpus)
+
+    store = ResultsStore(os.path.join(os.path.dirname(out_csv) or ".", "store"))
+    table = os.path.basename(out_csv).replace("_results.csv", "")
+    meta = run_metadata(seed=seed, table=table)
+    pending = []
+
+    def flush_store():
+        if pending:
+            store.append(table, columns_from_rows(header, pending), meta)
+            pending.clear()
+
+    with open(out_csv, "a" if done is not None else "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        if done is None:
+            w.writerow(header)
+
+        def emit(i, cell, result):
+            row, message = result
+            w.writerow(row)
+            f.flush()  # Flush after each cell to save progress
+            pending.append(row)
+            if len(pending) >= STORE_FLUSH_ROWS:
+                flush_store()
+            print(f"  Cell {cell} (Run {i}/{len(todo)})... Done! ({message})", flush=True)
+
+        try:
+            _dispatch(todo, cell_fn, emit, workers, cpus, pin_cpus)
+        finally:
+            flush_store()  # keep the rows of completed cells even if a cell fails
+
+def _dispatch(todo: list[tuple], cell_fn, emit, workers: int, cpus: list[int], pin_cpus: bool):
+    """Run cell_fn over todo (sequentially or on a process pool) and emit results in cell order."""
+    if workers == 1 or len(todo) <= 1:
+        for i, cell in enumerate(todo, 1):
+            emit(i, cell, cell_fn(cell))
+        return
+
+    cpu_queue = None
+    if pin_cpus:
+        cpu_queue = mp.get_context().Queue()
+        for i in range(workers):
+            cpu_queue.put(cpus[i % len(cpus)])
+        if workers > len(cpus):
+            print(f"[WARN] {workers} workers on {len(cpus)} physical cores; some share a core")
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(cpu_queue,)) as ex:
+        futures = [ex.submit(cell_fn, cell) for cell in todo]
+        for i, (cell, fut) in enumerate(zip(todo, futures), 1):
+            emit(i, cell, fut.result())
+
+_GREEDY_ALGOS = (("EFT", greedy_earliest_finish), ("EST", greedy_earliest_start), ("SD", greedy_shortest_duration))
+
+def _greedy_cell(cell, seed: int, store: Optional[DatasetStore]=None, min_time: float=0.2, phases: bool=False):
+    alpha, D, n, trial = cell
+    # Generate once per trial but EXCLUDE generation time from timing
+    intervals, _ = load_cell(n=n, D=D, alpha=alpha, seed=seed, trial=trial, store=store)
+
+    # Time each greedy algorithm (exclude generation time); measure() warms up on the same input
+    t_eft = measure(greedy_earliest_finish, intervals, min_time=min_time)
+    t_est = measure(greedy_earliest_start,  intervals, min_time=min_time)
+    t_sd  = measure(greedy_shortest_duration, intervals, min_time=min_time)
+
+    counts = run_greedy_suite(intervals)
+
+    row = [
+        alpha, D, n, trial,
+        t_eft.median, t_est.median, t_sd.median,
+        counts["EFT"], counts["EST"], counts["SD"],
+        *t_eft.stats(), *t_est.stats(), *t_sd.stats()
+    ]
+    if phases:
+        # Per-phase breakdown (sort / gather / select ...), measured separately from the timings above
+        for _, fn in _GREEDY_ALGOS:
+            row += phase_row(profile_phases(fn, intervals), GREEDY_PHASES)
+    return row, f"EFT: {t_eft.median:.6f}s, EST: {t_est.median:.6f}s, SD: {t_sd.median:.6f}s"
+
+def benchmark_greedy(results_dir: str, trials: int, D: int, alphas: list[float], n_pows: list[int], seed: int,
+                     store: Optional[DatasetStore]=None, workers: int=1, resume: bool=False, pin_cpus: bool=False,
+                     min_time: float=0.2, phases: bool=False):
+    ensure_dir(results_dir)
+    out_csv = os.path.join(results_dir, "greedy_results.csv")
+
+    # CSV header
+    header = [
+        "alpha","D","n","trial",
+        "t_EFT","t_EST","t_SD",
+        "count_EFT","count_EST","count_SD",
+        *stat_columns("EFT"), *stat_columns("EST"), *stat_columns("SD")
+    ]
+    if phases:
+        for name, _ in _GREEDY_ALGOS:
+            header += phase_columns(name, GREEDY_PHASES)
+    cells = [(alpha, D, 2 ** p, trial) for alpha in alphas for p in n_pows for trial in range(1, trials+1)]
+    run_cells(out_csv, header, cells, partial(_greedy_cell, seed=seed, store=store, min_time=min_time, phases=phases),
+              workers=workers, resume=resume, pin_cpus=pin_cpus, seed=seed)
+
+    print(f"[OK] Saved greedy trials to: {out_csv}")
+
+def _precision_cell(cell, seed: int, store: Optional[DatasetStore]=None, min_time: float=0.2):
+    alpha, D, n, trial, dtype = cell
+    # Same random draws for every dtype: the instance differs only by rounding
+    intervals, _ = load_cell(n=n, D=D, alpha=alpha, seed=seed, trial=trial, store=store, dtype=dtype)
+
+    timings = [measure(fn, intervals, min_time=min_time) for _, fn in _GREEDY_ALGOS]
+    counts = run_greedy_suite(intervals)
+
+    row = [
+        alpha, D, n, trial, dtype, intervals.nbytes,
+        *(t.median for t in timings),
+        counts["EFT"], counts["EST"], counts["SD"],
+        *(v for t in timings for v in t.stats())
+    ]
+    rates = ", ".join(f"{name}: {n / t.median / 1e6:.1f} M/s" for (name, _), t in zip(_GREEDY_ALGOS, timings))
+    return row, f"{dtype} {rates}"
+
+def benchmark_precision(results_dir: str, trials: int, D: int, alphas: list[float], n_pows: list[int], seed: int,
+                        dtypes: list[str], store: Optional[DatasetStore]=None, workers: int=1, resume: bool=False,
+                        pin_cpus: bool=False, min_time: float=0.2):
+    ensure_dir(results_dir)
+    out_csv = os.path.join(results_dir, "precision_results.csv")
+
+    # One row per (cell, dtype): throughput is n / t_<algo>, peak memory is mem_<algo>
+    header = [
+        "alpha","D","n","trial","dtype","bytes",
+        "t_EFT","t_EST","t_SD",
+        "count_EFT","count_EST","count_SD",
+        *stat_columns("EFT"), *stat_columns("EST"), *stat_columns("SD")
+    ]
+    # A dtype that cannot hold every finish tick exactly (integer overflow, float32 past 2^24)
+    # would time a different instance, so those (alpha, n, dtype) combinations are skipped
+    fits = {(alpha, p, dtype): max_tick(2 ** p, D, alpha) <= tick_limit(dtype)
+            for alpha in alphas for p in n_pows for dtype in dtypes}
+    for (alpha, p, dtype), ok in fits.items():
+        if not ok:
+            print(f"[SKIP] {dtype} out of range at alpha={alpha}, n=2^{p} (max tick {max_tick(2 ** p, D, alpha)})")
+    cells = [(alpha, D, 2 ** p, trial, dtype) for alpha in alphas for p in n_pows
+             for trial in range(1, trials+1) for dtype in dtypes if fits[alpha, p, dtype]]
+    run_cells(out_csv, header, cells, partial(_precision_cell, seed=seed, store=store, min_time=min_time),
+              workers=workers, resume=resume, pin_cpus=pin_cpus, seed=seed)
+
+    print(f"[OK] Saved precision trials to: {out_csv}")
+
+def _sort_cell(cell, seed: int, dtype: str="int64", store: Optional[DatasetStore]=None, min_time: float=0.2):
+    alpha, D, n, trial, sort_engine = cell
+    intervals, _ = load_cell(n=n, D=D, alpha=alpha, seed=seed, trial=trial, store=store, dtype=dtype)
+    iset = IntervalSet.from_array(intervals, dtype=intervals.dtype)
+
+    # ndarray input builds a fresh IntervalSet per call, so every timed call sorts its key
+    used, medians, stats = [], [], []
+    for (name, fn), key in zip(_GREEDY_ALGOS, ("finish", "start", "duration")):
+        try:
+            used.append(resolve_sort_engine(iset.key(key), sort_engine))
+        except ValueError:
+            # e.g. counting sort on a key spanning more than 2^16 values
+            used.append("n/a")
+            medians.append(float("nan"))
+            stats += [float("nan")] * len(stat_columns(name))
+            continue
+        t = measure(fn, intervals, False, "auto", sort_engine, min_time=min_time)
+        medians.append(t.median)
+        stats += t.stats()
+
+    row = [alpha, D, n, trial, sort_engine, dtype, *used, *medians, *stats]
+    return row, ", ".join(f"{name}[{u}]: {m:.6f}s" for (name, _), u, m in zip(_GREEDY_ALGOS, used, medians) if u != "n/a")
+
+def benchmark_sort(results_dir: str, trials: int, D: int, alphas: list[float], n_pows: list[int], seed: int,
+                   sort_engines: list[str], dtype: str="int64", store: Optional[DatasetStore]=None, workers: int=1,
+                   resume: bool=False, pin_cpus: bool=False, min_time: float=0.2):
+    ensure_dir(results_dir)
+    out_csv = os.path.join(results_dir, "sort_results.csv")
+
+    # sort_<algo> is the engine actually used for that key ("n/a" when it does not apply)
+    header = [
+        "alpha","D","n","trial","sort_engine","dtype",
+        "sort_EFT","sort_EST","sort_SD",
+        "t_EFT","t_EST","t_SD",
+        *stat_columns("EFT"), *stat_columns("EST"), *stat_columns("SD")
+    ]
+    cells = [(alpha, D, 2 ** p, trial, engine) for alpha in alphas for p in n_pows
+             for trial in range(1, trials+1) for engine in sort_engines]
+    run_cells(out_csv, header, cells, partial(_sort_cell, seed=seed, dtype=dtype, store=store, min_time=min_time),
+              workers=workers, resume=resume, pin_cpus=pin_cpus, seed=seed)
+
+    print(f"[OK] Saved sort-engine trials to: {out_csv}")
+
+def _exhaustive_cell(cell, seed: int, engine: str="enumerate", store: Optional[DatasetStore]=None,
+                     min_time: float=0.2, phases: bool=False, search_workers: int=0):
+    alpha, D, n, trial = cell
+    intervals, _ = load_cell(n=n, D=D, alpha=alpha, seed=seed, trial=trial, store=store)
+
+    # Warm-up (excluded) on a small slice: a full warm-up call would double the cost at large n
+    _ = exhaustive_optimal(intervals[: min(n, 10)], return_selected=False, engine=engine, workers=search_workers)
+
+    # Time exhaustive (exclude generation time). The search is exponential, so a call that already
+    # lasts min_time is timed once (min_repeat=1), there is no tracemalloc run (mem_exhaustive = -1),
+    # and the optimum comes from the timed calls rather than another solve.
+    solved = [None]
+
+    def solve():
+        solved[0] = exhaustive_optimal(intervals, False, engine, search_workers)
+
+    t_opt = measure(solve, warmup=False, min_time=min_time, min_repeat=1, track_memory=False)
+    opt = solved[0].count
+    greedy_counts = run_greedy_suite(intervals)
+
+    row = [
+        alpha, D, n, trial,
+        t_opt.median, opt,
+        greedy_counts["EFT"], greedy_counts["EST"], greedy_counts["SD"],
+        *t_opt.stats()
+    ]
+    if phases:
+        row += phase_row(profile_phases(exhaustive_optimal, intervals, False, engine, search_workers,
+                                        phases=EXHAUSTIVE_PHASES),
+                         EXHAUSTIVE_PHASES)
+    return row, f"Exhaustive: {t_opt.median:.6f}s, opt_count={opt}"
+
+def benchmark_exhaustive(results_dir: str, trials: int, D: int, alphas: list[float], n_list: list[int], seed: int,
+                         engine: str="enumerate", store: Optional[DatasetStore]=None,
+                         workers: int=1, resume: bool=False, pin_cpus: bool=False, min_time: float=0.2,
+                         phases: bool=False, search_workers: int=0):
+    ensure_dir(results_dir)
+    out_csv = os.path.join(results_dir, "exhaustive_results.csv")
+
+    header = [
+        "alpha","D","n","trial",
+        "t_exhaustive","opt_count",
+        "greedy_EFT_count","greedy_EST_count","greedy_SD_count",
+        *stat_columns("exhaustive")
+    ]
+    if phases:
+        header += phase_columns("exhaustive", EXHAUSTIVE_PHASES)
+    cells = [(alpha, D, n, trial) for alpha in alphas for n in n_list for trial in range(1, trials+1)]
+    run_cells(out_csv, header, cells,
+              partial(_exhaustive_cell, seed=seed, engine=engine, store=store, min_time=min_time, phases=phases,
+                      search_workers=search_workers),
+              workers=workers, resume=resume, pin_cpus=pin_cpus, seed=seed)
+
+    print(f"[OK] Saved exhaustive trials to: {out_csv}")
+
+def _ratio_cell(cell, seed: int, store: Optional[DatasetStore]=None, check_n: int=32):
+    alpha, D, n, trial, family = cell
+    if family == "uniform":
+        # The same instances as the other modes (and the dataset cache)
+        intervals, _ = load_cell(n=n, D=D, alpha=alpha, seed=seed, trial=trial, store=store)
+    else:
+        intervals, _ = generate_cell_family(family, n=n, D=D, alpha=alpha, seed=seed, trial=trial)
+
+    # EFT is optimal, so its count is the baseline; small cells are cross-checked against the
+    # generic exhaustive search, which does not rely on that argument
+    counts = run_greedy_suite(intervals)
+    opt = counts["EFT"]
+    check = -1
+    if n <= check_n:
+        check = exhaustive_optimal(intervals, return_selected=False, engine="parallel", workers=1).count
+        if check != opt:
+            raise RuntimeError(f"Cell {cell}: EFT count {opt} != exhaustive optimum {check}")
+
+    row = [
+        alpha, D, n, trial, family,
+        opt, counts["EFT"], counts["EST"], counts["SD"], check
+    ]
+    return row, f"opt={opt}, EST/opt={counts['EST'] / opt:.4f}, SD/opt={counts['SD'] / opt:.4f}"
+
+def benchmark_ratio(results_dir: str, trials: int, D: int, alphas: list[float], n_list: list[int], seed: int,
+                    families: list[str], check_n: int=32, store: Optional[DatasetStore]=None, workers: int=1,
+                    resume: bool=False, pin_cpus: bool=False):
+    ensure_dir(results_dir)
+    out_csv = os.path.join(results_dir, "ratio_results.csv")
+
+    # Same count columns as exhaustive_results.csv; opt_check is the exhaustive optimum (-1 above check_n)
+    header = [
+        "alpha","D","n","trial","family",
+        "opt_count","greedy_EFT_count","greedy_EST_count","greedy_SD_count","opt_check"
+    ]
+    cells = [(alpha, D, n, trial, family) for family in families for alpha in alphas for n in n_list
+             for trial in range(1, trials+1)]
+    run_cells(out_csv, header, cells, partial(_ratio_cell, seed=seed, store=store, check_n=check_n),
+              workers=workers, resume=resume, pin_cpus=pin_cpus, seed=seed)
+
+    print(f"[OK] Saved approximation-ratio trials to: {out_csv}")
+
+def _weighted_cell(cell, seed: int, store: Optional[DatasetStore]=None, min_time: float=0.2):
+    alpha, D, W, n, trial = cell
+    intervals, _ = load_cell(n=n, D=D, alpha=alpha, seed=seed, trial=trial, store=store)
+    weights_rng = np.random.default_rng(cell_seed_sequence(seed, n, D, alpha, trial, stream=1))
+    weights = generate_uniform_weights(n=n, W=W, rng=weights_rng)
+
+    t_wis = measure(weighted_interval_scheduling, intervals, weights, min_time=min_time)
+    t_eft = measure(greedy_earliest_finish, intervals, min_time=min_time)
+
+    total = weighted_interval_scheduling(intervals, weights).total
+    count = greedy_earliest_finish(intervals).count
+
+    row = [
+        alpha, D, W, n, trial,
+        t_wis.median, t_eft.median,
+        total, count,
+        *t_wis.stats(), *t_eft.stats()
+    ]
+    return row, f"Weighted: {t_wis.median:.6f}s, EFT: {t_eft.median:.6f}s"
+
+def benchmark_weighted(results_dir: str, trials: int, D: int, W: int, alphas: list[float], n_pows: list[int], seed: int,
+                       store: Optional[DatasetStore]=None, workers: int=1, resume: bool=False, pin_cpus: bool=False,
+                       min_time: float=0.2):
+    ensure_dir(results_dir)
+    out_csv = os.path.join(results_dir, "weighted_results.csv")
+
+    # t_EFT is timed on the same dataset so the two scaling curves are directly comparable
+    header = [
+        "alpha","D","W","n","trial",
+        "t_weighted","t_EFT",
+        "weight_total","count_EFT",
+        *stat_columns("weighted"), *stat_columns("EFT")
+    ]
+    cells = [(alpha, D, W, 2 ** p, trial) for alpha in alphas for p in n_pows for trial in range(1, trials+1)]
+    run_cells(out_csv, header, cells, partial(_weighted_cell, seed=seed, store=store, min_time=min_time),
+              workers=workers, resume=resume, pin_cpus=pin_cpus, seed=seed)
+
+    print(f"[OK] Saved weighted trials to: {out_csv}")
+
+def _partition_cell(cell, seed: int, store: Optional[DatasetStore]=None, min_time: float=0.2):
+    alpha, D, n, trial = cell
+    intervals, _ = load_cell(n=n, D=D, alpha=alpha, seed=seed, trial=trial, store=store)
+    iset = IntervalSet.from_array(intervals)
+
+    t_heap = measure(interval_partitioning, iset, "heap", min_time=min_time)
+    t_sweep = measure(interval_partitioning, iset, "sweep", min_time=min_time)
+
+    machines = interval_partitioning(iset, "sweep").machines
+
+    row = [
+        alpha, D, n, trial,
+        t_heap.median, t_sweep.median,
+        machines,
+        *t_heap.stats(), *t_sweep.stats()
+    ]
+    return row, f"Heap: {t_heap.median:.6f}s, Sweep: {t_sweep.median:.6f}s, machines={machines}"
+
+def benchmark_partition(results_dir: str, trials: int, D: int, alphas: list[float], n_pows: list[int], seed: int,
+                        store: Optional[DatasetStore]=None, workers: int=1, resume: bool=False, pin_cpus: bool=False,
+                        min_time: float=0.2):
+    ensure_dir(results_dir)
+    out_csv = os.path.join(results_dir, "partition_results.csv")
+
+    header = [
+        "alpha","D","n","trial",
+        "t_heap","t_sweep",
+        "machines",
+        *stat_columns("heap"), *stat_columns("sweep")
+    ]
+    cells = [(alpha, D, 2 ** p, trial) for alpha in alphas for p in n_pows for trial in range(1, trials+1)]
+    run_cells(out_csv, header, cells, partial(_partition_cell, seed=seed, store=store, min_time=min_time),
+              workers=workers, resume=resume, pin_cpus=pin_cpus, seed=seed)
+
+    print(f"[OK] Saved partitioning trials to: {out_csv}")
+
+def _updates_cell(cell, seed: int, store: Optional[DatasetStore]=None, min_time: float=0.2):
+    alpha, D, n, trial, updates = cell
+    intervals, meta = load_cell(n=n, D=D, alpha=alpha, seed=seed, trial=trial, store=store)
+    rng = np.random.default_rng(cell_seed_sequence(seed, n, D, alpha, trial, stream=2))
+    # Update stream: alternate removing a random live interval and inserting a fresh one
+    new_starts = rng.uniform(0.0, meta["T"], size=updates)
+    new_finishes = new_starts + rng.integers(1, D + 1, size=updates)
+    victims = rng.random(size=updates)
+
+    inc = IncrementalEFT(intervals)  # build excluded from timing
+    live = list(range(n))
+    t0 = time.perf_counter()
+    for u in range(updates):
+        if u % 2 == 0:
+            k = int(victims[u] * len(live))
+            live[k], live[-1] = live[-1], live[k]
+            inc.remove(live.pop())
+        else:
+            live.append(inc.insert(new_starts[u], new_finishes[u]))
+    t_inc = (time.perf_counter() - t0) / updates
+
+    # Full re-solve of the final set: what every update costs without the incremental index
+    _, final = inc.to_array()
+    t_full = measure(greedy_earliest_finish, final, min_time=min_time)
+    count_full = greedy_earliest_finish(final).count
+
+    row = [
+        alpha, D, n, trial, updates,
+        t_inc, t_full.median,
+        inc.count, count_full
+    ]
+    return row, f"Incremental: {t_inc:.6f}s/update, Re-solve: {t_full.median:.6f}s/update"
+
+def benchmark_updates(results_dir: str, trials: int, D: int, alphas: list[float], n_pows: list[int], seed: int,
+                      updates: int=1000, store: Optional[DatasetStore]=None, workers: int=1, resume: bool=False,
+                      pin_cpus: bool=False, min_time: float=0.2):
+    ensure_dir(results_dir)
+    out_csv = os.path.join(results_dir, "updates_results.csv")
+
+    # Seconds per update: incremental repair vs a full greedy_earliest_finish re-solve
+    header = [
+        "alpha","D","n","trial","updates",
+        "t_incremental","t_resolve",
+        "count_incremental","count_resolve"
+    ]
+    cells = [(alpha, D, 2 ** p, trial, updates) for alpha in alphas for p in n_pows for trial in range(1, trials+1)]
+    run_cells(out_csv, header, cells, partial(_updates_cell, seed=seed, store=store, min_time=min_time),
+              workers=workers, resume=resume, pin_cpus=pin_cpus, seed=seed)
+
+    print(f"[OK] Saved update-throughput trials to: {out_csv}")
@@ -0,0 +1,173 @@
+from __future__ import annotations
+from typing import List, Sequence
+import numpy as np
+
+# Bits per packed word; bit j of word w is column 64*w + j (packbits little bit order, little-endian words)
+_WORD = 64
+# Upper bound on the boolean scratch built per block of rows, in bytes
+_BLOCK_BYTES = 1 << 24
+
+if hasattr(np, "bitwise_count"):  # NumPy >= 2.0
+    def _popcount_words(words: np.ndarray) -> np.ndarray:
+        return np.bitwise_count(words)
+else:
+    _BYTE_COUNTS = np.array([bin(b).count("1") for b in range(256)], dtype=np.uint8)
+
+    def _popcount_words(words: np.ndarray) -> np.ndarray:
+        as_bytes = np.ascontiguousarray(words).view(np.uint8).reshape(*words.shape, 8)
+        return _BYTE_COUNTS[as_bytes].sum(axis=-1, dtype=np.uint8)
+
+def popcount(words: np.ndarray, axis=-1) -> np.ndarray:
+    """Number of set bits in packed uint64 words, summed over axis (None = all)."""
+    return _popcount_words(words).sum(axis=axis, dtype=np.int64)
+
+def _pack_rows(bits: np.ndarray) -> np.ndarray:
+    """(m, 64*W) booleans -> (m, W) uint64 words."""
+    return np.packbits(bits, axis=1, bitorder="little").view("<u8")
+
+def _conflicts(s_i, f_i, s_j, f_j) -> np.ndarray:
+    # Negation of exhaustive._compat_matrix's test: f_i <= s_j or f_j <= s_i
+    return (f_i > s_j) & (f_j > s_i)
+
+class PackedCompat:
+    """
+    Dense pairwise compatibility bit-packed into uint64 words: bit j of row i is set iff
+    i != j and intervals i and j do not overlap (exhaustive._compat_matrix without the
+    diagonal). n^2/8 bytes instead of the n^2-byte boolean matrix and its two temporaries,
+    built a block of rows at a time; rows AND together and popcount word-wise.
+    """
+    __slots__ = ("n", "words")
+
+    def __init__(self, n: int, words: np.ndarray):
+        self.n = n
+        self.words = words  # shape (n, ceil(n/64)) uint64
+
+    @classmethod
+    def from_intervals(cls, intervals: np.ndarray) -> "PackedCompat":
+        s = np.asarray(intervals[:, 0])
+        f = np.asarray(intervals[:, 1])
+        n = s.shape[0]
+        width = -(-n // _WORD) * _WORD
+        words = np.empty((n, width // _WORD), dtype=np.uint64)
+        block = max(1, _BLOCK_BYTES // max(width, 1))
+        for lo in range(0, n, block):
+            hi = min(n, lo + block)
+            bits = np.zeros((hi - lo, width), dtype=bool)
+            bits[:, :n] = ~_conflicts(s[lo:hi, None], f[lo:hi, None], s[None, :], f[None, :])
+            bits[np.arange(hi - lo), np.arange(lo, hi)] = False
+            words[lo:hi] = _pack_rows(bits)
+        return cls(n, words)
+
+    def row(self, i: int) -> np.ndarray:
+        return self.words[i]
+
+    def compatible(self, i: int, j: int) -> bool:
+        i, j = int(i), int(j)
+        return bool((int(self.words[i, j // _WORD]) >> (j % _WORD)) & 1)
+
+    def intersect(self, rows: Sequence[int]) -> np.ndarray:
+        """Words of the intervals compatible with every interval in rows (all n if rows is empty)."""
+        if len(rows) == 0:
+            full = np.zeros(self.words.shape[1] * _WORD, dtype=bool)
+            full[:self.n] = True
+            return _pack_rows(full[None, :])[0]
+        return np.bitwise_and.reduce(self.words[np.asarray(rows)], axis=0)
+
+    def degrees(self) -> np.ndarray:
+        """Number of intervals each interval is compatible with."""
+        return popcount(self.words)
+
+    def members(self, words: np.ndarray) -> np.ndarray:
+        """Indices of the set bits of one packed row."""
+        bits = np.unpackbits(np.ascontiguousarray(words).view(np.uint8), bitorder="little")
+        return np.flatnonzero(bits[:self.n])
+
+    def to_ints(self) -> List[int]:
+        """Each row as a Python int bitmask, the form used by the exhaustive bitmask searches."""
+        return [int.from_bytes(row.tobytes(), "little") for row in self.words.astype("<u8", copy=False)]
+
+    def to_bool(self) -> np.ndarray:
+        bits = np.unpackbits(self.words.view(np.uint8), axis=1, bitorder="little")
+        return bits[:, :self.n].astype(bool)
+
+class BandedCompat:
+    """
+    Sparse conflict structure for large n. With intervals sorted by (start, finish), every
+    conflict of position p lies in the window [lo_p, hi_p): hi_p is the first start >= f_p,
+    and lo_p the first position whose running maximum finish exceeds s_p. Each row keeps
+    only the packed conflict bits of the words covering its window, so memory follows the
+    number of overlapping neighbours rather than n^2. Methods take and return input indices.
+    """
+    __slots__ = ("n", "order", "rank", "word_lo", "ptr", "bits")
+
+    def __init__(self, intervals: np.ndarray):
+        s0 = np.asarray(intervals[:, 0])
+        f0 = np.asarray(intervals[:, 1])
+        n = s0.shape[0]
+        self.n = n
+        self.order = np.lexsort((f0, s0))
+        self.rank = np.empty(n, dtype=np.intp)
+        self.rank[self.order] = np.arange(n)
+        s = s0[self.order]
+        f = f0[self.order]
+
+        pos = np.arange(n)
+        hi = np.maximum(np.searchsorted(s, f, side="left"), pos + 1)
+        lo = np.minimum(np.searchsorted(np.maximum.accumulate(f), s, side="right"), pos)
+        self.word_lo = lo // _WORD
+        nwords = (hi - 1) // _WORD - self.word_lo + 1
+        self.ptr = np.concatenate([[0], np.cumsum(nwords)])
+        self.bits = np.empty(int(self.ptr[-1]), dtype=np.uint64)
+
+        # Fill rows in blocks of about _BLOCK_BYTES window slots
+        budget = max(1, _BLOCK_BYTES // _WORD)
+        r = 0
+        while r < n:
+            end = int(np.searchsorted(self.ptr, self.ptr[r] + budget, side="right"))
+            end = min(n, max(end - 1, r + 1))
+            rows = np.repeat(np.arange(r, end), nwords[r:end] * _WORD)
+            start_col = np.repeat(self.word_lo[r:end] * _WORD - (self.ptr[r:end] - self.ptr[r]) * _WORD,
+                                  nwords[r:end] * _WORD)
+            cols = start_col + np.arange(rows.size)
+            inside = cols < n
+            c = np.minimum(cols, n - 1)
+            hit = inside & (cols != rows) & _conflicts(s[rows], f[rows], s[c], f[c])
+            self.bits[self.ptr[r]:self.ptr[end]] = _pack_rows(hit[None, :])[0]
+            r = end
+
+    def _window(self, p: int):
+        return int(self.word_lo[p]), self.bits[self.ptr[p]:self.ptr[p + 1]]
+
+    def conflicts(self, i: int) -> np.ndarray:
+        """Input indices of the intervals overlapping interval i."""
+        w0, words = self._window(int(self.rank[i]))
+        bits = np.unpackbits(words.view(np.uint8), bitorder="little")
+        return self.order[w0 * _WORD + np.flatnonzero(bits)]
+
+    def compatible(self, i: int, j: int) -> bool:
+        if i == j:
+            return False
+        w0, words = self._window(int(self.rank[i]))
+        q = int(self.rank[j]) - w0 * _WORD
+        if q < 0 or q >= words.size * _WORD:
+            return True
+        return not (int(words[q // _WORD]) >> (q % _WORD)) & 1
+
+    def common_conflicts(self, i: int, j: int) -> int:
+        """Number of intervals overlapping both i and j: AND over the shared words of the two windows."""
+        wi, a = self._window(int(self.rank[i]))
+        wj, b = self._window(int(self.rank[j]))
+        lo, hi = max(wi, wj), min(wi + a.size, wj + b.size)
+        if hi <= lo:
+            return 0
+        return int(popcount(a[lo - wi:hi - wi] & b[lo - wj:hi - wj]))
+
+    def degrees(self) -> np.ndarray:
+        """Number of intervals each interval overlaps, in input order."""
+        per_word = _popcount_words(self.bits).astype(np.int64)
+        by_pos = np.add.reduceat(per_word, self.ptr[:-1]) if self.n else per_word
+        return by_pos[self.rank]
+
+    @property
+    def nbytes(self) -> int:
+        return self.bits.nbytes + self.ptr.nbytes + self.word_lo.nbytes + self.order.nbytes + self.rank.nbytes
@@ -1,6 +1,33 @@
+import os
 import numpy as np
 
-def generate_uniform_intervals(n: int, D: int, alpha: float, rng: np.random.Generator):
+# Interval column dtypes supported end to end: float64 (default), float32, and integer ticks
+INTERVAL_DTYPES = ("float64", "float32", "int64", "int32")
+
+def max_tick(n: int, D: int, alpha: float) -> int:
+    """Upper bound on any integer-tick finish time: ceil(T) - 1 + D with T = alpha * n * D."""
+    return int(np.ceil(alpha * n * D)) - 1 + D
+
+def tick_limit(dtype) -> int:
+    """
+    Largest integer tick a column dtype stores exactly: the integer maximum, or 2^(mantissa bits + 1)
+    for floats (2^24 for float32). Past it float32 rounds s_i + d_i to a neighbouring tick, which
+    creates zero-length intervals and changes the instance rather than just its precision.
+    """
+    dtype = np.dtype(dtype)
+    if dtype.kind == "i":
+        return int(np.iinfo(dtype).max)
+    return 1 << (np.finfo(dtype).nmant + 1)
+
+def check_tick_range(n: int, D: int, alpha: float, dtype):
+    """Raise ValueError when finish times up to max_tick(n, D, alpha) do not fit dtype exactly."""
+    dtype = np.dtype(dtype)
+    top = max_tick(n, D, alpha)
+    if top > tick_limit(dtype):
+        what = "overflow" if dtype.kind == "i" else "exceed the exact integer range of"
+        raise ValueError(f"Finish times up to {top} {what} {dtype.name} (limit {tick_limit(dtype)})")
+
+def generate_uniform_intervals(n: int, D: int, alpha: float, rng: np.random.Generator, dtype=np.float64):
     """
     Uniform Random Dataset (assignment spec):
       T = alpha * n * D
@@ -8,9 +35,15 @@ def generate_uniform_intervals(n: int, D: int, alpha: float, rng: np.random.Gene
       d_i ~ Uniform[1, D]  (integers by default; can be floats if you want)
       f_i = s_i + d_i
 
+    dtype selects the column type: float64 (default), float32, or int32/int64 ticks,
+    where s_i is floored to an integer tick in [0, ceil(T)) and every finish is bounded
+    by max_tick(n, D, alpha). All dtypes consume the same random draws, so they describe
+    the same instance up to rounding. Every finish must fit the dtype exactly
+    (check_tick_range): integer ticks must not overflow, and float32 stays below 2^24.
+
     Returns:
-      intervals: np.ndarray shape (n, 2) with columns [start, finish] as floats
-      meta: dict with (n, D, alpha, T)
+      intervals: np.ndarray shape (n, 2) with columns [start, finish] in dtype
+      meta: dict with (n, D, alpha, T, dtype)
     """
     if n <= 0:
         raise ValueError("n must be positive")
@@ -18,11 +51,76 @@ def generate_uniform_intervals(n: int, D: int, alpha: float, rng: np.random.Gene
         raise ValueError("D must be positive")
     if alpha <= 0:
         raise ValueError("alpha must be positive")
+    dtype = np.dtype(dtype)
+    if dtype.name not in INTERVAL_DTYPES:
+        raise ValueError(f"Unsupported dtype {dtype.name!r}; expected one of {INTERVAL_DTYPES}")
 
     T = float(alpha * n * D)
     starts = rng.uniform(0.0, T, size=n)
     durations = rng.integers(1, D + 1, size=n)  # inclusive upper bound
+    meta = {"n": n, "D": D, "alpha": float(alpha), "T": T, "dtype": dtype.name}
+
+    check_tick_range(n, D, alpha, dtype)
+    if dtype.kind == "i":
+        ticks = np.floor(starts).astype(dtype)
+        return np.column_stack([ticks, ticks + durations.astype(dtype)]), meta
+    if dtype == np.float32:
+        # Add in float32 so f_i - s_i stays as close to d_i as float32 allows
+        s32 = starts.astype(dtype)
+        return np.column_stack([s32, s32 + durations.astype(dtype)]), meta
+
     finishes = starts + durations.astype(float)
 
     intervals = np.column_stack([starts, finishes]).astype(float)
-    return intervals, {"n": n, "D": D, "alpha": float(alpha), "T": T}
+    return intervals, meta
+
+def generate_uniform_weights(n: int, W: int, rng: np.random.Generator):
+    """
+    Integer priorities w_i ~ Uniform[1, W] for weighted interval scheduling, as floats.
+    Returns: weights: np.ndarray shape (n,)
+    """
+    if W <= 0:
+        raise ValueError("W must be positive")
+    return rng.integers(1, W + 1, size=n).astype(float)
+
+def cell_seed_sequence(seed: int, n: int, D: int, alpha: float, trial: int, stream: int=0) -> np.random.SeedSequence:
+    """
+    Independent, reproducible seed for one benchmark cell (n, D, alpha, trial).
+    Unlike a single shared rng, changing one cell (or the set of cells) never shifts the others.
+    stream separates extra draws for the same cell (e.g. weights).
+    """
+    alpha_bits = int(np.float64(alpha).view(np.uint64))
+    return np.random.SeedSequence(entropy=seed, spawn_key=(n, D, alpha_bits, trial, stream))
+
+def generate_cell_intervals(n: int, D: int, alpha: float, seed: int, trial: int, dtype=np.float64):
+    """generate_uniform_intervals with the cell's own rng (see cell_seed_sequence)."""
+    rng = np.random.default_rng(cell_seed_sequence(seed, n, D, alpha, trial))
+    return generate_uniform_intervals(n=n, D=D, alpha=alpha, rng=rng, dtype=dtype)
+
+class DatasetStore:
+    """
+    On-disk cache of benchmark datasets keyed by (n, D, alpha, seed, trial).
+    Each dataset is one (n,2) .npy file (float64 unless another dtype is asked for), written once and reopened with
+    np.load(mmap_mode="r"), so repeated sweeps and later analysis reuse identical
+    inputs without regenerating or copying them.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def path(self, n: int, D: int, alpha: float, seed: int, trial: int, dtype=np.float64) -> str:
+        suffix = "" if np.dtype(dtype) == np.float64 else f"_{np.dtype(dtype).name}"
+        return os.path.join(self.root, f"n{n}_D{D}_alpha{float(alpha)!r}_seed{seed}_trial{trial}{suffix}.npy")
+
+    def get(self, n: int, D: int, alpha: float, seed: int, trial: int, dtype=np.float64):
+        """Return (intervals, meta) like generate_uniform_intervals; intervals is a read-only memmap."""
+        p = self.path(n, D, alpha, seed, trial, dtype)
+        if not os.path.exists(p):
+            intervals, _ = generate_cell_intervals(n=n, D=D, alpha=alpha, seed=seed, trial=trial, dtype=dtype)
+            tmp = f"{p}.{os.getpid()}.tmp.npy"
+            np.save(tmp, intervals)
+            os.replace(tmp, p)  # atomic: concurrent readers never see a partial file
+        intervals = np.load(p, mmap_mode="r")
+        return intervals, {"n": n, "D": D, "alpha": float(alpha), "T": float(alpha * n * D),
+                           "dtype": intervals.dtype.name}
@@ -1,8 +1,14 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple, Union
+import multiprocessing as mp, os
 import numpy as np
 
+from compat import PackedCompat
+from intervals import IntervalSet, finish_predecessors
+from profiling import phase
+
 @dataclass(frozen=True)
 class ExhaustiveResult:
     count: int
@@ -31,37 +37,255 @@ def _subset_is_feasible(idx: np.ndarray, compat: np.ndarray) -> bool:
             return False
     return True
 
-def exhaustive_optimal(intervals: np.ndarray, return_selected: bool=True) -> ExhaustiveResult:
-    """
-    Exhaustive optimal solver by enumerating all subsets and keeping the largest feasible.
-    Intended only for small n (exponential time).
-    Worst-case time ~ O(n 2^n) (subset enumeration + feasibility checks).
-    """
+ENGINES = ("enumerate", "dp", "bnb", "parallel")
+
+def _compat_bitmasks(intervals: np.ndarray) -> list:
+    """Python int bitmask per interval (bit j set iff j != i and j is compatible with i), from packed rows."""
+    return PackedCompat.from_intervals(intervals).to_ints()
+
+def _enumerate_optimal(intervals: np.ndarray) -> Tuple[int, np.ndarray]:
     n = intervals.shape[0]
     if n > 26:
         # Guardrail: still allow, but warn via exception message.
         raise ValueError(f"n={n} is likely too large for exhaustive subset enumeration. Use smaller n.")
 
-    compat = _compat_matrix(intervals)
+    with phase("compat"):
+        compat = _compat_matrix(intervals)
     best_mask = 0
     best_size = 0
 
-    # Enumerate all subset masks from 1..(2^n - 1)
-    # (mask=0 gives empty set, size=0)
-    for mask in range(1, 1 << n):
-        # quick upper bound: if number of bits <= best_size, skip
-        bits = mask.bit_count()
-        if bits <= best_size:
+    with phase("search"):
+        # Enumerate all subset masks from 1..(2^n - 1)
+        # (mask=0 gives empty set, size=0)
+        for mask in range(1, 1 << n):
+            # quick upper bound: if number of bits <= best_size, skip
+            bits = mask.bit_count()
+            if bits <= best_size:
+                continue
+            # Extract indices
+            idx = np.fromiter((i for i in range(n) if (mask >> i) & 1), dtype=int, count=bits)
+            if _subset_is_feasible(idx, compat):
+                best_size = bits
+                best_mask = mask
+
+    with phase("reconstruct"):
+        idx = np.array([i for i in range(n) if (best_mask >> i) & 1], dtype=int)
+    return best_size, idx
+
+def _dp_optimal(intervals: np.ndarray) -> Tuple[int, np.ndarray]:
+    """
+    Sort by finish and solve OPT(j) = max(OPT(j-1), 1 + OPT(p(j))), where p(j) is the
+    number of intervals finishing no later than s_j (found with searchsorted).
+    O(n log n); exact for any n.
+    """
+    n = intervals.shape[0]
+    order, _, _, pred = finish_predecessors(intervals)
+    p = pred.tolist()
+
+    with phase("search"):
+        opt = [0] * (n + 1)
+        for j in range(n):
+            take = 1 + opt[p[j]]
+            opt[j + 1] = take if take > opt[j] else opt[j]
+
+    with phase("reconstruct"):
+        picked = []
+        j = n
+        while j > 0:
+            if opt[j] == opt[j - 1]:
+                j -= 1
+            else:
+                picked.append(j - 1)
+                j = p[j - 1]
+        idx = order[np.array(picked[::-1], dtype=int)]
+    return opt[n], idx
+
+def _cover_bound(cand: int, masks: list) -> int:
+    """
+    Upper bound on a compatible subset of cand (vertices numbered by finish time):
+    greedily take the earliest-finishing candidate and drop everything it conflicts with.
+    Each step removes one clique of the conflict graph, and on interval graphs the
+    resulting clique cover is tight.
+    """
+    bound = 0
+    while cand:
+        v = (cand & -cand).bit_length() - 1
+        cand &= masks[v]
+        bound += 1
+    return bound
+
+def _bnb_optimal(intervals: np.ndarray) -> Tuple[int, np.ndarray]:
+    """
+    Branch and bound for a maximum set of pairwise-compatible intervals, with candidate
+    sets held as integer bitmasks built from packed compatibility rows. A branch is pruned when
+    size + popcount(candidates), and then size + _cover_bound(candidates), cannot beat
+    the incumbent; the search stops once the incumbent meets the root bound.
+    """
+    n = intervals.shape[0]
+    with phase("sort"):
+        order = np.lexsort((intervals[:, 0], intervals[:, 1]))
+    with phase("compat"):
+        masks = _compat_bitmasks(intervals[order])
+
+    with phase("search"):
+        root = (1 << n) - 1
+        root_bound = _cover_bound(root, masks)
+        best_size, best_mask = 0, 0
+        stack = [(root, 0, 0)]  # (candidates, chosen mask, chosen size)
+        while stack and best_size < root_bound:
+            cand, chosen, size = stack.pop()
+            if cand == 0:
+                if size > best_size:
+                    best_size, best_mask = size, chosen
+                continue
+            if size + cand.bit_count() <= best_size or size + _cover_bound(cand, masks) <= best_size:
+                continue
+            low = cand & -cand
+            v = low.bit_length() - 1
+            # Push exclude first so the include branch is explored first (LIFO)
+            stack.append((cand ^ low, chosen, size))
+            stack.append((cand & masks[v], chosen | low, size + 1))
+
+    with phase("reconstruct"):
+        idx = np.array([i for i in range(n) if (best_mask >> i) & 1], dtype=int)
+    return best_size, order[idx]
+
+# Subtrees handed out per worker: more than one, so a worker that drew a small subtree picks up another
+_TASKS_PER_WORKER = 16
+# Search nodes between reads of the shared incumbent
+_SYNC_EVERY = 1024
+
+def _clique_search(stack: list, masks: list, shared=None) -> Tuple[int, int]:
+    """
+    Depth-first search for the largest pairwise-compatible subset below the given
+    (candidates, chosen mask, chosen size) nodes, pruning with size + popcount(candidates)
+    only, so it relies on nothing but the compatibility graph. shared (a multiprocessing
+    Value) carries the best size found by any worker: it is read every _SYNC_EVERY nodes
+    and raised on each improvement. Returns this search's best (size, mask), which may
+    fall short of the shared size when another worker found the optimum first.
+    """
+    best_size, best_mask = 0, 0
+    bound = 0
+    steps = 0
+    while stack:
+        cand, chosen, size = stack.pop()
+        if cand == 0:
+            if size > best_size:
+                best_size, best_mask = size, chosen
+                bound = max(bound, size)
+                if shared is not None:
+                    with shared.get_lock():
+                        if size > shared.value:
+                            shared.value = size
+            continue
+        steps += 1
+        if shared is not None and steps % _SYNC_EVERY == 0:
+            bound = max(bound, shared.value)
+        if size + cand.bit_count() <= bound:
             continue
-        # Extract indices
-        idx = np.fromiter((i for i in range(n) if (mask >> i) & 1), dtype=int, count=bits)
-        if _subset_is_feasible(idx, compat):
-            best_size = bits
-            best_mask = mask
+        low = cand & -cand
+        v = low.bit_length() - 1
+        stack.append((cand ^ low, chosen, size))
+        stack.append((cand & masks[v], chosen | low, size + 1))
+    return best_size, best_mask
+
+def _split_tree(n: int, masks: list, tasks: int) -> list:
+    """Expand the include/exclude tree level by level until it has at least `tasks` nodes (or only leaves)."""
+    nodes = [((1 << n) - 1, 0, 0)]
+    while len(nodes) < tasks and any(cand for cand, _, _ in nodes):
+        nxt = []
+        for cand, chosen, size in nodes:
+            if cand == 0:
+                nxt.append((cand, chosen, size))
+                continue
+            low = cand & -cand
+            v = low.bit_length() - 1
+            # Include branch first: it tends to reach large subsets, and tasks start in list order
+            nxt.append((cand & masks[v], chosen | low, size + 1))
+            nxt.append((cand ^ low, chosen, size))
+        nodes = nxt
+    return nodes
+
+# One pool (and its shared best size) reused across searches: timing loops call the solver
+# many times, and process startup would otherwise dominate every call
+_pool = None
+_pool_workers = 0
+_pool_best = None
+_worker_best = None
+
+def _init_search(shared):
+    global _worker_best
+    _worker_best = shared
+
+def _search_task(task: tuple) -> Tuple[int, int]:
+    node, masks = task
+    return _clique_search([node], masks, _worker_best)
+
+def _search_pool(workers: int):
+    """The cached (executor, shared best size) for this worker count, started on first use."""
+    global _pool, _pool_workers, _pool_best
+    if _pool is None or _pool_workers != workers:
+        if _pool is not None:
+            _pool.shutdown()
+        _pool_best = mp.get_context().Value("i", 0)
+        _pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_search, initargs=(_pool_best,))
+        _pool_workers = workers
+    return _pool, _pool_best
+
+def _parallel_optimal(intervals: np.ndarray, workers: int=0) -> Tuple[int, np.ndarray]:
+    """
+    Exact search over the compatibility graph split across a process pool: the top of the
+    include/exclude tree is expanded into about _TASKS_PER_WORKER subtrees per worker,
+    each searched by _clique_search with the best size shared between workers.
+    Feasibility is a bitmask AND with precomputed per-interval compatibility masks.
+    The pool is kept for later calls with the same number of workers.
+    """
+    n = intervals.shape[0]
+    workers = workers or os.cpu_count() or 1
+    with phase("compat"):
+        masks = _compat_bitmasks(intervals)
+
+    with phase("search"):
+        if workers == 1:
+            best_size, best_mask = _clique_search([((1 << n) - 1, 0, 0)], masks)
+        else:
+            nodes = _split_tree(n, masks, workers * _TASKS_PER_WORKER)
+            ex, shared = _search_pool(workers)
+            shared.value = 0
+            best_size, best_mask = max(ex.map(_search_task, [(node, masks) for node in nodes]),
+                                       key=lambda r: r[0])
+
+    with phase("reconstruct"):
+        idx = np.array([i for i in range(n) if (best_mask >> i) & 1], dtype=int)
+    return best_size, idx
+
+_ENGINE_FUNCS = {"enumerate": _enumerate_optimal, "dp": _dp_optimal, "bnb": _bnb_optimal,
+                 "parallel": _parallel_optimal}
+
+def exhaustive_optimal(intervals: Union[np.ndarray, IntervalSet], return_selected: bool=True,
+                       engine: str="enumerate", workers: int=0) -> ExhaustiveResult:
+    """
+    Optimal solver: the largest set of pairwise-compatible intervals.
+    engine="enumerate" (default) enumerates all subsets and keeps the largest feasible.
+      Intended only for small n (exponential time).
+      Worst-case time ~ O(n 2^n) (subset enumeration + feasibility checks).
+    engine="dp" uses the sort + predecessor dynamic program, O(n log n).
+    engine="bnb" runs a bitmask branch and bound over the compatibility graph.
+    engine="parallel" splits a generic bitmask search (popcount bound only) across
+      `workers` processes (0 = one per CPU) sharing the best size; practical to n ~ 40.
+      The count is exact; which optimal subset is returned can vary between runs.
+    """
+    if engine not in _ENGINE_FUNCS:
+        raise ValueError(f"Unknown engine {engine!r}; expected one of {ENGINES}")
+    if isinstance(intervals, IntervalSet):
+        intervals = intervals.to_array()
+    if engine == "parallel":
+        best_size, idx = _parallel_optimal(intervals, workers)
+    else:
+        best_size, idx = _ENGINE_FUNCS[engine](intervals)
 
     if return_selected:
         if best_size == 0:
-            return ExhaustiveResult(count=0, selected=np.empty((0,2), dtype=float))
-        idx = np.array([i for i in range(n) if (best_mask >> i) & 1], dtype=int)
+            return ExhaustiveResult(count=0, selected=intervals[:0])
         return ExhaustiveResult(count=best_size, selected=intervals[idx])
     return ExhaustiveResult(count=best_size, selected=None)
@@ -0,0 +1,237 @@
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Tuple, Union
+import argparse, os, time
+import numpy as np
+
+from datasets import INTERVAL_DTYPES, cell_seed_sequence, check_tick_range, tick_limit
+
+# Rows per random block. Every block draws from its own SeedSequence(seed, (family, block)),
+# so the output depends only on (family, n, D, alpha, seed, params), never on the chunk size
+# or worker count used to produce it.
+_BLOCK = 1 << 16
+
+FAMILIES = ("uniform", "heavy_tailed", "bursty", "nested", "adversarial")
+
+# Default family parameters (overridable through **params)
+FAMILY_PARAMS = {
+    "uniform": {},
+    "heavy_tailed": {"tail": 1.5},                 # Pareto shape of the durations (> 1)
+    "bursty": {"burst_size": 1000, "spread": None},  # rows per burst; exponential spread (default D)
+    "nested": {"depth": 4},                        # levels of each laminar tree
+    "adversarial": {"units": 3},                   # unit intervals under each EST trap
+}
+
+def _uniform(rng, lo, hi, n, D, T):
+    # The assignment spec: s ~ U[0, T), d ~ U{1..D}
+    return rng.uniform(0.0, T, size=hi - lo), rng.integers(1, D + 1, size=hi - lo).astype(float)
+
+def _heavy_tailed(rng, lo, hi, n, D, T, tail):
+    # Lomax durations shifted to start at 1 and scaled so the mean is (D + 1) / 2, as for uniform
+    starts = rng.uniform(0.0, T, size=hi - lo)
+    return starts, 1.0 + (D - 1) / 2 * (tail - 1) * rng.pareto(tail, size=hi - lo)
+
+def _bursty(rng, lo, hi, n, D, T, centres, spread, burst_size):
+    # Each row joins one of the n // burst_size bursts and starts an exponential offset after its centre
+    k = rng.integers(0, centres.size, size=hi - lo)
+    return centres[k] + rng.exponential(spread, size=hi - lo), rng.integers(1, D + 1, size=hi - lo).astype(float)
+
+def _nested(rng, lo, hi, n, D, T, depth):
+    # Group g is a dyadic tree of 2^depth - 1 laminar intervals listed parent first (heap order):
+    # node k at level L = floor(log2 k) covers the (k - 2^L)-th of 2^L equal slices of the group's
+    # width 2^(depth-1) * D. Leaves keep a random 50-100% of their slice.
+    size = (1 << depth) - 1
+    i = np.arange(lo, hi)
+    k = i % size + 1
+    level = np.floor(np.log2(k)).astype(np.int64)
+    width = float(D << (depth - 1)) / (1 << level)
+    stride = max(float(D << (depth - 1)), T / -(-n // size))
+    durations = np.where(level == depth - 1, width * (1.0 - 0.5 * rng.random(hi - lo)), width)
+    return (i // size) * stride + (k - (1 << level)) * width, durations
+
+def _adversarial(rng, lo, hi, n, D, T, units):
+    """
+    Repeated gadgets that make both EST and SD lose (rows are a deterministic function of
+    their index; the seed is unused). Per gadget, in ticks of scale = max(1, D // (2u+1)):
+      EST trap: one interval [0, 2u+1) over u unit intervals [2t+1, 2t+2), t < u;
+      SD trap:  A = [0, 3), B = [3, 6) and the shorter C = [2, 4) straddling them,
+    shifted past the EST trap. Every start and duration is an integer number of ticks (and
+    gadgets are an integer stride apart), so touching endpoints are exact in every dtype
+    (float32 while times stay below 2^24). OPT (= EFT) takes u + 2 per gadget, EST 3.
+    This repo's SD (scan by duration, keep a row starting at or after the last kept
+    finish) takes every unit interval and then only the last gadget's C, u per gadget + 1;
+    a shortest-first rule that checks compatibility would take u + 1 per gadget (C blocks A and B).
+    """
+    size = units + 4
+    tmpl_s = np.array([0.0, *(2.0 * np.arange(units) + 1), 0.0, 3.0, 2.0])
+    tmpl_d = np.array([2.0 * units + 1, *np.ones(units), 3.0, 3.0, 2.0])
+    tmpl_s[units + 1:] += 2 * units + 2
+    scale = float(max(1, D // (2 * units + 1)))
+    span = (2 * units + 8) * scale
+    i = np.arange(lo, hi)
+    gadgets = -(-n // size)
+    stride = max(span, float(np.ceil(T / gadgets)))
+    return (i // size) * stride + tmpl_s[i % size] * scale, tmpl_d[i % size] * scale
+
+_FAMILY_FUNCS = {"uniform": _uniform, "heavy_tailed": _heavy_tailed, "bursty": _bursty,
+                 "nested": _nested, "adversarial": _adversarial}
+
+def _family_params(family: str, n: int, D: int, T: float, seed: int, params: dict) -> dict:
+    """Defaults merged with params, plus any state shared by every block (bursty centres)."""
+    if family not in FAMILIES:
+        raise ValueError(f"Unknown family {family!r}; expected one of {FAMILIES}")
+    unknown = set(params) - set(FAMILY_PARAMS[family])
+    if unknown:
+        raise ValueError(f"Unknown parameters for {family!r}: {sorted(unknown)}")
+    p = {**FAMILY_PARAMS[family], **params}
+    if family == "heavy_tailed" and p["tail"] <= 1:
+        raise ValueError("tail must be > 1 for a finite mean duration")
+    if family == "bursty":
+        p["spread"] = float(D if p["spread"] is None else p["spread"])
+        bursts = max(1, n // p["burst_size"])
+        # Drawn from a stream no block uses, so every block sees the same centres
+        rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(FAMILIES.index(family), 1 << 32)))
+        p["centres"] = np.sort(rng.uniform(0.0, T, size=bursts))
+    return p
+
+def _write(view: np.ndarray, starts: np.ndarray, durations: np.ndarray):
+    """Store float64 starts/durations into an (m,2) view of the output dtype."""
+    dtype = view.dtype
+    if dtype.kind == "i":
+        # Integer ticks: floor the start, round the duration up so no interval collapses
+        starts = np.floor(starts)
+        finishes = starts + np.ceil(durations)
+        if finishes.size and (finishes.max() > np.iinfo(dtype).max or starts.min() < np.iinfo(dtype).min):
+            raise ValueError(f"Generated times overflow {dtype.name}")
+        view[:, 0] = starts
+        view[:, 1] = finishes
+    elif dtype == np.float32:
+        s32 = starts.astype(np.float32)
+        f32 = s32 + durations.astype(np.float32)
+        # Heavy-tailed durations and gadget strides can pass max_tick, so check the rows themselves
+        if f32.size and f32.max() > tick_limit(dtype):
+            raise ValueError(f"Generated times exceed the exact integer range of {dtype.name}")
+        view[:, 0] = s32
+        view[:, 1] = f32
+    else:
+        view[:, 0] = starts
+        view[:, 1] = starts + durations
+
+def _fill_blocks(family: str, n: int, D: int, T: float, seed: int, params: dict, out: np.ndarray,
+                 b_lo: int, b_hi: int, row0: int=0):
+    """Generate blocks [b_lo, b_hi) into out, whose first row is row row0 of the instance."""
+    fn = _FAMILY_FUNCS[family]
+    fid = FAMILIES.index(family)
+    for b in range(b_lo, b_hi):
+        lo, hi = b * _BLOCK, min(n, (b + 1) * _BLOCK)
+        rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(fid, b)))
+        _write(out[lo - row0:hi - row0], *fn(rng, lo, hi, n, D, T, **params))
+
+def _check_args(n: int, D: int, alpha: float, dtype) -> np.dtype:
+    if n <= 0:
+        raise ValueError("n must be positive")
+    if D <= 0:
+        raise ValueError("D must be positive")
+    if alpha <= 0:
+        raise ValueError("alpha must be positive")
+    dtype = np.dtype(dtype)
+    if dtype.name not in INTERVAL_DTYPES:
+        raise ValueError(f"Unsupported dtype {dtype.name!r}; expected one of {INTERVAL_DTYPES}")
+    check_tick_range(n, D, alpha, dtype)
+    return dtype
+
+def _meta(family, n, D, alpha, T, dtype, seed, params) -> dict:
+    shown = {k: v for k, v in params.items() if k != "centres"}
+    return {"family": family, "n": n, "D": D, "alpha": float(alpha), "T": T, "dtype": dtype.name,
+            "seed": seed, **shown}
+
+def generate_intervals(family: str, n: int, D: int, alpha: float, seed: int,
+                       out: Union[None, str, np.ndarray]=None, chunk: int=1 << 22, workers: int=1,
+                       dtype=np.float64, **params) -> Tuple[np.ndarray, dict]:
+    """
+    One (n,2) [start, finish] instance of a dataset family, written block by block straight
+    into the output (no column_stack copy), with T = alpha * n * D as in datasets.py:
+      uniform       s ~ U[0, T), d ~ U{1..D} (the assignment spec, on its own random stream)
+      heavy_tailed  uniform starts, Pareto(tail) durations >= 1 with mean (D + 1) / 2
+      bursty        starts clustered around n / burst_size random centres
+      nested        laminar dyadic trees of `depth` levels (EST takes each root, OPT the leaves)
+      adversarial   EST and SD trap gadgets (see _adversarial)
+
+    out is None (allocate), an (n,2) array of the requested dtype, or a .npy path created as a
+    memory map. Rows are filled in chunks of `chunk` rows (rounded up to 2^16) on `workers`
+    threads (0 = one per CPU; NumPy releases the GIL in its bulk random fills and arithmetic).
+    The result is identical for every chunk size and worker count. Times must fit dtype exactly
+    (datasets.check_tick_range); ValueError otherwise, e.g. float32 past 2^24.
+    """
+    dtype = _check_args(n, D, alpha, dtype)
+    T = float(alpha * n * D)
+    p = _family_params(family, n, D, T, seed, params)
+    if out is None:
+        out = np.empty((n, 2), dtype=dtype)
+    elif isinstance(out, (str, os.PathLike)):
+        out = np.lib.format.open_memmap(out, mode="w+", dtype=dtype, shape=(n, 2))
+    elif out.shape != (n, 2) or out.dtype != dtype:
+        raise ValueError(f"out must have shape {(n, 2)} and dtype {dtype.name}, got {out.shape} {out.dtype}")
+
+    per_task = max(1, -(-chunk // _BLOCK))
+    blocks = -(-n // _BLOCK)
+    tasks = [(b, min(blocks, b + per_task)) for b in range(0, blocks, per_task)]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) == 1:
+        for b_lo, b_hi in tasks:
+            _fill_blocks(family, n, D, T, seed, p, out, b_lo, b_hi)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            for fut in [ex.submit(_fill_blocks, family, n, D, T, seed, p, out, b_lo, b_hi) for b_lo, b_hi in tasks]:
+                fut.result()
+    if isinstance(out, np.memmap):
+        out.flush()
+    return out, _meta(family, n, D, alpha, T, dtype, seed, p)
+
+def iter_interval_chunks(family: str, n: int, D: int, alpha: float, seed: int, chunk: int=1 << 20,
+                         dtype=np.float64, **params) -> Iterator[np.ndarray]:
+    """
+    The rows of generate_intervals(family, n, ...) as consecutive (m,2) chunks of `chunk`
+    rows (rounded up to 2^16), holding one chunk at a time, e.g. for
+    streaming.streaming_earliest_finish(..., sorted_input=False).
+    """
+    dtype = _check_args(n, D, alpha, dtype)
+    T = float(alpha * n * D)
+    p = _family_params(family, n, D, T, seed, params)
+    per_chunk = max(1, -(-chunk // _BLOCK))
+    blocks = -(-n // _BLOCK)
+    for b in range(0, blocks, per_chunk):
+        b_hi = min(blocks, b + per_chunk)
+        lo, hi = b * _BLOCK, min(n, b_hi * _BLOCK)
+        buf = np.empty((hi - lo, 2), dtype=dtype)
+        _fill_blocks(family, n, D, T, seed, p, buf, b, b_hi, row0=lo)
+        yield buf
+
+def generate_cell_family(family: str, n: int, D: int, alpha: float, seed: int, trial: int,
+                         dtype=np.float64, **params) -> Tuple[np.ndarray, dict]:
+    """generate_intervals for one benchmark cell, seeded from cell_seed_sequence like datasets.generate_cell_intervals."""
+    cell_seed = int(cell_seed_sequence(seed, n, D, alpha, trial).generate_state(1, np.uint64)[0])
+    return generate_intervals(family, n, D, alpha, cell_seed, dtype=dtype, **params)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Generate a large interval dataset as a .npy file.")
+    ap.add_argument("--family", choices=list(FAMILIES), default="uniform")
+    ap.add_argument("--n", type=int, required=True)
+    ap.add_argument("--D", type=int, default=10)
+    ap.add_argument("--alpha", type=float, default=1.0)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--dtype", choices=list(INTERVAL_DTYPES), default="float64")
+    ap.add_argument("--out", required=True, help=".npy output, written as a memory map")
+    ap.add_argument("--chunk", type=int, default=1 << 22)
+    # Filling threads: 1 = sequential, 0 = one per CPU
+    ap.add_argument("--workers", type=int, default=0)
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    _, meta = generate_intervals(args.family, args.n, args.D, args.alpha, args.seed, out=args.out,
+                                 chunk=args.chunk, workers=args.workers, dtype=args.dtype)
+    dt = time.perf_counter() - t0
+    print(f"[OK] {meta} -> {args.out} in {dt:.2f}s ({args.n / dt / 1e6:.1f} M rows/s)")
+
+if __name__ == "__main__":
+    main()
@@ -1,38 +1,233 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Callable, List, Tuple, Optional
+from typing import Callable, List, Tuple, Optional, Union
 import numpy as np
 
+from intervals import IntervalSet, as_interval_set
+from profiling import phase
+
+try:
+    import numba
+except ImportError:  # optional: compiled scan for orderings without a jump structure
+    numba = None
+
+ENGINES = ("auto", "jump", "numba", "python")
+
 @dataclass(frozen=True)
 class GreedyResult:
     count: int
-    selected: Optional[np.ndarray] = None  # shape (k,2) if requested
+    selected: Optional[np.ndarray] = None  # shape (k,) indices into intervals, in schedule order
 
-def _select_compatible(sorted_intervals: np.ndarray, return_selected: bool) -> GreedyResult:
+def _scan_loop(starts, finishes, last_finish=-np.inf):
     # Compatibility rule used in interval scheduling:
     # pick (s,f) if s >= last_finish
-    selected = []
-    last_finish = -np.inf
-    for s, f in sorted_intervals:
-        if s >= last_finish:
-            selected.append((s, f))
-            last_finish = f
+    # (last_finish carries the scan state across blocks in the out-of-core path)
+    n = len(starts)
+    out = np.empty(n, dtype=np.int64)
+    k = 0
+    for i in range(n):
+        if starts[i] >= last_finish:
+            out[k] = i
+            k += 1
+            last_finish = finishes[i]
+    return out[:k]
+
+_scan_compiled = numba.njit(cache=True)(_scan_loop) if numba is not None else None
+
+def _jump_chain(nxt: np.ndarray, start: int=0) -> np.ndarray:
+    """
+    Positions visited by following nxt from position start until the sentinel n = len(nxt) - 1.
+    Pointer doubling: round r extends the chain by 2^r entries using jump = nxt^(2^r),
+    so the whole walk is O(log k) vectorized passes instead of k Python steps.
+    """
+    n = nxt.shape[0] - 1
+    if start >= n:
+        return np.empty(0, dtype=np.intp)
+    chain = np.full(1, start, dtype=np.intp)
+    jump = nxt
+    while True:
+        ext = jump[chain]
+        # chain positions are strictly increasing, so the valid entries form a prefix
+        m = int(np.searchsorted(ext, n, side="left"))
+        chain = np.concatenate([chain, ext[:m]])
+        if m < ext.size:
+            return chain
+        jump = jump[jump]
+
+def _next_by_finish(s: np.ndarray, f: np.ndarray, by_start: Optional[np.ndarray]=None) -> np.ndarray:
+    """
+    nxt[i] = first position j > i with s[j] >= f[i], for rows sorted by finish time.
+    Every j with s[j] > f[i] lies after i; ties s[j] == f[i] qualify only when j > i,
+    i.e. the first (s[j], j) lexicographically greater than (f[i], i).
+    by_start lists the positions in start order (equal starts in any order), e.g. mapped from
+    a cached start sort; without it s is argsorted here.
+    """
+    n = s.shape[0]
+    if by_start is None:
+        by_start = np.argsort(s, kind="stable")
+    s_sorted = s[by_start]
+    lo = np.searchsorted(s_sorted, f, side="left")
+    k = lo
+    tied = np.flatnonzero(s_sorted[np.minimum(lo, n - 1)] == f) if n else lo
+    if tied.size:
+        # Resolve (s, pos) > (f_i, i) with one search over a combined integer key; equal starts
+        # must be in position order, and the key is already sorted by group, so this sort is cheap
+        gid = np.zeros(n, dtype=np.int64)
+        np.cumsum(s_sorted[1:] != s_sorted[:-1], out=gid[1:])
+        gkey = np.sort(gid * (n + 1) + by_start, kind="stable")
+        by_start = gkey - gid * (n + 1)
+        k = lo.copy()
+        k[tied] = np.searchsorted(gkey, gid[lo[tied]] * (n + 1) + tied, side="right")
+
+    # suffix minimum of positions: earliest-finishing row among all rows from k on
+    # (lo is the first of its run of equal starts, so untied rows do not depend on the run order)
+    sufmin = np.empty(n + 1, dtype=np.intp)
+    sufmin[n] = n
+    sufmin[:n] = np.minimum.accumulate(by_start[::-1])[::-1]
+
+    nxt = np.empty(n + 1, dtype=np.intp)
+    nxt[n] = n
+    nxt[:n] = sufmin[k]
+    return nxt
+
+def _start_positions(iset: IntervalSet, order: np.ndarray, sort_engine: str="auto") -> np.ndarray:
+    """Positions in `order` listed by start time, mapped from the set's cached start sort."""
+    rank = np.empty(order.shape[0], dtype=np.intp)
+    rank[order] = np.arange(order.shape[0])
+    return rank[iset.order("start", sort_engine)]
+
+def _next_by_start(s: np.ndarray, f: np.ndarray) -> np.ndarray:
+    """nxt[i] = first position j > i with s[j] >= f[i], for rows sorted by start time."""
+    n = s.shape[0]
+    nxt = np.empty(n + 1, dtype=np.intp)
+    nxt[n] = n
+    np.maximum(np.searchsorted(s, f, side="left"), np.arange(1, n + 1), out=nxt[:n])
+    return nxt
+
+_JUMP_KERNELS = {"finish": _next_by_finish, "start": _next_by_start}
+
+def _resolve_engine(engine: str, key: str, iset: Optional[IntervalSet]=None) -> str:
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine {engine!r}; expected one of {ENGINES}")
+    if engine == "auto":
+        # The compiled scan is one O(n) pass; without it the jump chain beats the Python loop
+        # for EST, and for EFT only when the set already holds its start order (at n=2^20 a
+        # fresh start argsort costs more than the loop it replaces)
+        if _scan_compiled is not None:
+            return "numba"
+        if key == "start" or (key == "finish" and iset is not None and iset.has_order("start")):
+            return "jump"
+        return "python"
+    if engine == "jump" and key not in _JUMP_KERNELS:
+        raise ValueError(f"engine='jump' needs an ordering by start or finish, not {key!r}")
+    if engine == "numba" and _scan_compiled is None:
+        raise ValueError("engine='numba' requested but numba is not installed")
+    return engine
+
+def _select_compatible(intervals: Union[np.ndarray, IntervalSet], key: str,
+                       return_selected: bool, engine: str="auto", sort_engine: str="auto") -> GreedyResult:
+    """
+    Scan intervals in increasing key order, keeping each one that starts after the last kept finish.
+    sort_engine is one of sorting.SORT_ENGINES ("auto" uses counting/radix sort for bounded integer keys).
+    """
+    with phase("convert"):
+        iset = as_interval_set(intervals)
+    engine = _resolve_engine(engine, key, iset)
+    with phase("sort"):
+        order = iset.order(key, sort_engine)
+    with phase("gather"):
+        s = iset.starts[order]
+        f = iset.finishes[order]
+    with phase("select"):
+        if engine == "jump" and key == "finish":
+            pos = _jump_chain(_next_by_finish(s, f, _start_positions(iset, order, sort_engine)))
+        elif engine == "jump":
+            pos = _jump_chain(_next_by_start(s, f))
+        elif engine == "numba":
+            pos = _scan_compiled(s, f)
+        else:
+            pos = _scan_loop(s.tolist(), f.tolist())
     if return_selected:
-        return GreedyResult(count=len(selected), selected=np.array(selected, dtype=float))
-    return GreedyResult(count=len(selected), selected=None)
+        return GreedyResult(count=int(pos.size), selected=order[pos])
+    return GreedyResult(count=int(pos.size), selected=None)
 
-def greedy_earliest_finish(intervals: np.ndarray, return_selected: bool=False) -> GreedyResult:
+def greedy_earliest_finish(intervals: Union[np.ndarray, IntervalSet], return_selected: bool=False,
+                           engine: str="auto", sort_engine: str="auto") -> GreedyResult:
     """EFT: sort by increasing finish time f_i."""
-    order = np.argsort(intervals[:, 1], kind="mergesort")
-    return _select_compatible(intervals[order], return_selected)
+    return _select_compatible(intervals, "finish", return_selected, engine, sort_engine)
 
-def greedy_earliest_start(intervals: np.ndarray, return_selected: bool=False) -> GreedyResult:
+def greedy_earliest_start(intervals: Union[np.ndarray, IntervalSet], return_selected: bool=False,
+                          engine: str="auto", sort_engine: str="auto") -> GreedyResult:
     """EST: sort by increasing start time s_i."""
-    order = np.argsort(intervals[:, 0], kind="mergesort")
-    return _select_compatible(intervals[order], return_selected)
+    return _select_compatible(intervals, "start", return_selected, engine, sort_engine)
 
-def greedy_shortest_duration(intervals: np.ndarray, return_selected: bool=False) -> GreedyResult:
+def greedy_shortest_duration(intervals: Union[np.ndarray, IntervalSet], return_selected: bool=False,
+                             engine: str="auto", sort_engine: str="auto") -> GreedyResult:
     """SD: sort by increasing duration (f_i - s_i)."""
-    durations = intervals[:, 1] - intervals[:, 0]
-    order = np.argsort(durations, kind="mergesort")
-    return _select_compatible(intervals[order], return_selected)
+    return _select_compatible(intervals, "duration", return_selected, engine, sort_engine)
+
+@dataclass(frozen=True)
+class BatchGreedyResult:
+    counts: np.ndarray                        # shape (B,) selected count per instance
+    selected: Optional[np.ndarray] = None     # flat per-instance row indices, in schedule order
+    selected_offsets: Optional[np.ndarray] = None  # shape (B+1,), instance b is selected[o[b]:o[b+1]]
+
+_BATCH_KEYS = {
+    "EFT": lambda s, f: f,
+    "EST": lambda s, f: s,
+    "SD":  lambda s, f: f - s,
+}
+
+def _pad_ragged(intervals: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """CSR layout (flat (N,2) rows + (B+1,) offsets) -> padded (B, max_len, 2) with NaN rows."""
+    offsets = np.asarray(offsets, dtype=np.intp)
+    lengths = np.diff(offsets)
+    B = lengths.size
+    width = int(lengths.max()) if B else 0
+    # NaN marks padding, so integer ticks are widened to float64; float32 stays float32
+    dtype = intervals.dtype if intervals.dtype.kind == "f" else np.float64
+    padded = np.full((B, width, 2), np.nan, dtype=dtype)
+    seg = np.repeat(np.arange(B), lengths)
+    col = np.arange(offsets[-1] - offsets[0]) - np.repeat(offsets[:-1] - offsets[0], lengths)
+    padded[seg, col] = intervals[offsets[0]:offsets[-1]]
+    return padded
+
+def greedy_batch(intervals: np.ndarray, criterion: str="EFT", offsets: Optional[np.ndarray]=None,
+                 return_selected: bool=False) -> BatchGreedyResult:
+    """
+    Run one greedy criterion (EFT, EST or SD) on many independent instances at once.
+
+    intervals is either a padded (B, n, 2) tensor whose unused rows are NaN, or, when
+    offsets is given, a flat (N, 2) array where instance b owns rows offsets[b]:offsets[b+1].
+    All instances are sorted with a single argsort along axis 1 and scanned in lockstep,
+    so the Python overhead is O(max n) numpy calls regardless of B. Intended for many
+    small instances: ragged input is padded to the longest one.
+    Selected indices are row positions within each instance.
+    """
+    if criterion not in _BATCH_KEYS:
+        raise ValueError(f"Unknown criterion {criterion!r}; expected one of {tuple(_BATCH_KEYS)}")
+    if offsets is not None:
+        intervals = _pad_ragged(intervals, offsets)
+    if intervals.ndim != 3 or intervals.shape[2] != 2:
+        raise ValueError(f"Expected padded intervals of shape (B, n, 2), got {intervals.shape}")
+
+    B, n = intervals.shape[:2]
+    key = _BATCH_KEYS[criterion](intervals[:, :, 0], intervals[:, :, 1])
+    order = np.argsort(key, axis=1, kind="stable")  # NaN padding sorts last
+    # (n, B) layout so each lockstep column is contiguous
+    s = np.take_along_axis(intervals[:, :, 0], order, axis=1).T.copy()
+    f = np.take_along_axis(intervals[:, :, 1], order, axis=1).T.copy()
+
+    picked = np.zeros((n, B), dtype=bool)
+    last_finish = np.full(B, -np.inf)
+    for t in range(n):
+        # NaN padding never satisfies s >= last_finish
+        take = np.greater_equal(s[t], last_finish, out=picked[t])
+        np.copyto(last_finish, f[t], where=take)
+
+    counts = picked.sum(axis=0)
+    if not return_selected:
+        return BatchGreedyResult(counts=counts)
+    selected_offsets = np.zeros(B + 1, dtype=np.intp)
+    np.cumsum(counts, out=selected_offsets[1:])
+    return BatchGreedyResult(counts=counts, selected=order[picked.T], selected_offsets=selected_offsets)
@@ -0,0 +1,87 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import List, Tuple
+import argparse, csv, os, statistics, subprocess, sys
+
+# Modules a cold `import` should not drag in; they load only when plotting / pandas parsing runs
+HEAVY_MODULES = ("matplotlib", "pandas", "pyarrow")
+
+DEFAULT_MODULES = (
+    "greedy", "exhaustive", "weighted", "streaming", "incremental", "partitioning", "datasets",
+    "intervals", "sorting", "timing", "profiling", "results_store", "perf_regression", "compat", "generators",
+    "service", "benchmark_suites", "benchmark", "plots", "analyze_results",
+)
+
+@dataclass(frozen=True)
+class ImportProfile:
+    module: str
+    total_us: float                  # median cumulative import time over the repeats
+    heavy: Tuple[str, ...]           # HEAVY_MODULES that were imported
+    top: List[Tuple[str, int]]       # largest direct dependencies (name, cumulative us) of the last run
+
+def _parse_importtime(stderr: str) -> List[Tuple[int, int, str]]:
+    """`python -X importtime` lines -> (self us, cumulative us, indented name)."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((int(self_us), int(cum_us), name.rstrip()))
+    return rows
+
+def profile_import(module: str, repeats: int=5, top: int=5) -> ImportProfile:
+    """Cold-start cost of `import module`, each repeat in a fresh interpreter (after one bytecode-warming run)."""
+    cmd = [sys.executable, "-X", "importtime", "-c", f"import {module}"]
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    totals, rows = [], []
+    for i in range(repeats + 1):
+        out = subprocess.run(cmd, cwd=cwd, capture_output=True, text=True)
+        if out.returncode != 0:
+            raise RuntimeError(f"import {module} failed:\n{out.stderr.strip().splitlines()[-1]}")
+        rows = _parse_importtime(out.stderr)
+        if i:  # the first run only compiles .pyc files
+            totals.append(next(cum for _, cum, name in rows if name.strip() == module))
+    names = {name.strip().split(".")[0] for _, _, name in rows}
+    # Children are listed before their parent, indented two more spaces: walk back from the
+    # module's line to the previous top-level import (interpreter startup) to find them
+    end = max(i for i, (_, _, name) in enumerate(rows) if name.strip() == module)
+    start = end
+    while start > 0 and len(rows[start - 1][2]) - len(rows[start - 1][2].lstrip()) > 1:
+        start -= 1
+    direct = [(name.strip(), cum) for _, cum, name in rows[start:end]
+              if len(name) - len(name.lstrip()) == 3]
+    return ImportProfile(module=module, total_us=statistics.median(totals),
+                         heavy=tuple(m for m in HEAVY_MODULES if m in names),
+                         top=sorted(direct, key=lambda x: -x[1])[:top])
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Report cold import time per module (python -X importtime).")
+    ap.add_argument("--modules", nargs="+", default=list(DEFAULT_MODULES))
+    ap.add_argument("--repeats", type=int, default=5)
+    # Exit non-zero if any module exceeds this budget or imports one of HEAVY_MODULES
+    ap.add_argument("--budget_ms", type=float, default=None)
+    ap.add_argument("--allow_heavy", action="store_true", help="do not fail on matplotlib/pandas/pyarrow imports")
+    ap.add_argument("--out_csv", default=None)
+    args = ap.parse_args(argv)
+
+    profiles = [profile_import(m, repeats=args.repeats) for m in args.modules]
+    failed = False
+    print(f"{'module':<18} {'import (ms)':>11}  {'heavy':<10} top dependencies (ms)")
+    for p in profiles:
+        deps = ", ".join(f"{name} {us / 1000:.1f}" for name, us in p.top)
+        print(f"{p.module:<18} {p.total_us / 1000:>11.1f}  {','.join(p.heavy) or '-':<10} {deps}")
+        over = args.budget_ms is not None and p.total_us / 1000 > args.budget_ms
+        if over or (p.heavy and not args.allow_heavy):
+            failed = True
+            print(f"[FAIL] {p.module}: " + ("over budget" if over else f"imports {', '.join(p.heavy)}"))
+
+    if args.out_csv:
+        with open(args.out_csv, "w", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            w.writerow(["module", "import_ms", "heavy"])
+            for p in profiles:
+                w.writerow([p.module, p.total_us / 1000, ";".join(p.heavy)])
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+from __future__ import annotations
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+from greedy import greedy_earliest_finish
+
+class IncrementalEFT:
+    """
+    EFT schedule maintained under insert / remove.
+
+    Intervals live in a blocked sorted array ordered by (finish, handle), where handles are
+    issued in insertion order, so ties break exactly like the stable sort in
+    greedy_earliest_finish. Each block keeps its start/finish/handle columns and a
+    "selected" flag column. An update only rescans the EFT chain from the edited position
+    until the new chain re-joins the old one (picks an interval that was already
+    selected), and an edit that cannot change the chain (removing an unselected interval,
+    inserting one that starts before the preceding selected finish) costs no rescan.
+    """
+
+    def __init__(self, intervals: Optional[np.ndarray]=None, block_size: int=512):
+        self.block_size = block_size
+        self._starts: List[np.ndarray] = []
+        self._finishes: List[np.ndarray] = []
+        self._handles: List[np.ndarray] = []
+        self._selected: List[np.ndarray] = []
+        self._maxes: List[Tuple[float, int]] = []   # (finish, handle) of each block's last row
+        self._keys: Dict[int, Tuple[float, float]] = {}  # handle -> (start, finish)
+        self._next_handle = 0
+        self.count = 0
+        if intervals is not None and len(intervals):
+            self._bulk_load(np.asarray(intervals, dtype=float))
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _bulk_load(self, intervals: np.ndarray):
+        n = intervals.shape[0]
+        handles = np.arange(n)
+        order = np.argsort(intervals[:, 1], kind="mergesort")
+        chosen = greedy_earliest_finish(intervals, return_selected=True).selected
+        rank = np.empty(n, dtype=np.intp)
+        rank[order] = np.arange(n)
+        sel = np.zeros(n, dtype=bool)
+        sel[rank[chosen]] = True
+        for lo in range(0, n, self.block_size):
+            part = order[lo:lo + self.block_size]
+            self._starts.append(intervals[part, 0].copy())
+            self._finishes.append(intervals[part, 1].copy())
+            self._handles.append(handles[part].copy())
+            self._selected.append(sel[lo:lo + self.block_size].copy())
+            self._maxes.append((float(intervals[part[-1], 1]), int(part[-1])))
+        self._keys = {i: (float(intervals[i, 0]), float(intervals[i, 1])) for i in range(n)}
+        self._next_handle = n
+        self.count = int(chosen.size)
+
+    # -- locating rows -------------------------------------------------------------------
+
+    def _locate(self, finish: float, handle: int) -> Tuple[int, int]:
+        """(block, index) where a row with this (finish, handle) key is or would be inserted."""
+        b = bisect_left(self._maxes, (finish, handle))
+        if b == len(self._maxes):
+            if b == 0:
+                return 0, 0
+            b -= 1
+            return b, self._finishes[b].size
+        f, h = self._finishes[b], self._handles[b]
+        lo = int(np.searchsorted(f, finish, side="left"))
+        hi = int(np.searchsorted(f, finish, side="right"))
+        return b, lo + int(np.searchsorted(h[lo:hi], handle, side="left"))
+
+    def _last_selected_finish(self, b: int, i: int) -> float:
+        """Finish of the last selected row strictly before position (b, i), or -inf."""
+        hits = np.flatnonzero(self._selected[b][:i])
+        if hits.size:
+            return float(self._finishes[b][hits[-1]])
+        for c in range(b - 1, -1, -1):
+            hits = np.flatnonzero(self._selected[c])
+            if hits.size:
+                return float(self._finishes[c][hits[-1]])
+        return -np.inf
+
+    # -- chain repair --------------------------------------------------------------------
+
+    def _repair(self, b: int, i: int, last_finish: float):
+        """Rescan the chain from (b, i) with the given state until it re-joins the old chain."""
+        while b < len(self._starts):
+            s, sel = self._starts[b], self._selected[b]
+            while i < s.size:
+                hits = np.flatnonzero(s[i:] >= last_finish)
+                j = i + int(hits[0]) if hits.size else s.size
+                # Rows skipped by the new chain are no longer selected
+                self.count -= int(np.count_nonzero(sel[i:j]))
+                sel[i:j] = False
+                if j == s.size:
+                    break
+                if sel[j]:
+                    return  # same pick, same state: the rest of the old chain stands
+                sel[j] = True
+                self.count += 1
+                last_finish = float(self._finishes[b][j])
+                i = j + 1
+            b += 1
+            i = 0
+
+    # -- public API ----------------------------------------------------------------------
+
+    def insert(self, start: float, finish: float) -> int:
+        """Add an interval and return its handle (for remove)."""
+        handle = self._next_handle
+        self._next_handle += 1
+        self._keys[handle] = (float(start), float(finish))
+        b, i = self._locate(finish, handle)
+        if not self._starts:
+            self._starts.append(np.empty(0))
+            self._finishes.append(np.empty(0))
+            self._handles.append(np.empty(0, dtype=np.int64))
+            self._selected.append(np.empty(0, dtype=bool))
+            self._maxes.append((finish, handle))
+        self._starts[b] = np.insert(self._starts[b], i, start)
+        self._finishes[b] = np.insert(self._finishes[b], i, finish)
+        self._handles[b] = np.insert(self._handles[b], i, handle)
+        self._selected[b] = np.insert(self._selected[b], i, False)
+        self._maxes[b] = (float(self._finishes[b][-1]), int(self._handles[b][-1]))
+
+        last_finish = self._last_selected_finish(b, i)
+        if start >= last_finish:
+            self._repair(b, i, last_finish)
+        if self._starts[b].size > 2 * self.block_size:
+            self._split(b)
+        return handle
+
+    def remove(self, handle: int):
+        """Remove the interval with this handle (KeyError if unknown)."""
+        start, finish = self._keys.pop(handle)
+        b, i = self._locate(finish, handle)
+        was_selected = bool(self._selected[b][i])
+        self._starts[b] = np.delete(self._starts[b], i)
+        self._finishes[b] = np.delete(self._finishes[b], i)
+        self._handles[b] = np.delete(self._handles[b], i)
+        self._selected[b] = np.delete(self._selected[b], i)
+        if was_selected:
+            self.count -= 1
+            self._repair(b, i, self._last_selected_finish(b, i))
+        if self._starts[b].size == 0:
+            for cols in (self._starts, self._finishes, self._handles, self._selected, self._maxes):
+                del cols[b]
+        else:
+            self._maxes[b] = (float(self._finishes[b][-1]), int(self._handles[b][-1]))
+
+    def _split(self, b: int):
+        half = self._starts[b].size // 2
+        for cols in (self._starts, self._finishes, self._handles, self._selected):
+            block = cols[b]
+            cols[b:b + 1] = [block[:half].copy(), block[half:].copy()]
+        self._maxes[b:b + 1] = [
+            (float(self._finishes[b][-1]), int(self._handles[b][-1])),
+            (float(self._finishes[b + 1][-1]), int(self._handles[b + 1][-1])),
+        ]
+
+    def current_schedule(self) -> np.ndarray:
+        """Handles of the selected intervals, in schedule (finish) order."""
+        if not self._handles:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([h[sel] for h, sel in zip(self._handles, self._selected)])
+
+    def to_array(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(handles, (n,2) rows) of the live intervals, in handle (insertion) order."""
+        handles = np.array(sorted(self._keys), dtype=np.int64)
+        rows = np.array([self._keys[h] for h in handles.tolist()], dtype=float).reshape(-1, 2)
+        return handles, rows
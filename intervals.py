@@ -0,0 +1,100 @@
+from __future__ import annotations
+from typing import Dict, Tuple, Union
+import numpy as np
+
+from profiling import phase
+from sorting import stable_argsort
+
+SORT_KEYS = ("start", "finish", "duration")
+
+class IntervalSet:
+    """
+    Structure-of-arrays interval container: contiguous start and finish columns
+    (float64 by default; float32 or int64 ticks on request).
+    Durations and the stable sort permutation of each key are computed on first use
+    and cached, so running EFT, EST and SD on one set sorts each key at most once.
+    Treat the columns as read-only: the caches are not invalidated on mutation.
+    """
+    __slots__ = ("starts", "finishes", "_durations", "_orders")
+
+    def __init__(self, starts: np.ndarray, finishes: np.ndarray, dtype=np.float64):
+        self.starts = np.ascontiguousarray(starts, dtype=dtype)
+        self.finishes = np.ascontiguousarray(finishes, dtype=dtype)
+        if self.starts.shape != self.finishes.shape or self.starts.ndim != 1:
+            raise ValueError("starts and finishes must be 1-D arrays of equal length")
+        self._durations = None
+        self._orders: Dict[str, np.ndarray] = {}
+
+    @classmethod
+    def from_array(cls, intervals: np.ndarray, dtype=np.float64) -> "IntervalSet":
+        """Build from the (n,2) [start, finish] layout used by datasets.py."""
+        if intervals.ndim != 2 or intervals.shape[1] != 2:
+            raise ValueError(f"Expected intervals of shape (n, 2), got {intervals.shape}")
+        return cls(intervals[:, 0], intervals[:, 1], dtype=dtype)
+
+    def __len__(self) -> int:
+        return self.starts.shape[0]
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.starts.dtype
+
+    @property
+    def durations(self) -> np.ndarray:
+        if self._durations is None:
+            self._durations = self.finishes - self.starts
+        return self._durations
+
+    def key(self, name: str) -> np.ndarray:
+        if name == "start":
+            return self.starts
+        if name == "finish":
+            return self.finishes
+        if name == "duration":
+            return self.durations
+        raise ValueError(f"Unknown sort key {name!r}; expected one of {SORT_KEYS}")
+
+    def order(self, name: str, engine: str="auto") -> np.ndarray:
+        """
+        Stable ascending permutation of the given key (cached). engine picks the sort
+        (see sorting.SORT_ENGINES); all engines give the same permutation, so the cache
+        is shared and engine only matters for the first call per key.
+        """
+        order = self._orders.get(name)
+        if order is None:
+            order = stable_argsort(self.key(name), engine)
+            self._orders[name] = order
+        return order
+
+    def has_order(self, name: str) -> bool:
+        """Whether the sort permutation of the given key is already cached."""
+        return name in self._orders
+
+    def to_array(self) -> np.ndarray:
+        """The (n,2) row-major layout (a copy)."""
+        return np.column_stack([self.starts, self.finishes])
+
+def as_interval_set(intervals: Union[np.ndarray, IntervalSet]) -> IntervalSet:
+    """Pass an IntervalSet through; wrap an (n,2) array, keeping a numeric dtype (else float64)."""
+    if isinstance(intervals, IntervalSet):
+        return intervals
+    intervals = np.asarray(intervals)
+    dtype = intervals.dtype if intervals.dtype.kind in "iuf" else np.float64
+    return IntervalSet.from_array(intervals, dtype=dtype)
+
+def finish_predecessors(intervals: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    (order, s, f, pred) for the finish-sorted dynamic programs (exhaustive "dp", weighted):
+    rows in finish order with s, f gathered, and pred[j] = number of rows (in order) that
+    finish no later than s[j], i.e. the prefix compatible with row j.
+    """
+    n = intervals.shape[0]
+    with phase("sort"):
+        # Ties on finish go shortest-last, so zero-length intervals follow their neighbours
+        order = np.lexsort((intervals[:, 0], intervals[:, 1]))
+        s = intervals[order, 0]
+        f = intervals[order, 1]
+    with phase("compat"):
+        # Clip to j so a zero-length interval never points past itself
+        pred = np.minimum(np.searchsorted(f, s, side="right"), np.arange(n))
+    return order, s, f, pred
@@ -0,0 +1,228 @@
+from __future__ import annotations
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Tuple
+import argparse, json, sys
+import numpy as np
+
+from results_store import load_table, run_metadata, select
+
+# Runtime columns fitted per results table, and the model each one follows:
+#   "nlogn": t = c * n^a * log2(n)^b    (b fixed unless fit_log_power)
+#   "exp2":  t = c * 2^(a * n)
+TABLE_MODELS = {
+    "greedy": ("nlogn", ("EFT", "EST", "SD")),
+    "exhaustive": ("exp2", ("exhaustive",)),
+    "weighted": ("nlogn", ("weighted", "EFT")),
+    "partition": ("nlogn", ("heap", "sweep")),
+}
+
+@dataclass(frozen=True)
+class Fit:
+    table: str
+    algo: str
+    alpha: float
+    model: str
+    a: float                 # exponent of n (nlogn) or of 2^n (exp2)
+    b: float                 # exponent of log2 n (nlogn; fixed unless fitted), 0 for exp2
+    c: float                 # constant factor in seconds
+    n_ref: float             # geometric-mean n of the data (nlogn) or mean n (exp2)
+    t_ref: float             # fitted seconds at n_ref: the constant, decoupled from the exponent
+    a_ci: Tuple[float, float]
+    t_ref_ci: Tuple[float, float]
+    rows: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.table}/{self.algo}/alpha={self.alpha!r}"
+
+    def predict(self, n) -> np.ndarray:
+        n = np.asarray(n, dtype=float)
+        if self.model == "exp2":
+            return self.c * np.exp2(self.a * n)
+        return self.c * n ** self.a * np.log2(n) ** self.b
+
+def _design(model: str, n: np.ndarray, fit_log_power: bool) -> Tuple[np.ndarray, float]:
+    """Regressors for log2 t, centred at the reference size so intercept and slope are uncorrelated."""
+    if model == "exp2":
+        n_ref = float(n.mean())
+        return np.column_stack([np.ones_like(n), n - n_ref]), n_ref
+    n_ref = float(np.exp2(np.log2(n).mean()))
+    cols = [np.ones_like(n), np.log2(n) - np.log2(n_ref)]
+    if fit_log_power:
+        cols.append(np.log2(np.log2(n)) - np.log2(np.log2(n_ref)))
+    return np.column_stack(cols), n_ref
+
+# Bootstrap weights are drawn this many (resample, row) cells at a time
+_BOOT_CELLS = 1 << 20
+
+def _weighted_lstsq(X: np.ndarray, w: np.ndarray, wy: np.ndarray) -> np.ndarray:
+    """
+    Least squares for every weight row at once, from per-design-row sums: w is (B, g) total
+    weight and wy (B, g) weighted sum of y per distinct row of X (g, p); returns (B, p).
+    """
+    XtWX = np.einsum("bg,gi,gj->bij", w, X, X)
+    XtWy = np.einsum("bg,gi->bi", wy, X)
+    # pinv: a resample that drew a single n has a singular system; it then yields the min-norm fit
+    return np.einsum("bij,bj->bi", np.linalg.pinv(XtWX), XtWy)
+
+def fit_series(table: str, algo: str, alpha: float, model: str, n: np.ndarray, t: np.ndarray,
+               log_power: float=1.0, fit_log_power: bool=False, bootstrap: int=1000,
+               level: float=0.95, rng: Optional[np.random.Generator]=None) -> Fit:
+    """
+    Least-squares fit of log2 t over one (algorithm, alpha) series of trial rows, with
+    percentile bootstrap confidence intervals from resampling rows with replacement.
+    For nlogn with b held at log_power, the log factor is divided out before fitting.
+    """
+    rng = np.random.default_rng(0) if rng is None else rng
+    n = np.asarray(n, dtype=float)
+    y = np.log2(np.asarray(t, dtype=float))
+    b = 0.0
+    if model == "nlogn" and not fit_log_power:
+        b = log_power
+        y = y - b * np.log2(np.log2(n))
+    X, n_ref = _design(model, n, fit_log_power)
+
+    # Rows with the same n share a design row, so each fit only needs the weight and the
+    # weighted sum of y per distinct n; resamples are drawn a chunk of B at a time
+    m = n.size
+    _, first, group = np.unique(n, return_index=True, return_inverse=True)
+    X = X[first]
+    onehot = (group[:, None] == np.arange(first.size)).astype(float)
+    est = _weighted_lstsq(X, onehot.sum(axis=0)[None, :], (y @ onehot)[None, :])[0]
+    chunk = max(1, _BOOT_CELLS // m)
+    boot = np.empty((bootstrap, X.shape[1]))
+    for lo in range(0, bootstrap, chunk):
+        w = rng.multinomial(m, np.full(m, 1.0 / m), size=min(chunk, bootstrap - lo)).astype(float)
+        boot[lo:lo + w.shape[0]] = _weighted_lstsq(X, w @ onehot, (w * y) @ onehot)
+    if model == "nlogn" and fit_log_power:
+        b = float(est[2])
+
+    # The centred intercept is log2 of the fitted time at n_ref, minus the log factor held out of y
+    held_out = b * np.log2(np.log2(n_ref)) if model == "nlogn" and not fit_log_power else 0.0
+
+    def log2_t_ref(co):
+        return co[..., 0] + held_out
+
+    tail = (1.0 - level) / 2 * 100
+    a_ci = tuple(float(v) for v in np.percentile(boot[:, 1], [tail, 100 - tail]))
+    t_ref_ci = tuple(float(v) for v in np.exp2(np.percentile(log2_t_ref(boot), [tail, 100 - tail])))
+    a = float(est[1])
+    t_ref = float(np.exp2(log2_t_ref(est)))
+    if model == "exp2":
+        c = t_ref / np.exp2(a * n_ref)
+    else:
+        c = t_ref / (n_ref ** a * np.log2(n_ref) ** b)
+    return Fit(table=table, algo=algo, alpha=float(alpha), model=model, a=a, b=float(b), c=float(c),
+               n_ref=n_ref, t_ref=t_ref, a_ci=a_ci, t_ref_ci=t_ref_ci, rows=int(m))
+
+def fit_results(results_dir: str, source: str="csv", tables=tuple(TABLE_MODELS), log_power: float=1.0,
+                fit_log_power: bool=False, bootstrap: int=1000, seed: int=0) -> List[Fit]:
+    """Fit every runtime column of every available table, one series per (algorithm, alpha)."""
+    rng = np.random.default_rng(seed)
+    fits = []
+    for table in tables:
+        cols = load_table(results_dir, table, source=source)
+        if cols is None:
+            continue
+        model, algos = TABLE_MODELS[table]
+        for algo in algos:
+            name = f"t_{algo}"
+            if name not in cols:
+                continue
+            for alpha in np.unique(cols["alpha"]):
+                s = select(cols, cols["alpha"] == alpha)
+                ok = np.isfinite(s[name]) & (s[name] > 0)
+                # nlogn needs log2(log2 n) defined; at least two sizes to fit a slope
+                ok &= s["n"] > (2 if model == "nlogn" else 0)
+                if np.unique(s["n"][ok]).size < 2:
+                    continue
+                fits.append(fit_series(table, algo, alpha, model, s["n"][ok], s[name][ok], log_power=log_power,
+                                       fit_log_power=fit_log_power, bootstrap=bootstrap, rng=rng))
+    return fits
+
+def save_baseline(path: str, fits: List[Fit], meta: dict):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"meta": meta, "fits": {fit.key: asdict(fit) for fit in fits}}, f, indent=2, default=str)
+
+def load_baseline(path: str) -> Dict[str, Fit]:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return {key: Fit(**{**d, "a_ci": tuple(d["a_ci"]), "t_ref_ci": tuple(d["t_ref_ci"])})
+            for key, d in data["fits"].items()}
+
+@dataclass(frozen=True)
+class Regression:
+    key: str
+    kind: str        # "exponent" or "constant"
+    baseline: float
+    current: float
+
+def compare(fits: List[Fit], baseline: Dict[str, Fit], exponent_tol: float=0.1,
+            time_tol: float=0.25) -> List[Regression]:
+    """
+    Regressions of fits against a baseline: the exponent a grew by more than exponent_tol,
+    or the fitted time at the baseline's n_ref grew by more than time_tol (relative).
+    Series missing from either side are ignored.
+    """
+    found = []
+    for fit in fits:
+        base = baseline.get(fit.key)
+        if base is None or base.model != fit.model:
+            continue
+        if fit.a - base.a > exponent_tol:
+            found.append(Regression(fit.key, "exponent", base.a, fit.a))
+        t_now = float(fit.predict(base.n_ref))
+        if t_now > base.t_ref * (1.0 + time_tol):
+            found.append(Regression(fit.key, "constant", base.t_ref, t_now))
+    return found
+
+def _model_text(fit: Fit) -> str:
+    if fit.model == "exp2":
+        return f"{fit.c:.3e} * 2^({fit.a:.3f} n)"
+    return f"{fit.c:.3e} * n^{fit.a:.3f} * log2(n)^{fit.b:.2f}"
+
+def print_fits(fits: List[Fit]):
+    print(f"{'series':<34} {'model':<40} {'a (95% CI)':<24} {'t(n_ref) (95% CI)'}")
+    for fit in fits:
+        a_ci = f"{fit.a:.3f} [{fit.a_ci[0]:.3f}, {fit.a_ci[1]:.3f}]"
+        t_ci = f"{fit.t_ref:.3e}s @ n={fit.n_ref:.0f} [{fit.t_ref_ci[0]:.3e}, {fit.t_ref_ci[1]:.3e}]"
+        print(f"{fit.key:<34} {_model_text(fit):<40} {a_ci:<24} {t_ci}")
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Fit asymptotic runtime models and gate on regressions.")
+    ap.add_argument("--results_dir", default="results")
+    ap.add_argument("--source", choices=["csv", "store"], default="csv")
+    ap.add_argument("--tables", nargs="+", choices=list(TABLE_MODELS), default=list(TABLE_MODELS))
+    # nlogn models: b is held at --log_power (1 = n log n) unless --fit_log_power
+    ap.add_argument("--log_power", type=float, default=1.0)
+    ap.add_argument("--fit_log_power", action="store_true")
+    ap.add_argument("--bootstrap", type=int, default=1000)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--baseline", default=None, help="baseline JSON to compare against")
+    ap.add_argument("--save_baseline", default=None, help="write the current fits as a baseline JSON")
+    ap.add_argument("--exponent_tol", type=float, default=0.1)
+    ap.add_argument("--time_tol", type=float, default=0.25)
+    args = ap.parse_args(argv)
+
+    fits = fit_results(args.results_dir, source=args.source, tables=args.tables, log_power=args.log_power,
+                       fit_log_power=args.fit_log_power, bootstrap=args.bootstrap, seed=args.seed)
+    if not fits:
+        print(f"[ERROR] No results to fit in {args.results_dir}")
+        return 2
+    print_fits(fits)
+
+    if args.save_baseline:
+        save_baseline(args.save_baseline, fits, run_metadata(seed=args.seed, results_dir=args.results_dir))
+        print(f"[OK] Saved baseline to: {args.save_baseline}")
+
+    if args.baseline:
+        regressions = compare(fits, load_baseline(args.baseline), args.exponent_tol, args.time_tol)
+        for r in regressions:
+            print(f"[REGRESSION] {r.key}: {r.kind} {r.baseline:.4g} -> {r.current:.4g}")
+        if regressions:
+            return 1
+        print(f"[OK] No regressions against {args.baseline}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,264 +1,568 @@
 from __future__ import annotations
-import argparse, os, math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+import argparse, glob, hashlib, json, os, math
 import numpy as np
-import matplotlib.pyplot as plt
+
+from profiling import GREEDY_PHASES
+from results_store import load_table, groupby, select
+
+def _pyplot():
+    # matplotlib is only loaded once a plot is actually drawn
+    import matplotlib.pyplot as plt
+    return plt
 
 def ensure_dir(p: str):
     os.makedirs(p, exist_ok=True)
 
-def load_csv(path: str):
-    import csv
-    with open(path, "r", encoding="utf-8") as f:
-        r = csv.DictReader(f)
-        rows = list(r)
-    return rows
-
-def _group(rows, keys):
-    groups = {}
-    for row in rows:
-        k = tuple(row[key] for key in keys)
-        groups.setdefault(k, []).append(row)
-    return groups
-
-def plot_greedy(results_dir: str, out_dir: str):
-    greedy_path = os.path.join(results_dir, "greedy_results.csv")
-    if not os.path.exists(greedy_path):
-        print(f"[SKIP] Missing {greedy_path}")
-        return
+def _load(results_dir: str, table: str, source: str, run_ids=None):
+    """Columns of one results table (see results_store.load_table), printing a skip note if absent."""
+    cols = load_table(results_dir, table, source=source, run_ids=run_ids)
+    if cols is None:
+        where = os.path.join(results_dir, f"{table}_results.csv") if source == "csv" else f"store table {table!r}"
+        print(f"[SKIP] Missing {where}")
+    return cols
+
+def _band_values(cols, names):
+    """Per-trial IQR columns (t_<name>_q1 / t_<name>_q3) to average, if the results have them."""
+    keys = [f"t_{name}_{q}" for name in names for q in ("q1", "q3")]
+    return keys if all(k in cols for k in keys) else []
+
+def _plot_with_band(n, t, lo, hi, **kwargs):
+    plt = _pyplot()
+    # Median runtime with its inter-quartile band (if measured)
+    line, = plt.plot(n, t, marker="o", **kwargs)
+    if lo is not None:
+        plt.fill_between(n, lo, hi, color=line.get_color(), alpha=0.2, linewidth=0)
+
+# Every plot is split into an aggregation of its results table and a list of Figures. A Figure
+# names a module-level _draw_* function and the (small) arrays it draws, so it can be rendered
+# in another process and fingerprinted to skip figures whose inputs did not change.
+
+@dataclass(frozen=True)
+class Figure:
+    name: str   # output file name within out_dir
+    draw: str   # key of _DRAW
+    data: dict  # keyword arguments of the draw function
+
+# -- greedy ------------------------------------------------------------------------------
 
-    rows = load_csv(greedy_path)
-
-    # Convert numeric fields
-    for r in rows:
-        for k in ["alpha","D","n","trial","t_EFT","t_EST","t_SD","count_EFT","count_EST","count_SD"]:
-            r[k] = float(r[k]) if k in ["alpha","t_EFT","t_EST","t_SD"] else int(r[k])
-
-    groups = _group(rows, keys=["alpha","D","n"])
-
-    # Aggregate mean and std
-    agg = []
-    for (alpha, D, n), rs in groups.items():
-        t_eft = np.array([x["t_EFT"] for x in rs], dtype=float)
-        t_est = np.array([x["t_EST"] for x in rs], dtype=float)
-        t_sd  = np.array([x["t_SD"]  for x in rs], dtype=float)
-        agg.append({
-            "alpha": float(alpha),
-            "D": int(D),
-            "n": int(n),
-            "t_EFT_mean": float(t_eft.mean()),
-            "t_EST_mean": float(t_est.mean()),
-            "t_SD_mean":  float(t_sd.mean()),
-        })
+def _agg_greedy(cols):
+    # Mean over trials per (alpha, D, n); band = mean over trials of each trial's q1 / q3
+    bands = _band_values(cols, ["EFT","EST","SD"])
+    return groupby(cols, keys=["alpha","D","n"], values=["t_EFT","t_EST","t_SD", *bands])
 
+def _figures_greedy(agg) -> List[Figure]:
+    figs = []
+    bands = "t_EFT_q1_mean" in agg
     # Plot per alpha: runtime t(n) vs n (log-log)
-    for alpha in sorted(set(a["alpha"] for a in agg)):
-        data = sorted([a for a in agg if a["alpha"] == alpha], key=lambda x: x["n"])
-        n = np.array([d["n"] for d in data], dtype=float)
-        t_eft = np.array([d["t_EFT_mean"] for d in data], dtype=float)
-        t_est = np.array([d["t_EST_mean"] for d in data], dtype=float)
-        t_sd  = np.array([d["t_SD_mean"]  for d in data], dtype=float)
-
-        plt.figure()
-        plt.plot(n, t_eft, marker="o", label="EFT")
-        plt.plot(n, t_est, marker="o", label="EST")
-        plt.plot(n, t_sd,  marker="o", label="SD")
-        plt.xscale("log", base=2)
-        plt.yscale("log")
-        plt.xlabel("n (number of intervals)")
-        plt.ylabel("runtime t(n) (seconds)")
-        plt.title(f"Greedy Runtime vs n (log-log), alpha={alpha}")
-        plt.legend()
-        plt.tight_layout()
-        plt.savefig(os.path.join(out_dir, f"greedy_runtime_loglog_alpha_{alpha}.png"), dpi=200)
-        plt.close()
-
-        # Normalized runtime: t(n)/(n log2 n)
-        denom = n * np.log2(n)
-        plt.figure()
-        plt.plot(n, t_eft/denom, marker="o", label="EFT")
-        plt.plot(n, t_est/denom, marker="o", label="EST")
-        plt.plot(n, t_sd/denom,  marker="o", label="SD")
-        plt.xscale("log", base=2)
-        plt.xlabel("n (number of intervals)")
-        plt.ylabel("t(n) / (n log2 n)")
-        plt.title(f"Greedy Normalized Runtime, alpha={alpha}")
-        plt.legend()
-        plt.tight_layout()
-        plt.savefig(os.path.join(out_dir, f"greedy_normalized_alpha_{alpha}.png"), dpi=200)
-        plt.close()
-
-    print(f"[OK] Greedy plots saved to: {out_dir}")
-
-def plot_exhaustive(results_dir: str, out_dir: str):
-    ex_path = os.path.join(results_dir, "exhaustive_results.csv")
-    if not os.path.exists(ex_path):
-        print(f"[SKIP] Missing {ex_path}")
-        return
+    for alpha in np.unique(agg["alpha"]):
+        data = select(agg, agg["alpha"] == alpha)
+        order = np.argsort(data["n"], kind="stable")
+        n = data["n"][order].astype(float)
+        means = {name: data[f"t_{name}_mean"][order] for name in ("EFT","EST","SD")}
+        band = {}
+        for name in ("EFT","EST","SD"):
+            if bands:
+                band[name] = (data[f"t_{name}_q1_mean"][order], data[f"t_{name}_q3_mean"][order])
+            else:
+                band[name] = (None, None)
+        args = {"alpha": alpha, "n": n, "means": means, "band": band}
+        figs.append(Figure(f"greedy_runtime_loglog_alpha_{alpha}.png", "greedy_runtime", args))
+        figs.append(Figure(f"greedy_normalized_alpha_{alpha}.png", "greedy_normalized", args))
+    return figs
 
-    rows = load_csv(ex_path)
-    for r in rows:
-        for k in ["alpha","D","n","trial","t_exhaustive","opt_count","greedy_EFT_count","greedy_EST_count","greedy_SD_count"]:
-            r[k] = float(r[k]) if k in ["alpha","t_exhaustive"] else int(r[k])
-
-    groups = _group(rows, keys=["alpha","D","n"])
-    agg = []
-    for (alpha, D, n), rs in groups.items():
-        t = np.array([x["t_exhaustive"] for x in rs], dtype=float)
-        agg.append({
-            "alpha": float(alpha),
-            "D": int(D),
-            "n": int(n),
-            "t_mean": float(t.mean()),
-        })
-
-    for alpha in sorted(set(a["alpha"] for a in agg)):
-        data = sorted([a for a in agg if a["alpha"] == alpha], key=lambda x: x["n"])
-        n = np.array([d["n"] for d in data], dtype=float)
-        t = np.array([d["t_mean"] for d in data], dtype=float)
-
-        # Runtime vs n
-        plt.figure()
-        plt.plot(n, t, marker="o")
-        plt.xlabel("n (number of intervals)")
-        plt.ylabel("runtime t(n) (seconds)")
-        plt.title(f"Exhaustive Runtime vs n, alpha={alpha}")
-        plt.tight_layout()
-        plt.savefig(os.path.join(out_dir, f"exhaustive_runtime_alpha_{alpha}.png"), dpi=200)
-        plt.close()
-
-        # Normalized: t(n)/(n 2^n)
-        denom = n * (2.0 ** n)
-        plt.figure()
-        plt.plot(n, t/denom, marker="o")
-        plt.xlabel("n (number of intervals)")
-        plt.ylabel("t(n) / (n 2^n)")
-        plt.title(f"Exhaustive Normalized Runtime, alpha={alpha}")
-        plt.tight_layout()
-        plt.savefig(os.path.join(out_dir, f"exhaustive_normalized_alpha_{alpha}.png"), dpi=200)
-        plt.close()
-
-    print(f"[OK] Exhaustive plots saved to: {out_dir}")
-
-def plot_approximation_ratios(results_dir: str, out_dir: str):
-    """Plot greedy approximation ratios (greedy_count / optimal_count) across different alpha values."""
-    ex_path = os.path.join(results_dir, "exhaustive_results.csv")
-    if not os.path.exists(ex_path):
-        print(f"[SKIP] Missing {ex_path} for approximation ratio analysis")
-        return
+def _draw_greedy_runtime(plt, path, alpha, n, means, band):
+    plt.figure()
+    for name in ("EFT","EST","SD"):
+        _plot_with_band(n, means[name], *band[name], label=name)
+    plt.xscale("log", base=2)
+    plt.yscale("log")
+    plt.xlabel("n (number of intervals)")
+    plt.ylabel("runtime t(n) (seconds)")
+    plt.title(f"Greedy Runtime vs n (log-log), alpha={alpha}")
+    plt.legend()
+    plt.tight_layout()
+    plt.savefig(path, dpi=200)
+    plt.close()
+
+def _draw_greedy_normalized(plt, path, alpha, n, means, band):
+    # Normalized runtime: t(n)/(n log2 n)
+    denom = n * np.log2(n)
+    plt.figure()
+    for name in ("EFT","EST","SD"):
+        lo, hi = band[name]
+        _plot_with_band(n, means[name]/denom, *((lo/denom, hi/denom) if lo is not None else (None, None)), label=name)
+    plt.xscale("log", base=2)
+    plt.xlabel("n (number of intervals)")
+    plt.ylabel("t(n) / (n log2 n)")
+    plt.title(f"Greedy Normalized Runtime, alpha={alpha}")
+    plt.legend()
+    plt.tight_layout()
+    plt.savefig(path, dpi=200)
+    plt.close()
+
+def _agg_greedy_phases(cols):
+    keys = [f"p_{a}_{ph}" for a in ("EFT","EST","SD") for ph in GREEDY_PHASES]
+    # Store runs without --phases leave these columns NaN
+    if not all(k in cols for k in keys) or not np.any(np.isfinite(cols[keys[0]])):
+        print("[SKIP] No phase columns in the greedy results (run benchmark.py --phases)")
+        return None
+    cols = select(cols, np.isfinite(cols[keys[0]]))
+    return groupby(cols, keys=["alpha","n"], values=keys)
+
+def _figures_greedy_phases(agg) -> List[Figure]:
+    figs = []
+    for alpha in np.unique(agg["alpha"]):
+        data = select(agg, agg["alpha"] == alpha)  # groupby output is sorted by n within alpha
+        phases = {k: v for k, v in data.items() if k.startswith("p_")}
+        figs.append(Figure(f"greedy_phases_alpha_{alpha}.png", "greedy_phases",
+                           {"alpha": alpha, "n_sorted": data["n"], "phases": phases}))
+    return figs
+
+def _draw_greedy_phases(plt, path, alpha, n_sorted, phases):
+    algos = ["EFT","EST","SD"]
+    x = np.arange(len(n_sorted))
+    fig, axes = plt.subplots(1, len(algos), figsize=(5 * len(algos), 4.5), sharey=True)
+    for ax, algo in zip(axes, algos):
+        bottom = np.zeros(len(n_sorted))
+        for ph in GREEDY_PHASES:
+            # mean seconds over trials -> nanoseconds per interval
+            ns = phases[f"p_{algo}_{ph}_mean"] / n_sorted * 1e9
+            ax.bar(x, ns, bottom=bottom, label=ph)
+            bottom += ns
+        ax.set_xticks(x)
+        ax.set_xticklabels([f"2^{int(math.log2(n))}" for n in n_sorted], rotation=45)
+        ax.set_xlabel("n (number of intervals)")
+        ax.set_title(algo)
+    axes[0].set_ylabel("time per interval (ns)")
+    axes[-1].legend()
+    fig.suptitle(f"Greedy Phase Breakdown, alpha={alpha}")
+    fig.tight_layout()
+    fig.savefig(path, dpi=200)
+    plt.close(fig)
+
+# -- sort engines ------------------------------------------------------------------------
+
+def _agg_sort(cols):
+    agg = groupby(cols, keys=["alpha","sort_engine","n"], values=[f"t_{a}" for a in ("EFT","EST","SD")])
+    # first-seen order for the legend
+    agg["engine_order"] = np.array(list(dict.fromkeys(cols["sort_engine"].tolist())))
+    return agg
+
+def _figures_sort(agg) -> List[Figure]:
+    figs = []
+    engines = agg["engine_order"].tolist()
+    for alpha in np.unique(agg["alpha"]):
+        series = {}
+        for algo in ("EFT","EST","SD"):
+            series[algo] = []
+            for engine in engines:
+                data = select({k: v for k, v in agg.items() if k != "engine_order"},
+                              (agg["alpha"] == alpha) & (agg["sort_engine"] == engine))
+                # mean seconds over trials -> nanoseconds per interval; engines that do not apply are NaN
+                ns = data[f"t_{algo}_mean"] / data["n"] * 1e9
+                if ns.size and not np.all(np.isnan(ns)):
+                    series[algo].append((engine, data["n"], ns))
+        figs.append(Figure(f"sort_engines_alpha_{alpha}.png", "sort_engines", {"alpha": alpha, "series": series}))
+    return figs
+
+def _draw_sort_engines(plt, path, alpha, series):
+    algos = ["EFT","EST","SD"]
+    fig, axes = plt.subplots(1, len(algos), figsize=(5 * len(algos), 4.5), sharey=True)
+    for ax, algo in zip(axes, algos):
+        for engine, n, ns in series[algo]:
+            ax.plot(n, ns, marker="o", label=engine)
+        ax.set_xscale("log", base=2)
+        ax.set_xlabel("n (number of intervals)")
+        ax.set_title(algo)
+        ax.grid(True, which="both", linestyle="--", linewidth=0.5)
+    axes[0].set_ylabel("time per interval (ns)")
+    axes[-1].legend()
+    fig.suptitle(f"Greedy Runtime by Sort Engine, alpha={alpha}")
+    fig.tight_layout()
+    fig.savefig(path, dpi=200)
+    plt.close(fig)
+
+# -- exhaustive --------------------------------------------------------------------------
+
+def _agg_exhaustive(cols):
+    bands = _band_values(cols, ["exhaustive"])
+    return groupby(cols, keys=["alpha","D","n"], values=["t_exhaustive", *bands])
+
+def _figures_exhaustive(agg) -> List[Figure]:
+    figs = []
+    bands = "t_exhaustive_q1_mean" in agg
+    for alpha in np.unique(agg["alpha"]):
+        data = select(agg, agg["alpha"] == alpha)
+        order = np.argsort(data["n"], kind="stable")
+        args = {
+            "alpha": alpha,
+            "n": data["n"][order].astype(float),
+            "t": data["t_exhaustive_mean"][order],
+            "lo": data["t_exhaustive_q1_mean"][order] if bands else None,
+            "hi": data["t_exhaustive_q3_mean"][order] if bands else None,
+        }
+        figs.append(Figure(f"exhaustive_runtime_alpha_{alpha}.png", "exhaustive_runtime", args))
+        figs.append(Figure(f"exhaustive_normalized_alpha_{alpha}.png", "exhaustive_normalized", args))
+    return figs
+
+def _draw_exhaustive_runtime(plt, path, alpha, n, t, lo, hi):
+    # Runtime vs n
+    plt.figure()
+    _plot_with_band(n, t, lo, hi)
+    plt.xlabel("n (number of intervals)")
+    plt.ylabel("runtime t(n) (seconds)")
+    plt.title(f"Exhaustive Runtime vs n, alpha={alpha}")
+    plt.tight_layout()
+    plt.savefig(path, dpi=200)
+    plt.close()
+
+def _draw_exhaustive_normalized(plt, path, alpha, n, t, lo, hi):
+    # Normalized: t(n)/(n 2^n)
+    denom = n * (2.0 ** n)
+    plt.figure()
+    _plot_with_band(n, t/denom, *((lo/denom, hi/denom) if lo is not None else (None, None)))
+    plt.xlabel("n (number of intervals)")
+    plt.ylabel("t(n) / (n 2^n)")
+    plt.title(f"Exhaustive Normalized Runtime, alpha={alpha}")
+    plt.tight_layout()
+    plt.savefig(path, dpi=200)
+    plt.close()
+
+# -- approximation ratios ----------------------------------------------------------------
+
+def approximation_ratios(cols, keys=("alpha", "D", "n"), stats=("mean", "std")) -> dict:
+    """Per-row greedy/optimal ratios (1.0 when opt is 0) aggregated per key group (default mean/std per (alpha, D, n))."""
+    opt = cols["opt_count"].astype(float)
+    ratios = dict(cols)
+    for algo in ("EFT", "EST", "SD"):
+        greedy = cols[f"greedy_{algo}_count"].astype(float)
+        ratios[f"{algo.lower()}_ratio"] = np.where(opt > 0, greedy / np.where(opt > 0, opt, 1.0), 1.0)
+    return groupby(ratios, keys=list(keys), values=["eft_ratio","est_ratio","sd_ratio"], stats=stats)
+
+def _pow2_label(n) -> str:
+    p = int(n).bit_length() - 1
+    return f"2^{p}" if n == 1 << p and p >= 6 else str(n)
+
+def _heatmap_figure(name: str, agg, ratio_key: str, title: str, pow2_labels: bool=False,
+                    vmin: float=0.5) -> Figure:
+    return Figure(name, "ratio_heatmap", {"n": agg["n"], "alpha": agg["alpha"], "values": agg[ratio_key],
+                                          "title": title, "pow2_labels": pow2_labels, "vmin": vmin})
+
+def _draw_ratio_heatmap(plt, path, n, alpha, values, title, pow2_labels=False, vmin=0.5):
+    """Mean ratio per (n, alpha) cell as an annotated heatmap (first D per cell)."""
+    n_label = _pow2_label if pow2_labels else str
+    alphas_sorted = np.unique(alpha)
+    n_sorted = np.unique(n)
+    rows = np.searchsorted(n_sorted, n)
+    cols_idx = np.searchsorted(alphas_sorted, alpha)
+    # Create matrix: rows=n, cols=alpha (first D per cell, as before)
+    matrix = np.full((len(n_sorted), len(alphas_sorted)), np.nan)
+    matrix[rows[::-1], cols_idx[::-1]] = values[::-1]
+
+    plt.figure(figsize=(8, 6))
+    im = plt.imshow(matrix, aspect='auto', cmap='RdYlGn', vmin=vmin, vmax=1.0, interpolation='nearest')
+    plt.colorbar(im, label='Approximation Ratio')
+    plt.xticks(range(len(alphas_sorted)), [f"{a:.1f}" for a in alphas_sorted])
+    plt.yticks(range(len(n_sorted)), [n_label(v) for v in n_sorted])
+    plt.xlabel("α (overlap density)", fontsize=12)
+    plt.ylabel("n (number of intervals)", fontsize=12)
+    plt.title(title, fontsize=14)
+
+    # Add text annotations
+    for i in range(len(n_sorted)):
+        for j in range(len(alphas_sorted)):
+            if not np.isnan(matrix[i, j]):
+                plt.text(j, i, f"{matrix[i, j]:.3f}", ha="center", va="center", color="black", fontsize=9)
 
-    rows = load_csv(ex_path)
-    for r in rows:
-        for k in ["alpha","D","n","trial","t_exhaustive","opt_count","greedy_EFT_count","greedy_EST_count","greedy_SD_count"]:
-            r[k] = float(r[k]) if k in ["alpha","t_exhaustive"] else int(r[k])
-
-    # Group by (alpha, D, n) and compute mean approximation ratios
-    groups = _group(rows, keys=["alpha","D","n"])
-    agg = []
-    for (alpha, D, n), rs in groups.items():
-        opt_counts = np.array([x["opt_count"] for x in rs], dtype=float)
-        eft_counts = np.array([x["greedy_EFT_count"] for x in rs], dtype=float)
-        est_counts = np.array([x["greedy_EST_count"] for x in rs], dtype=float)
-        sd_counts = np.array([x["greedy_SD_count"] for x in rs], dtype=float)
-        
-        # Compute ratios (avoid division by zero)
-        eft_ratios = np.where(opt_counts > 0, eft_counts / opt_counts, 1.0)
-        est_ratios = np.where(opt_counts > 0, est_counts / opt_counts, 1.0)
-        sd_ratios = np.where(opt_counts > 0, sd_counts / opt_counts, 1.0)
-        
-        agg.append({
-            "alpha": float(alpha),
-            "D": int(D),
-            "n": int(n),
-            "eft_ratio_mean": float(eft_ratios.mean()),
-            "est_ratio_mean": float(est_ratios.mean()),
-            "sd_ratio_mean": float(sd_ratios.mean()),
-            "eft_ratio_std": float(eft_ratios.std()),
-            "est_ratio_std": float(est_ratios.std()),
-            "sd_ratio_std": float(sd_ratios.std()),
-        })
+    plt.tight_layout()
+    plt.savefig(path, dpi=200)
+    plt.close()
 
+def _figures_approximation(agg) -> List[Figure]:
+    figs = []
     # Plot approximation ratios for each n value: ratio vs alpha
-    n_values = sorted(set(a["n"] for a in agg))
-    for n in n_values:
-        data = sorted([a for a in agg if a["n"] == n], key=lambda x: x["alpha"])
-        if len(data) == 0:
-            continue
-            
-        alphas = np.array([d["alpha"] for d in data], dtype=float)
-        eft_ratio = np.array([d["eft_ratio_mean"] for d in data], dtype=float)
-        est_ratio = np.array([d["est_ratio_mean"] for d in data], dtype=float)
-        sd_ratio = np.array([d["sd_ratio_mean"] for d in data], dtype=float)
-        eft_ratio_std = np.array([d["eft_ratio_std"] for d in data], dtype=float)
-        est_ratio_std = np.array([d["est_ratio_std"] for d in data], dtype=float)
-        sd_ratio_std = np.array([d["sd_ratio_std"] for d in data], dtype=float)
-
-        plt.figure(figsize=(8, 6))
-        plt.errorbar(alphas, eft_ratio, yerr=eft_ratio_std, label="EFT", capsize=5, linewidth=2, alpha=0.8)
-        plt.errorbar(alphas, est_ratio, yerr=est_ratio_std, label="EST", capsize=5, linewidth=2, alpha=0.8)
-        plt.errorbar(alphas, sd_ratio, yerr=sd_ratio_std, label="SD", capsize=5, linewidth=2, alpha=0.8)
-        plt.axhline(y=1.0, color='gray', linestyle='--', linewidth=1, label='Optimal (ratio=1.0)')
-        plt.xlabel("α (overlap density parameter)", fontsize=12)
-        plt.ylabel("Approximation Ratio (greedy / optimal)", fontsize=12)
-        plt.title(f"Greedy Approximation Ratios vs α (n={n})", fontsize=14)
-        plt.ylim(0.5, 1.05)  # Focus on the relevant range
-        plt.grid(True, alpha=0.3)
-        plt.legend(fontsize=10)
-        plt.tight_layout()
-        plt.savefig(os.path.join(out_dir, f"approximation_ratios_n_{n}.png"), dpi=200)
-        plt.close()
+    for n in np.unique(agg["n"]):
+        data = select(agg, agg["n"] == n)
+        order = np.argsort(data["alpha"], kind="stable")
+        series = {key: (data[f"{key}_mean"][order], data[f"{key}_std"][order])
+                  for key in ("eft_ratio", "est_ratio", "sd_ratio")}
+        figs.append(Figure(f"approximation_ratios_n_{n}.png", "approximation_ratios",
+                           {"n": n, "alphas": data["alpha"][order], "series": series}))
 
     # Also create a heatmap-style plot showing how ratios vary with both n and alpha
     # For each algorithm, create a separate heatmap
-    for algo_name, ratio_key, std_key in [("EFT", "eft_ratio_mean", "eft_ratio_std"),
-                                            ("EST", "est_ratio_mean", "est_ratio_std"),
-                                            ("SD", "sd_ratio_mean", "sd_ratio_std")]:
-        # Create matrix: rows=n, cols=alpha
-        alphas_sorted = sorted(set(a["alpha"] for a in agg))
-        n_sorted = sorted(set(a["n"] for a in agg))
-        
-        matrix = np.zeros((len(n_sorted), len(alphas_sorted)))
-        for i, n in enumerate(n_sorted):
-            for j, alpha in enumerate(alphas_sorted):
-                matches = [a for a in agg if a["n"] == n and a["alpha"] == alpha]
-                if matches:
-                    matrix[i, j] = matches[0][ratio_key]
-                else:
-                    matrix[i, j] = np.nan
-        
-        plt.figure(figsize=(8, 6))
-        im = plt.imshow(matrix, aspect='auto', cmap='RdYlGn', vmin=0.5, vmax=1.0, interpolation='nearest')
-        plt.colorbar(im, label='Approximation Ratio')
-        plt.xticks(range(len(alphas_sorted)), [f"{a:.1f}" for a in alphas_sorted])
-        plt.yticks(range(len(n_sorted)), [str(n) for n in n_sorted])
-        plt.xlabel("α (overlap density)", fontsize=12)
-        plt.ylabel("n (number of intervals)", fontsize=12)
-        plt.title(f"{algo_name} Approximation Ratio Heatmap", fontsize=14)
-        
-        # Add text annotations
-        for i in range(len(n_sorted)):
-            for j in range(len(alphas_sorted)):
-                if not np.isnan(matrix[i, j]):
-                    text = plt.text(j, i, f"{matrix[i, j]:.3f}",
-                                   ha="center", va="center", color="black", fontsize=9)
-        
-        plt.tight_layout()
-        plt.savefig(os.path.join(out_dir, f"approximation_heatmap_{algo_name}.png"), dpi=200)
-        plt.close()
-
-    print(f"[OK] Approximation ratio plots saved to: {out_dir}")
+    for algo_name, ratio_key in [("EFT", "eft_ratio_mean"), ("EST", "est_ratio_mean"), ("SD", "sd_ratio_mean")]:
+        figs.append(_heatmap_figure(f"approximation_heatmap_{algo_name}.png", agg, ratio_key,
+                                    f"{algo_name} Approximation Ratio Heatmap"))
+    return figs
+
+def _draw_approximation_ratios(plt, path, n, alphas, series):
+    plt.figure(figsize=(8, 6))
+    for label, key in (("EFT", "eft_ratio"), ("EST", "est_ratio"), ("SD", "sd_ratio")):
+        mean, std = series[key]
+        plt.errorbar(alphas, mean, yerr=std, label=label, capsize=5, linewidth=2, alpha=0.8)
+    plt.axhline(y=1.0, color='gray', linestyle='--', linewidth=1, label='Optimal (ratio=1.0)')
+    plt.xlabel("α (overlap density parameter)", fontsize=12)
+    plt.ylabel("Approximation Ratio (greedy / optimal)", fontsize=12)
+    plt.title(f"Greedy Approximation Ratios vs α (n={n})", fontsize=14)
+    plt.ylim(0.5, 1.05)  # Focus on the relevant range
+    plt.grid(True, alpha=0.3)
+    plt.legend(fontsize=10)
+    plt.tight_layout()
+    plt.savefig(path, dpi=200)
+    plt.close()
+
+def _agg_ratio(cols):
+    return approximation_ratios(cols, keys=("family", "alpha", "D", "n"), stats=("mean", "min", "max"))
+
+def _figures_ratio(agg) -> List[Figure]:
+    figs = []
+    for family in np.unique(agg["family"]):
+        fam = select(agg, agg["family"] == family)
+        for alpha in np.unique(fam["alpha"]):
+            data = select(fam, fam["alpha"] == alpha)
+            order = np.argsort(data["n"], kind="stable")
+            series = {key: tuple(data[f"{key}_{stat}"][order] for stat in ("mean", "min", "max"))
+                      for key in ("eft_ratio", "est_ratio", "sd_ratio")}
+            figs.append(Figure(f"ratio_{family}_alpha_{alpha}.png", "ratio_study",
+                               {"family": family, "alpha": alpha, "n": data["n"][order].astype(float),
+                                "series": series}))
+        for algo_name, ratio_key in [("EST", "est_ratio_mean"), ("SD", "sd_ratio_mean")]:
+            figs.append(_heatmap_figure(f"ratio_heatmap_{family}_{algo_name}.png", fam, ratio_key,
+                                        f"{algo_name} Approximation Ratio Heatmap ({family})",
+                                        pow2_labels=True, vmin=0.0))
+    return figs
+
+def _draw_ratio_study(plt, path, family, alpha, n, series):
+    plt.figure(figsize=(8, 6))
+    for label, key in (("EFT", "eft_ratio"), ("EST", "est_ratio"), ("SD", "sd_ratio")):
+        _plot_with_band(n, *series[key], label=label)
+    plt.xscale("log", base=2)
+    plt.xlabel("n (number of intervals)", fontsize=12)
+    plt.ylabel("Approximation Ratio (greedy / optimal)", fontsize=12)
+    plt.title(f"Approximation Ratios vs n ({family}, α={alpha})", fontsize=14)
+    plt.ylim(0, 1.05)
+    plt.grid(True, alpha=0.3)
+    plt.legend(fontsize=10)
+    plt.tight_layout()
+    plt.savefig(path, dpi=200)
+    plt.close()
+
+_DRAW: Dict[str, Callable] = {
+    "greedy_runtime": _draw_greedy_runtime,
+    "greedy_normalized": _draw_greedy_normalized,
+    "greedy_phases": _draw_greedy_phases,
+    "sort_engines": _draw_sort_engines,
+    "exhaustive_runtime": _draw_exhaustive_runtime,
+    "exhaustive_normalized": _draw_exhaustive_normalized,
+    "approximation_ratios": _draw_approximation_ratios,
+    "ratio_heatmap": _draw_ratio_heatmap,
+    "ratio_study": _draw_ratio_study,
+}
+
+@dataclass(frozen=True)
+class PlotSpec:
+    table: str        # results table the plot reads
+    aggregate: Callable  # columns -> aggregated columns (or None to skip)
+    figures: Callable    # aggregated columns -> List[Figure]
+    label: str
+
+# In the order main() draws them
+PLOTS = {
+    "greedy": PlotSpec("greedy", _agg_greedy, _figures_greedy, "Greedy plots"),
+    "greedy_phases": PlotSpec("greedy", _agg_greedy_phases, _figures_greedy_phases, "Greedy phase plots"),
+    "sort_engines": PlotSpec("sort", _agg_sort, _figures_sort, "Sort-engine plots"),
+    "exhaustive": PlotSpec("exhaustive", _agg_exhaustive, _figures_exhaustive, "Exhaustive plots"),
+    "approximation": PlotSpec("exhaustive", approximation_ratios, _figures_approximation, "Approximation ratio plots"),
+    "ratio": PlotSpec("ratio", _agg_ratio, _figures_ratio, "Ratio-study plots"),
+}
+
+def _render(fig: Figure, out_dir: str) -> str:
+    _DRAW[fig.draw](_pyplot(), os.path.join(out_dir, fig.name), **fig.data)
+    return fig.name
+
+def _plot(name: str, results_dir: str, out_dir: str, source: str, run_ids):
+    """Draw every figure of one plot in this process."""
+    spec = PLOTS[name]
+    cols = _load(results_dir, spec.table, source, run_ids)
+    if cols is None:
+        return
+    agg = spec.aggregate(cols)
+    if agg is None:
+        return
+    for fig in spec.figures(agg):
+        _render(fig, out_dir)
+    print(f"[OK] {spec.label} saved to: {out_dir}")
+
+def plot_greedy(results_dir: str, out_dir: str, source: str="csv", run_ids=None):
+    _plot("greedy", results_dir, out_dir, source, run_ids)
+
+def plot_greedy_phases(results_dir: str, out_dir: str, source: str="csv", run_ids=None):
+    """Stacked bars of per-phase time per interval vs n (needs benchmark.py --phases)."""
+    _plot("greedy_phases", results_dir, out_dir, source, run_ids)
+
+def plot_sort_engines(results_dir: str, out_dir: str, source: str="csv", run_ids=None):
+    """Time per interval vs n for each stable sort engine (benchmark.py --mode sort); flat lines = O(n)."""
+    _plot("sort_engines", results_dir, out_dir, source, run_ids)
+
+def plot_exhaustive(results_dir: str, out_dir: str, source: str="csv", run_ids=None):
+    _plot("exhaustive", results_dir, out_dir, source, run_ids)
+
+def plot_approximation_ratios(results_dir: str, out_dir: str, source: str="csv", run_ids=None):
+    """Plot greedy approximation ratios (greedy_count / optimal_count) across different alpha values."""
+    _plot("approximation", results_dir, out_dir, source, run_ids)
+
+def plot_ratio_study(results_dir: str, out_dir: str, source: str="csv", run_ids=None):
+    """
+    EST/SD approximation ratios at large n (benchmark --mode ratio, optimum from EFT): per
+    family and alpha, the mean ratio vs n with its min-max band over trials, and per family
+    an n x alpha heatmap of the mean ratio for each algorithm.
+    """
+    _plot("ratio", results_dir, out_dir, source, run_ids)
+
+# -- cached, incremental pipeline --------------------------------------------------------
+
+def _code_hash() -> str:
+    # Figures and aggregates are invalidated whenever the plotting code changes
+    with open(os.path.abspath(__file__), "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def _update_hash(h, obj):
+    """Feed a Figure's data (arrays, scalars and nested dicts/tuples/lists) into a hash, in a stable order."""
+    if isinstance(obj, np.ndarray):
+        h.update(f"a{obj.dtype.str}{obj.shape}".encode())
+        h.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, dict):
+        h.update(b"d")
+        for key in sorted(obj):
+            h.update(repr(key).encode())
+            _update_hash(h, obj[key])
+    elif isinstance(obj, (list, tuple)):
+        h.update(f"l{len(obj)}".encode())
+        for item in obj:
+            _update_hash(h, item)
+    else:
+        h.update(repr(obj).encode())
+
+def _input_hash(results_dir: str, table: str, source: str, run_ids) -> Optional[str]:
+    """Hash of a table's inputs: the CSV bytes, or the store's (immutable) part names and sizes."""
+    h = hashlib.sha256(f"{table}|{source}|{sorted(run_ids) if run_ids else None}".encode())
+    if source == "csv":
+        path = os.path.join(results_dir, f"{table}_results.csv")
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+    else:
+        parts = sorted(glob.glob(os.path.join(results_dir, "store", table, "part-*")))
+        parts = [p for p in parts if not p.endswith(".tmp")]
+        if not parts:
+            return None
+        for p in parts:
+            h.update(f"{os.path.basename(p)}:{os.path.getsize(p)}".encode())
+    return h.hexdigest()
+
+def _cached_aggregate(name: str, cache_dir: str, results_dir: str, source: str, run_ids, code: str):
+    """The aggregated columns of one plot, from <cache_dir>/agg-<name>-<hash>.npz when the inputs are unchanged."""
+    spec = PLOTS[name]
+    key = _input_hash(results_dir, spec.table, source, run_ids)
+    if key is None:
+        return _load(results_dir, spec.table, source, run_ids)  # prints the skip note
+    key = hashlib.sha256(f"{key}|{code}".encode()).hexdigest()[:20]
+    path = os.path.join(cache_dir, f"agg-{name}-{key}.npz")
+    if os.path.exists(path):
+        with np.load(path, allow_pickle=False) as z:
+            return {k: z[k] for k in z.files}
+    cols = load_table(results_dir, spec.table, source=source, run_ids=run_ids)
+    agg = spec.aggregate(cols) if cols is not None else None
+    if agg is not None:
+        for stale in glob.glob(os.path.join(cache_dir, f"agg-{name}-*.npz")):
+            os.remove(stale)
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            np.savez(f, **agg)
+        os.replace(tmp, path)
+    return agg
+
+def _init_render():
+    import matplotlib
+    matplotlib.use("Agg")
+
+def plot_all(results_dir: str, out_dir: str, source: str="csv", run_ids=None, workers: int=0,
+             force: bool=False, plots=tuple(PLOTS)) -> dict:
+    """
+    Incremental version of drawing every plot. Aggregated tables are cached per plot under
+    <out_dir>/.plot_cache, keyed by a hash of the results file (or store parts) and of this
+    module's code, so unchanged tables are not re-read. Each figure is fingerprinted by its
+    drawn data; figures whose fingerprint matches the last render (and whose PNG exists)
+    are skipped, and the rest are drawn on a process pool (workers, 0 = one per CPU) with
+    the Agg backend. force=True redraws everything. Returns {"rendered": [...], "unchanged": [...]}.
+    """
+    cache_dir = os.path.join(out_dir, ".plot_cache")
+    ensure_dir(cache_dir)
+    manifest_path = os.path.join(cache_dir, "figures.json")
+    manifest = {}
+    if os.path.exists(manifest_path) and not force:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+
+    code = _code_hash()
+    todo, unchanged, prints = [], [], []
+    for name in plots:
+        agg = _cached_aggregate(name, cache_dir, results_dir, source, run_ids, code)
+        if agg is None:
+            continue
+        figs = PLOTS[name].figures(agg)
+        for fig in figs:
+            h = hashlib.sha256(f"{code}|{fig.draw}".encode())
+            _update_hash(h, fig.data)
+            fp = h.hexdigest()
+            if manifest.get(fig.name) == fp and os.path.exists(os.path.join(out_dir, fig.name)):
+                unchanged.append(fig.name)
+            else:
+                todo.append((fig, fp))
+        prints.append(f"[OK] {PLOTS[name].label} ({len(figs)} figures) in: {out_dir}")
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(todo) <= 1:
+        _init_render()
+        for fig, _ in todo:
+            _render(fig, out_dir)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_render) as ex:
+            list(ex.map(_render, [fig for fig, _ in todo], [out_dir] * len(todo)))
+
+    manifest.update({fig.name: fp for fig, fp in todo})
+    tmp = f"{manifest_path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp, manifest_path)
+    for line in prints:
+        print(line)
+    return {"rendered": [fig.name for fig, _ in todo], "unchanged": unchanged}
 
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--results_dir", default="results")
     ap.add_argument("--out_dir", default=None)
+    # csv: the latest sweep per table; store: every run appended to <results_dir>/store
+    ap.add_argument("--source", choices=["csv", "store"], default="csv")
+    ap.add_argument("--runs", nargs="+", default=None, help="with --source store, only these run ids")
+    # Rendering processes (0 = one per CPU); --force redraws figures whose inputs did not change
+    ap.add_argument("--workers", type=int, default=0)
+    ap.add_argument("--force", action="store_true")
     args = ap.parse_args()
 
     out_dir = args.out_dir or os.path.join(args.results_dir, "plots")
     ensure_dir(out_dir)
 
-    plot_greedy(args.results_dir, out_dir)
-    plot_exhaustive(args.results_dir, out_dir)
-    plot_approximation_ratios(args.results_dir, out_dir)
+    result = plot_all(args.results_dir, out_dir, source=args.source, run_ids=args.runs,
+                      workers=args.workers, force=args.force)
+    print(f"[OK] {len(result['rendered'])} figures drawn, {len(result['unchanged'])} unchanged")
 
 if __name__ == "__main__":
     main()
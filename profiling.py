@@ -0,0 +1,86 @@
+from __future__ import annotations
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+import time, tracemalloc
+
+# Phase names emitted by the instrumented solvers, in execution order
+GREEDY_PHASES = ("convert", "sort", "gather", "select")
+EXHAUSTIVE_PHASES = ("sort", "compat", "search", "reconstruct")
+
+_NULL = nullcontext()
+_active = None  # the PhaseRecorder installed by record_phases(), if any
+
+class PhaseRecorder:
+    """Accumulated wall time, call count and (optionally) peak allocated bytes per phase."""
+
+    def __init__(self, track_memory: bool=False):
+        self.track_memory = track_memory
+        self.seconds = defaultdict(float)
+        self.calls = defaultdict(int)
+        self.peak_bytes = defaultdict(int)
+
+    @contextmanager
+    def _span(self, name: str):
+        if self.track_memory:
+            base = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] += time.perf_counter() - t0
+            self.calls[name] += 1
+            if self.track_memory:
+                peak = tracemalloc.get_traced_memory()[1] - base
+                self.peak_bytes[name] = max(self.peak_bytes[name], peak)
+
+def phase(name: str):
+    """
+    Context manager marking one phase of a solver.
+    A shared no-op when no recorder is active, so instrumented code pays one global
+    lookup per phase in normal runs.
+    """
+    if _active is None:
+        return _NULL
+    return _active._span(name)
+
+@contextmanager
+def record_phases(track_memory: bool=False):
+    """Collect phase timings (and allocation peaks) for everything run inside the block."""
+    global _active
+    recorder = PhaseRecorder(track_memory=track_memory)
+    started = False
+    if track_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        started = True
+    previous, _active = _active, recorder
+    try:
+        yield recorder
+    finally:
+        _active = previous
+        if started:
+            tracemalloc.stop()
+
+def profile_phases(fn, *args, phases=GREEDY_PHASES, min_time: float=0.05) -> dict:
+    """
+    Mean seconds per call and peak bytes for each phase of fn(*args).
+    Timings repeat fn until min_time has elapsed; memory comes from one extra traced call.
+    Returns {phase: (seconds, bytes)} for every name in phases (zeros if a phase did not run).
+    """
+    calls = 0
+    with record_phases() as rec:
+        t0 = time.perf_counter()
+        while calls == 0 or time.perf_counter() - t0 < min_time:
+            fn(*args)
+            calls += 1
+    with record_phases(track_memory=True) as mem:
+        fn(*args)
+    return {p: (rec.seconds[p] / calls, mem.peak_bytes[p]) for p in phases}
+
+def phase_columns(name: str, phases=GREEDY_PHASES) -> list[str]:
+    """CSV columns for one profiled function: p_<name>_<phase> seconds, then pmem_<name>_<phase> bytes."""
+    return [f"p_{name}_{p}" for p in phases] + [f"pmem_{name}_{p}" for p in phases]
+
+def phase_row(profile: dict, phases=GREEDY_PHASES) -> list:
+    """Values of a profile_phases() result in phase_columns() order."""
+    return [profile[p][0] for p in phases] + [profile[p][1] for p in phases]
@@ -0,0 +1,234 @@
+from __future__ import annotations
+from typing import Dict, List, Optional, Sequence
+import csv, datetime, glob, importlib.util, json, os, platform, subprocess, sys
+import numpy as np
+
+# Optional dependencies, imported on first use so that importing this module stays cheap:
+# pyarrow (Parquet parts; .npz parts otherwise) and pandas (C CSV parser; csv module otherwise)
+def _has_module(name: str) -> bool:
+    return importlib.util.find_spec(name) is not None
+
+def _pandas():
+    if not _has_module("pandas"):
+        return None
+    import pandas
+    return pandas
+
+Columns = Dict[str, np.ndarray]
+
+STATS = ("count", "mean", "std", "min", "max", "median")
+
+# -- run metadata ------------------------------------------------------------------------
+
+def _git_hash() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+                             capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+    return out.stdout.strip() if out.returncode == 0 else "unknown"
+
+def run_metadata(seed: Optional[int]=None, **extra) -> dict:
+    """Provenance of one benchmark run: run id, seed, git commit, machine and command line."""
+    now = datetime.datetime.now(datetime.timezone.utc)
+    meta = {
+        "run_id": f"{now:%Y%m%dT%H%M%S}-{os.getpid()}",
+        "started": now.isoformat(timespec="seconds"),
+        "seed": seed,
+        "git_hash": _git_hash(),
+        "host": platform.node(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "argv": sys.argv,
+    }
+    meta.update(extra)
+    return meta
+
+# -- columns -----------------------------------------------------------------------------
+
+def _column(values) -> np.ndarray:
+    """One typed column from a sequence of values (or CSV strings): int64, float64 or str."""
+    arr = np.asarray(values)
+    if arr.dtype.kind in "iufb":
+        return arr
+    for dtype in (np.int64, np.float64):
+        try:
+            return arr.astype(dtype)
+        except (ValueError, TypeError):
+            pass
+    return arr.astype(str)
+
+def columns_from_rows(header: Sequence[str], rows: Sequence[Sequence]) -> Columns:
+    """Row-major records (as written to the CSVs) -> {column: typed array}."""
+    if not rows:
+        return {name: np.empty(0) for name in header}
+    return {name: _column(col) for name, col in zip(header, zip(*rows))}
+
+def _last_line_fields(path: str) -> int:
+    with open(path, "rb") as f:
+        f.seek(max(0, os.path.getsize(path) - 65536))
+        last = f.read().decode("utf-8", errors="replace").rstrip("\r\n").rsplit("\n", 1)[-1]
+    return len(next(csv.reader([last]), []))
+
+def read_csv_columns(path: str) -> Columns:
+    """A results CSV as typed columns; rows of the wrong length (an interrupted write) are dropped."""
+    pd = _pandas()
+    if pd is not None:
+        df = pd.read_csv(path, on_bad_lines="skip", engine="c")
+        if len(df) and _last_line_fields(path) < len(df.columns):
+            df = df.iloc[:-1]  # only the last line can be cut short (rows are flushed one at a time)
+        return {name: _column(df[name].to_numpy()) for name in df.columns}
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        r = csv.reader(f)
+        header = next(r, [])
+        rows = [row for row in r if len(row) == len(header)]
+    return columns_from_rows(header, rows)
+
+def _concat(parts: List[Columns]) -> Columns:
+    """Concatenate parts; a column missing from some parts is filled with NaN (numbers) or "" (labels)."""
+    names = list(dict.fromkeys(name for part in parts for name in part))
+    out = {}
+    for name in names:
+        pieces = [part.get(name) for part in parts]
+        kinds = {p.dtype.kind for p in pieces if p is not None}
+        fill = "" if "U" in kinds else np.nan
+        out[name] = _column(np.concatenate([
+            p if p is not None else np.full(len(next(iter(part.values()))), fill)
+            for p, part in zip(pieces, parts)]))
+    return out
+
+# -- append-only store -------------------------------------------------------------------
+
+class ResultsStore:
+    """
+    Append-only columnar store of benchmark rows, one directory per table
+    (greedy, exhaustive, ...). Each append writes a new immutable part file (Parquet
+    with pyarrow, else .npz) tagged with its run's metadata and a run_id column, so
+    earlier sweeps are never overwritten and can be filtered or pooled later.
+    """
+
+    def __init__(self, root: str, fmt: str="auto"):
+        if fmt not in ("auto", "parquet", "npz"):
+            raise ValueError(f"Unknown format {fmt!r}; expected 'auto', 'parquet' or 'npz'")
+        has_arrow = _has_module("pyarrow")
+        if fmt == "parquet" and not has_arrow:
+            raise ValueError("format='parquet' requested but pyarrow is not installed")
+        self.root = root
+        self.fmt = ("parquet" if has_arrow else "npz") if fmt == "auto" else fmt
+
+    def _parts(self, table: str) -> List[str]:
+        return sorted(glob.glob(os.path.join(self.root, table, "part-*.parquet")) +
+                      glob.glob(os.path.join(self.root, table, "part-*.npz")))
+
+    def append(self, table: str, columns: Columns, meta: dict) -> str:
+        """Write columns (plus run_id) as a new part of table; returns the part path."""
+        lengths = {len(v) for v in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"Columns of unequal length: {sorted(lengths)}")
+        n = lengths.pop() if lengths else 0
+        columns = dict(columns, run_id=np.full(n, meta["run_id"]))
+        d = os.path.join(self.root, table)
+        os.makedirs(d, exist_ok=True)
+        path = os.path.join(d, f"part-{meta['run_id']}-{len(self._parts(table)):05d}.{self.fmt}")
+        tmp = f"{path}.tmp"
+        blob = json.dumps(meta, default=str)
+        if self.fmt == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            t = pa.table(columns).replace_schema_metadata({"run_meta": blob})
+            pq.write_table(t, tmp)
+        else:
+            with open(tmp, "wb") as f:
+                np.savez(f, __meta__=np.array(blob), **columns)
+        os.replace(tmp, path)  # atomic: readers never see a partial part
+        return path
+
+    def _read(self, path: str):
+        if path.endswith(".parquet"):
+            import pyarrow.parquet as pq
+            t = pq.read_table(path)
+            meta = json.loads(t.schema.metadata[b"run_meta"])
+            return {name: _column(t.column(name).to_numpy()) for name in t.column_names}, meta
+        with np.load(path, allow_pickle=False) as z:
+            meta = json.loads(str(z["__meta__"]))
+            return {name: z[name] for name in z.files if name != "__meta__"}, meta
+
+    def runs(self, table: str) -> List[dict]:
+        """Metadata of every run that wrote to table, oldest first."""
+        seen = {}
+        for path in self._parts(table):
+            meta = self._read(path)[1]
+            seen.setdefault(meta["run_id"], meta)
+        return sorted(seen.values(), key=lambda m: m["started"])
+
+    def load(self, table: str, run_ids: Optional[Sequence[str]]=None) -> Optional[Columns]:
+        """All rows of table (optionally only the given runs) as columns, or None if it has none."""
+        parts = []
+        for path in self._parts(table):
+            cols, meta = self._read(path)
+            if run_ids is None or meta["run_id"] in run_ids:
+                parts.append(cols)
+        return _concat(parts) if parts else None
+
+def load_table(results_dir: str, table: str, source: str="csv",
+               run_ids: Optional[Sequence[str]]=None) -> Optional[Columns]:
+    """
+    Columns of one results table: source="csv" reads <table>_results.csv (the latest sweep),
+    source="store" reads every appended run in <results_dir>/store. None if there is no data.
+    """
+    if source == "csv":
+        path = os.path.join(results_dir, f"{table}_results.csv")
+        return read_csv_columns(path) if os.path.exists(path) else None
+    if source == "store":
+        return ResultsStore(os.path.join(results_dir, "store")).load(table, run_ids)
+    raise ValueError(f"Unknown source {source!r}; expected 'csv' or 'store'")
+
+# -- vectorized aggregation --------------------------------------------------------------
+
+def select(cols: Columns, mask: np.ndarray) -> Columns:
+    """Rows of cols where mask is True."""
+    return {name: v[mask] for name, v in cols.items()}
+
+def groupby(cols: Columns, keys: Sequence[str], values: Sequence[str], stats: Sequence[str]=("mean",)) -> Columns:
+    """
+    Group rows by the key columns and reduce each value column, without a Python loop
+    over rows or groups. Returns the distinct keys in ascending lexicographic order plus
+    a "<value>_<stat>" column per value and stat (see STATS; std is the population std).
+    """
+    for stat in stats:
+        if stat not in STATS:
+            raise ValueError(f"Unknown stat {stat!r}; expected one of {STATS}")
+    if len(cols[keys[0]]) == 0:
+        return {**{k: cols[k][:0] for k in keys},
+                **{f"{name}_{stat}": np.empty(0) for name in values for stat in stats}}
+    uniques, codes = zip(*(np.unique(cols[k], return_inverse=True) for k in keys))
+    flat = np.ravel_multi_index(codes, tuple(u.size for u in uniques))
+    groups, gid = np.unique(flat, return_inverse=True)
+    out = {k: u[idx] for k, u, idx in zip(keys, uniques, np.unravel_index(groups, tuple(u.size for u in uniques)))}
+
+    counts = np.bincount(gid, minlength=groups.size)
+    ends = np.cumsum(counts)
+    starts = ends - counts
+    for name in values:
+        v = np.asarray(cols[name], dtype=float)
+        mean = np.bincount(gid, weights=v, minlength=groups.size) / counts
+        if {"min", "max", "median"} & set(stats):
+            sv = v[np.lexsort((v, gid))]  # grouped, ascending within each group
+        for stat in stats:
+            if stat == "count":
+                res = counts
+            elif stat == "mean":
+                res = mean
+            elif stat == "std":
+                res = np.sqrt(np.bincount(gid, weights=(v - mean[gid]) ** 2, minlength=groups.size) / counts)
+            elif stat == "min":
+                res = sv[starts]
+            elif stat == "max":
+                res = sv[ends - 1]
+            else:
+                res = 0.5 * (sv[starts + (counts - 1) // 2] + sv[starts + counts // 2])
+            out[f"{name}_{stat}"] = res
+    return out
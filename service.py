@@ -0,0 +1,307 @@
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import List, Optional, Tuple
+import argparse, asyncio, json, os, time
+import numpy as np
+
+from greedy import _BATCH_KEYS, greedy_batch, greedy_earliest_finish, greedy_earliest_start, greedy_shortest_duration
+
+_SINGLE = {"EFT": greedy_earliest_finish, "EST": greedy_earliest_start, "SD": greedy_shortest_duration}
+
+@dataclass(frozen=True)
+class ScheduleReply:
+    count: int
+    selected: np.ndarray  # row positions of the request's intervals, in schedule order
+
+@dataclass(frozen=True)
+class ServiceStats:
+    requests: int
+    batches: int
+    mean_batch: float
+    p50_ms: float
+    p99_ms: float
+    throughput: float  # requests per second over the measured window
+
+    def __str__(self) -> str:
+        return (f"{self.requests} requests in {self.batches} batches (mean {self.mean_batch:.1f}), "
+                f"p50 {self.p50_ms:.3f} ms, p99 {self.p99_ms:.3f} ms, {self.throughput:,.0f} req/s")
+
+def _stats(latencies: List[float], batches: int, elapsed: float) -> ServiceStats:
+    lat = np.asarray(latencies) * 1e3
+    p50, p99 = (np.percentile(lat, [50, 99]) if lat.size else (np.nan, np.nan))
+    return ServiceStats(requests=lat.size, batches=batches, mean_batch=lat.size / max(batches, 1),
+                        p50_ms=float(p50), p99_ms=float(p99), throughput=lat.size / elapsed if elapsed > 0 else 0.0)
+
+class BatchingScheduler:
+    """
+    In-process asyncio front end for the greedy solvers. Concurrent solve() calls are
+    queued and collected into micro-batches: a batch closes when it holds max_batch
+    requests or max_delay seconds after its first request arrived, and is solved with one
+    greedy_batch call on a single worker thread, so the event loop never blocks on NumPy.
+    Requests arriving while a batch is being solved wait for the next one.
+    """
+
+    def __init__(self, criterion: str="EFT", max_batch: int=256, max_delay: float=0.002):
+        if criterion not in _BATCH_KEYS:
+            raise ValueError(f"Unknown criterion {criterion!r}; expected one of {tuple(_BATCH_KEYS)}")
+        if max_batch <= 0:
+            raise ValueError("max_batch must be positive")
+        self.criterion = criterion
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.reset_stats()
+
+    def reset_stats(self):
+        self._latencies: List[float] = []
+        self._batches = 0
+        self._since = time.perf_counter()
+
+    def stats(self) -> ServiceStats:
+        """Latency percentiles and throughput of the requests answered since the last reset_stats()."""
+        return _stats(self._latencies, self._batches, time.perf_counter() - self._since)
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="greedy-batch")
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def __aenter__(self) -> "BatchingScheduler":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    async def solve(self, intervals) -> ScheduleReply:
+        """Schedule one (m,2) request; resolves once its batch has been solved."""
+        if self._queue is None:
+            raise RuntimeError("BatchingScheduler is not started")
+        intervals = np.asarray(intervals, dtype=float).reshape(-1, 2)
+        fut = asyncio.get_running_loop().create_future()
+        await self._queue.put((intervals, fut, time.perf_counter()))
+        return await fut
+
+    async def _collect(self) -> list:
+        batch = [await self._queue.get()]
+        deadline = batch[0][2] + self.max_delay
+        while len(batch) < self.max_batch:
+            # Take whatever is already queued without yielding, then wait out the budget
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    def _solve_batch(self, arrays: List[np.ndarray]) -> List[ScheduleReply]:
+        offsets = np.zeros(len(arrays) + 1, dtype=np.intp)
+        np.cumsum([a.shape[0] for a in arrays], out=offsets[1:])
+        res = greedy_batch(np.concatenate(arrays), self.criterion, offsets=offsets, return_selected=True)
+        o = res.selected_offsets
+        return [ScheduleReply(count=int(c), selected=res.selected[o[b]:o[b + 1]])
+                for b, c in enumerate(res.counts)]
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            live = [(a, fut, t0) for a, fut, t0 in batch if not fut.cancelled()]
+            if not live:
+                continue
+            try:
+                replies = await loop.run_in_executor(self._executor, self._solve_batch, [a for a, _, _ in live])
+            except Exception as exc:  # e.g. a malformed request: fail this batch, keep serving
+                for _, fut, _ in live:
+                    if not fut.done():
+                        fut.set_exception(exc)
+                continue
+            done = time.perf_counter()
+            self._batches += 1
+            for (_, fut, t0), reply in zip(live, replies):
+                if not fut.done():
+                    fut.set_result(reply)
+                    self._latencies.append(done - t0)
+
+# -- socket front end: one JSON object per line ------------------------------------------
+#   request  {"id": any, "intervals": [[s, f], ...]}
+#   reply    {"id": any, "count": k, "selected": [i, ...]}  or  {"id": any, "error": "..."}
+
+async def _handle_client(scheduler: BatchingScheduler, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    lock = asyncio.Lock()
+    pending = set()
+
+    async def answer(line: bytes):
+        req = None
+        try:
+            req = json.loads(line)
+            reply = await scheduler.solve(req["intervals"])
+            out = {"id": req.get("id"), "count": reply.count, "selected": reply.selected.tolist()}
+        except Exception as exc:
+            out = {"id": req.get("id") if isinstance(req, dict) else None, "error": str(exc)}
+        async with lock:
+            writer.write(json.dumps(out).encode() + b"\n")
+            await writer.drain()
+
+    try:
+        # Requests on one connection are answered as their batches complete, not in order
+        while line := await reader.readline():
+            task = asyncio.ensure_future(answer(line))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+        if pending:
+            await asyncio.gather(*pending)
+    finally:
+        writer.close()
+
+async def serve(scheduler: BatchingScheduler, host: str="127.0.0.1", port: int=0,
+                path: Optional[str]=None) -> asyncio.AbstractServer:
+    """Start a TCP server (or a Unix socket server when path is given) in front of a started scheduler."""
+    handler = lambda r, w: _handle_client(scheduler, r, w)
+    if path is not None:
+        return await asyncio.start_unix_server(handler, path=path)
+    return await asyncio.start_server(handler, host=host, port=port)
+
+# -- load generator ----------------------------------------------------------------------
+
+def make_requests(count: int, n_min: int, n_max: int, seed: int=0, D: int=10, alpha: float=1.0) -> List[np.ndarray]:
+    """count random (m,2) requests with m ~ U{n_min..n_max}, drawn like datasets.generate_uniform_intervals."""
+    rng = np.random.default_rng(seed)
+    sizes = rng.integers(n_min, n_max + 1, size=count)
+    out = []
+    for m in sizes:
+        s = rng.uniform(0.0, alpha * m * D, size=m)
+        out.append(np.column_stack([s, s + rng.integers(1, D + 1, size=m)]))
+    return out
+
+async def _drive(requests: List[np.ndarray], concurrency: int, call) -> Tuple[List[float], float]:
+    """Issue requests from `concurrency` closed-loop clients; returns per-request latencies and elapsed time."""
+    latencies = []
+    it = iter(requests)
+
+    async def client():
+        for req in it:
+            t0 = time.perf_counter()
+            await call(req)
+            latencies.append(time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return latencies, time.perf_counter() - t0
+
+async def load_inproc(scheduler: BatchingScheduler, requests: List[np.ndarray], concurrency: int) -> ServiceStats:
+    scheduler.reset_stats()
+    latencies, elapsed = await _drive(requests, concurrency, scheduler.solve)
+    return _stats(latencies, scheduler.stats().batches, elapsed)
+
+async def load_socket(requests: List[np.ndarray], concurrency: int, connections: int=4, host: str="127.0.0.1",
+                      port: int=0, path: Optional[str]=None) -> ServiceStats:
+    """Drive a running server over `connections` pipelined connections; latency includes the socket round trip."""
+    conns = []
+    for _ in range(connections):
+        reader, writer = await (asyncio.open_unix_connection(path) if path else asyncio.open_connection(host, port))
+        waiting = {}
+
+        async def pump(reader=reader, waiting=waiting):
+            while line := await reader.readline():
+                reply = json.loads(line)
+                waiting.pop(reply["id"]).set_result(reply)
+
+        conns.append((writer, waiting, asyncio.ensure_future(pump())))
+
+    next_id = 0
+
+    async def call(req):
+        nonlocal next_id
+        next_id += 1
+        writer, waiting, _ = conns[next_id % len(conns)]
+        fut = asyncio.get_running_loop().create_future()
+        waiting[next_id] = fut
+        writer.write(json.dumps({"id": next_id, "intervals": req.tolist()}).encode() + b"\n")
+        reply = await fut
+        if "error" in reply:
+            raise RuntimeError(reply["error"])
+
+    try:
+        latencies, elapsed = await _drive(requests, concurrency, call)
+    finally:
+        for writer, _, task in conns:
+            writer.close()
+            task.cancel()
+    return _stats(latencies, 0, elapsed)
+
+async def load_unbatched(requests: List[np.ndarray], concurrency: int, criterion: str="EFT") -> ServiceStats:
+    """Baseline: every request is its own solver call on the same single worker thread."""
+    loop = asyncio.get_running_loop()
+    fn = _SINGLE[criterion]
+    with ThreadPoolExecutor(max_workers=1) as ex:
+        latencies, elapsed = await _drive(requests, concurrency,
+                                          lambda req: loop.run_in_executor(ex, fn, req, True))
+    return _stats(latencies, len(requests), elapsed)
+
+async def _main(args):
+    requests = make_requests(args.requests, args.n_min, args.n_max, seed=args.seed)
+    async with BatchingScheduler(args.criterion, args.max_batch, args.max_delay_ms / 1e3) as scheduler:
+        if args.transport == "inproc":
+            result = await load_inproc(scheduler, requests, args.concurrency)
+        else:
+            path = None
+            if args.transport == "unix":
+                path = os.path.join(args.socket_dir, f"greedy-{os.getpid()}.sock")
+            server = await serve(scheduler, port=0, path=path)
+            port = server.sockets[0].getsockname()[1] if path is None else 0
+            try:
+                scheduler.reset_stats()
+                result = await load_socket(requests, args.concurrency, args.connections, port=port, path=path)
+                batches = scheduler.stats().batches
+                result = replace(result, batches=batches, mean_batch=result.requests / max(batches, 1))
+            finally:
+                server.close()
+                await server.wait_closed()
+                if path is not None and os.path.exists(path):
+                    os.remove(path)
+    print(f"[batched/{args.transport}] {result}")
+    if args.baseline:
+        print(f"[unbatched]       {await load_unbatched(requests, args.concurrency, args.criterion)}")
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Micro-batching greedy scheduling service with a built-in load generator.")
+    ap.add_argument("--transport", choices=["inproc", "tcp", "unix"], default="inproc")
+    ap.add_argument("--criterion", choices=list(_BATCH_KEYS), default="EFT")
+    ap.add_argument("--requests", type=int, default=20000)
+    ap.add_argument("--concurrency", type=int, default=256, help="closed-loop clients")
+    ap.add_argument("--connections", type=int, default=4, help="socket connections shared by the clients")
+    # Request sizes: m ~ U{n_min..n_max} intervals
+    ap.add_argument("--n_min", type=int, default=8)
+    ap.add_argument("--n_max", type=int, default=64)
+    ap.add_argument("--max_batch", type=int, default=256)
+    ap.add_argument("--max_delay_ms", type=float, default=2.0)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--socket_dir", default="/tmp")
+    ap.add_argument("--baseline", action="store_true", help="also time one solver call per request")
+    asyncio.run(_main(ap.parse_args(argv)))
+
+if __name__ == "__main__":
+    main()
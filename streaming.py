@@ -0,0 +1,210 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional, Tuple
+import os, tempfile
+import numpy as np
+
+from greedy import GreedyResult, _JUMP_KERNELS, _jump_chain, _scan_compiled, _scan_loop
+
+# Sort key of each (m,2) row block, named as in IntervalSet.key()
+_ROW_KEYS = {
+    "finish": lambda rows: rows[:, 1],
+    "start": lambda rows: rows[:, 0],
+    "duration": lambda rows: rows[:, 1] - rows[:, 0],
+}
+
+# Rough resident bytes per row while sorting or merging a block: the (m,2) rows, key,
+# int64 permutation, gathered copy and stream indices
+_BYTES_PER_ROW = 64
+
+@dataclass(frozen=True)
+class StreamSelection:
+    indices: np.ndarray    # shape (k,) positions of the selected rows in the input stream
+    intervals: np.ndarray  # shape (k,2) the selected rows themselves
+
+def iter_chunks(source, chunk_size: int) -> Iterator[np.ndarray]:
+    """
+    Yield (m,2) chunks from an in-memory array or a .npy file path.
+    Files are opened with mmap_mode="r", so only the current chunk is resident.
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    data = np.load(source, mmap_mode="r") if isinstance(source, (str, os.PathLike)) else source
+    for lo in range(0, data.shape[0], chunk_size):
+        yield np.asarray(data[lo:lo + chunk_size], dtype=float)
+
+class StreamingEFT:
+    """
+    Online EFT admission for chunks that arrive already sorted by finish time.
+    State is O(1): the last admitted finish, the admitted count and the stream offset.
+    """
+
+    def __init__(self):
+        self.last_finish = -np.inf
+        self.count = 0
+        self.seen = 0
+        self._max_finish = -np.inf
+
+    def feed(self, chunk: np.ndarray, indices: Optional[np.ndarray]=None) -> StreamSelection:
+        """Admit rows of one finish-sorted chunk; indices default to consecutive stream positions."""
+        chunk = np.asarray(chunk, dtype=float)
+        m = chunk.shape[0]
+        if indices is None:
+            indices = np.arange(self.seen, self.seen + m)
+        self.seen += m
+        if m == 0:
+            return StreamSelection(indices=indices[:0], intervals=chunk[:0])
+
+        s = np.ascontiguousarray(chunk[:, 0])
+        f = np.ascontiguousarray(chunk[:, 1])
+        if f[0] < self._max_finish or np.any(f[1:] < f[:-1]):
+            raise ValueError("Online mode needs chunks sorted by finish time; use sorted_input=False")
+        self._max_finish = f[-1]
+
+        pos = _admit(s, f, "finish", self.last_finish)
+        if pos.size == 0:
+            return StreamSelection(indices=indices[:0], intervals=chunk[:0])
+        self.last_finish = f[pos[-1]]
+        self.count += int(pos.size)
+        return StreamSelection(indices=indices[pos], intervals=chunk[pos])
+
+def _admit(s: np.ndarray, f: np.ndarray, key: str, last_finish: float) -> np.ndarray:
+    """
+    Positions picked by the greedy scan of one key-sorted block, given the last selected
+    finish of the blocks before it. Start/finish orderings follow the jump chain from the
+    first admissible row; other orderings fall back to the (compiled if available) loop.
+    """
+    if key not in _JUMP_KERNELS:
+        if _scan_compiled is not None:
+            return _scan_compiled(s, f, last_finish)
+        return _scan_loop(s.tolist(), f.tolist(), last_finish)
+    if key == "start":
+        first = int(np.searchsorted(s, last_finish, side="left"))
+    else:
+        admissible = np.flatnonzero(s >= last_finish)
+        first = int(admissible[0]) if admissible.size else s.shape[0]
+    return _jump_chain(_JUMP_KERNELS[key](s, f), start=first)
+
+def _spill_sorted_runs(chunks: Iterable[np.ndarray], run_dir: str,
+                       key: str="finish") -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """Stable-sort each chunk by key and write it to run_dir; return (rows, idx, keys) runs reopened with mmap."""
+    paths = []
+    offset = 0
+    for r, chunk in enumerate(chunks):
+        chunk = np.asarray(chunk, dtype=float)
+        keys = _ROW_KEYS[key](chunk)
+        order = np.argsort(keys, kind="mergesort")
+        names = [os.path.join(run_dir, f"run_{r:06d}_{col}.npy") for col in ("rows", "idx", "keys")]
+        np.save(names[0], chunk[order])
+        np.save(names[1], order + offset)
+        np.save(names[2], keys[order])
+        paths.append(names)
+        offset += chunk.shape[0]
+    return [tuple(np.load(name, mmap_mode="r") for name in names) for names in paths]
+
+def _count_upto(keys: np.ndarray, idx: np.ndarray, bound_key: float, bound_idx: int) -> int:
+    """Length of the prefix of a (key, idx)-sorted window with (key, idx) <= (bound_key, bound_idx)."""
+    lo = int(np.searchsorted(keys, bound_key, side="left"))
+    hi = int(np.searchsorted(keys, bound_key, side="right"))
+    return lo + int(np.searchsorted(idx[lo:hi], bound_idx, side="right"))
+
+def _merge_runs(runs: List[Tuple[np.ndarray, np.ndarray, np.ndarray]],
+                block: int) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    k-way merge of key-sorted runs into (key, stream index) order, one block per run at a time.
+    Each step takes the smallest last-buffered (key, idx) among runs with unread rows as the
+    bound and emits every buffered row <= it: unread rows all compare greater, and the run
+    that set the bound empties its whole window, so each step makes progress and at most
+    len(runs) * block rows are resident, however many rows tie on the key.
+    """
+    cursors = [0] * len(runs)
+    while True:
+        live = [r for r in range(len(runs)) if cursors[r] < runs[r][0].shape[0]]
+        if not live:
+            return
+        windows = {}
+        for r in live:
+            lo, hi = cursors[r], cursors[r] + block
+            windows[r] = (np.asarray(runs[r][2][lo:hi]), np.asarray(runs[r][1][lo:hi]))
+        unfinished = [(windows[r][0][-1], windows[r][1][-1]) for r in live
+                      if cursors[r] + block < runs[r][0].shape[0]]
+
+        rows, idx, keys = [], [], []
+        for r in live:
+            wkeys, widx = windows[r]
+            take = _count_upto(wkeys, widx, *min(unfinished)) if unfinished else wkeys.size
+            rows.append(np.asarray(runs[r][0][cursors[r]:cursors[r] + take]))
+            idx.append(widx[:take])
+            keys.append(wkeys[:take])
+            cursors[r] += take
+        rows = np.concatenate(rows)
+        idx = np.concatenate(idx)
+        order = np.lexsort((idx, np.concatenate(keys)))
+        yield rows[order], idx[order]
+
+def streaming_earliest_finish(chunks: Iterable[np.ndarray], sorted_input: bool=True,
+                              run_dir: Optional[str]=None, merge_block: int=1 << 16) -> Iterator[StreamSelection]:
+    """
+    EFT over a stream of (m,2) chunks without materializing the whole input.
+
+    sorted_input=True: chunks are already in finish order; each chunk is admitted as it
+      arrives with O(chunk) memory.
+    sorted_input=False: external merge. Each chunk is sorted and spilled to run_dir
+      (a temporary directory by default), then the runs are k-way merged in blocks of
+      merge_block rows per run straight into the online admission.
+
+    Yields one StreamSelection per admitted block; indices are positions in the input stream.
+    """
+    if sorted_input:
+        sched = StreamingEFT()
+        for chunk in chunks:
+            sel = sched.feed(chunk)
+            if sel.indices.size:
+                yield sel
+        return
+
+    with tempfile.TemporaryDirectory(dir=run_dir) as tmp:
+        runs = _spill_sorted_runs(chunks, tmp, key="finish")
+        sched = StreamingEFT()
+        for rows, idx in _merge_runs(runs, merge_block):
+            sel = sched.feed(rows, idx)
+            if sel.indices.size:
+                yield sel
+        del runs  # release the memory maps before the directory is removed
+
+def external_greedy(source, key: str="finish", memory_limit: int=256 << 20, run_dir: Optional[str]=None,
+                    return_selected: bool=False) -> GreedyResult:
+    """
+    Out-of-core greedy_earliest_finish / _start / _shortest_duration (key "finish", "start"
+    or "duration") for inputs larger than RAM.
+
+    source is an (n,2) array or a .npy path, read memory-mapped in blocks. Blocks are
+    stable-sorted by key and spilled to run_dir (a temporary directory by default), then
+    k-way merged in (key, input position) order straight into the compatibility scan, which
+    carries only the last selected finish from block to block. Counts and selections match
+    the in-memory functions. memory_limit (bytes) bounds the resident run and merge
+    buffers; the returned selection (if requested) is kept in memory on top of it.
+    """
+    if key not in _ROW_KEYS:
+        raise ValueError(f"Unknown sort key {key!r}; expected one of {tuple(_ROW_KEYS)}")
+    run_rows = max(1, memory_limit // _BYTES_PER_ROW)
+    count = 0
+    picked = []
+    last_finish = -np.inf
+    with tempfile.TemporaryDirectory(dir=run_dir) as tmp:
+        runs = _spill_sorted_runs(iter_chunks(source, run_rows), tmp, key=key)
+        block = max(1, run_rows // max(1, len(runs)))
+        for rows, idx in _merge_runs(runs, block):
+            s = np.ascontiguousarray(rows[:, 0])
+            f = np.ascontiguousarray(rows[:, 1])
+            pos = _admit(s, f, key, last_finish)
+            if pos.size:
+                last_finish = f[pos[-1]]
+                count += int(pos.size)
+                if return_selected:
+                    picked.append(idx[pos])
+        del runs  # release the memory maps before the directory is removed
+    if not return_selected:
+        return GreedyResult(count=count, selected=None)
+    selected = np.concatenate(picked) if picked else np.empty(0, dtype=np.intp)
+    return GreedyResult(count=count, selected=selected)
@@ -0,0 +1,84 @@
+from __future__ import annotations
+import json, os, sys
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)  # the solvers are flat top-level modules
+
+from results_store import run_metadata
+from timing import measure
+
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "throughput_baselines.json")
+
+def pytest_addoption(parser):
+    group = parser.getgroup("throughput")
+    group.addoption("--throughput", action="store_true",
+                    help="run the throughput cases against tests/throughput_baselines.json")
+    group.addoption("--throughput-tolerance", type=float, default=2.0,
+                    help="fail a case whose median exceeds its baseline by this factor (default 2.0)")
+    group.addoption("--save-throughput-baselines", action="store_true",
+                    help="run the throughput cases and overwrite the stored baselines with this machine's medians")
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "throughput: timed case compared with a stored baseline (run with --throughput)")
+    config._throughput_results = {}
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--throughput") or config.getoption("--save-throughput-baselines"):
+        return
+    skip = pytest.mark.skip(reason="throughput case: run with --throughput")
+    for item in items:
+        if item.get_closest_marker("throughput") is not None:
+            item.add_marker(skip)
+
+def pytest_sessionfinish(session, exitstatus):
+    config = session.config
+    results = getattr(config, "_throughput_results", {})
+    if not config.getoption("--save-throughput-baselines") or not results:
+        return
+    stored = {"meta": {}, "cases": {}}
+    if os.path.exists(BASELINES):
+        with open(BASELINES, "r", encoding="utf-8") as f:
+            stored = json.load(f)
+    meta = run_metadata()
+    stored["meta"] = {k: meta[k] for k in ("started", "git_hash", "machine", "processor", "cpu_count", "python", "numpy")}
+    stored["cases"].update(results)
+    with open(BASELINES, "w", encoding="utf-8") as f:
+        json.dump(stored, f, indent=1, sort_keys=True)
+        f.write("\n")
+
+class Throughput:
+    """
+    pytest-benchmark-style fixture: throughput(fn, *args) times fn with timing.measure,
+    returns fn's result, and checks the median against the stored baseline of the case.
+    """
+
+    def __init__(self, config, name: str):
+        self.config = config
+        self.name = name
+        self.timing = None
+
+    def __call__(self, fn, *args, items: int=1):
+        result = fn(*args)
+        self.timing = measure(fn, *args, warmup=False, min_time=0.2, max_time=5.0, track_memory=False)
+        record = {"median": self.timing.median, "items_per_s": items / self.timing.median}
+        self.config._throughput_results[self.name] = record
+        if not self.config.getoption("--save-throughput-baselines"):
+            self._check(record)
+        return result
+
+    def _check(self, record: dict):
+        if not os.path.exists(BASELINES):
+            pytest.skip("no baselines stored; run with --save-throughput-baselines")
+        with open(BASELINES, "r", encoding="utf-8") as f:
+            base = json.load(f)["cases"].get(self.name)
+        if base is None:
+            pytest.skip(f"no baseline stored for {self.name}")
+        tol = self.config.getoption("--throughput-tolerance")
+        assert record["median"] <= base["median"] * tol, (
+            f"{self.name}: median {record['median'] * 1e3:.3f} ms vs baseline {base['median'] * 1e3:.3f} ms "
+            f"(tolerance x{tol})")
+
+@pytest.fixture
+def throughput(request):
+    return Throughput(request.config, request.node.name)
@@ -0,0 +1,323 @@
+"""
+Cross-engine conformance: every solver engine on the same seeded datasets must return
+the same counts, and every returned selection must be feasible. The greedy variants
+(single, batched, out-of-core, streaming, incremental, service) must also pick the
+same rows, since they all follow the stable sort order of greedy.py. The exhaustive
+engines and the weighted DP must reach the optimum, which EFT attains for positive
+durations (the instance model, d_i >= 1); zero-length intervals are only used to check
+that the engines agree with each other.
+"""
+from __future__ import annotations
+import asyncio
+import numpy as np
+import pytest
+
+import greedy
+from compat import BandedCompat, PackedCompat
+from datasets import INTERVAL_DTYPES, generate_cell_intervals
+from exhaustive import ENGINES as EXHAUSTIVE_ENGINES, _compat_matrix, exhaustive_optimal
+from generators import FAMILIES, FAMILY_PARAMS, generate_cell_family, generate_intervals
+from greedy import greedy_batch, greedy_earliest_finish, greedy_earliest_start, greedy_shortest_duration
+from incremental import IncrementalEFT
+from intervals import IntervalSet
+from partitioning import ENGINES as PARTITION_ENGINES, interval_partitioning
+from service import BatchingScheduler
+from sorting import SORT_ENGINES, resolve_sort_engine
+from streaming import external_greedy, iter_chunks, streaming_earliest_finish
+from weighted import weighted_interval_scheduling
+
+SEED = 125970
+CRITERIA = {
+    "EFT": (greedy_earliest_finish, "finish"),
+    "EST": (greedy_earliest_start, "start"),
+    "SD": (greedy_shortest_duration, "duration"),
+}
+KEYS = {
+    "finish": lambda a: a[:, 1],
+    "start": lambda a: a[:, 0],
+    "duration": lambda a: a[:, 1] - a[:, 0],
+}
+
+# -- datasets ----------------------------------------------------------------------------
+
+def _edge_cases():
+    """Hand-built ties: touching intervals, duplicates, zero-length intervals and shared finishes."""
+    return {
+        "touching": np.array([[0, 1], [1, 2], [2, 3], [1, 3], [0, 3]], dtype=float),
+        "duplicates": np.array([[0, 2], [0, 2], [2, 4], [2, 4], [1, 3]], dtype=float),
+        "zero_length": np.array([[1, 1], [1, 1], [0, 1], [1, 2], [0, 3], [3, 3]], dtype=float),
+        "same_finish": np.array([[0, 5], [1, 5], [2, 5], [4, 5], [5, 6]], dtype=float),
+        "single": np.array([[3, 7]], dtype=float),
+    }
+
+def _datasets(sizes, dtypes=("float64",), alphas=(0.1, 1.0, 5.0), D=10):
+    """(id, intervals) for the uniform generator of datasets.py, every generators.py family and the edge cases."""
+    out = []
+    for n in sizes:
+        for alpha in alphas:
+            for dtype in dtypes:
+                intervals, _ = generate_cell_intervals(n, D, alpha, SEED, trial=0, dtype=dtype)
+                out.append((f"uniform-n{n}-a{alpha}-{dtype}", intervals))
+        for family in FAMILIES[1:]:
+            intervals, _ = generate_cell_family(family, n, D, 1.0, SEED, trial=0)
+            out.append((f"{family}-n{n}", intervals))
+    out.extend(_edge_cases().items())
+    return out
+
+GREEDY_DATA = _datasets((7, 64, 1000), dtypes=("float64", "float32", "int64", "int32"))
+
+def _positive(data):
+    """Datasets without zero-length intervals, on which EFT is optimal under any tie order."""
+    return [(name, intervals) for name, intervals in data if np.all(intervals[:, 1] > intervals[:, 0])]
+
+OPT_DATA = _positive(GREEDY_DATA)
+SMALL_DATA = _positive(_datasets((6, 12), alphas=(0.3, 1.0)))
+MEDIUM_DATA = _positive(_datasets((24, 36), alphas=(0.3, 1.0)))
+
+def _ids(data):
+    return [name for name, _ in data]
+
+# -- reference and checks ----------------------------------------------------------------
+
+def _reference_greedy(intervals: np.ndarray, key: str) -> np.ndarray:
+    """The greedy rule spelled out: stable sort by key, keep each row starting at or after the last kept finish."""
+    order = np.argsort(KEYS[key](intervals), kind="mergesort")
+    picked, last = [], -np.inf
+    for i in order.tolist():
+        if intervals[i, 0] >= last:
+            picked.append(i)
+            last = intervals[i, 1]
+    return np.array(picked, dtype=np.intp)
+
+def assert_feasible(rows: np.ndarray):
+    """Selected (k,2) rows are pairwise compatible: in (start, finish) order each finishes by the next start."""
+    rows = np.asarray(rows, dtype=float).reshape(-1, 2)
+    rows = rows[np.lexsort((rows[:, 1], rows[:, 0]))]
+    assert np.all(rows[:-1, 1] <= rows[1:, 0]), "selection contains overlapping intervals"
+
+def assert_selection(intervals: np.ndarray, selected: np.ndarray, count: int):
+    selected = np.asarray(selected)
+    assert selected.shape == (count,)
+    assert np.unique(selected).size == count, "selection repeats an interval"
+    assert count == 0 or (selected.min() >= 0 and selected.max() < len(intervals))
+    assert_feasible(intervals[selected])
+
+# -- greedy engines ----------------------------------------------------------------------
+
+def _greedy_engines(key: str):
+    engines = ["python"]
+    if key in greedy._JUMP_KERNELS:
+        engines.append("jump")
+    if greedy._scan_compiled is not None:
+        engines.append("numba")
+    return engines
+
+@pytest.mark.parametrize("name,intervals", GREEDY_DATA, ids=_ids(GREEDY_DATA))
+@pytest.mark.parametrize("criterion", tuple(CRITERIA))
+def test_greedy_engines_agree(criterion, name, intervals):
+    fn, key = CRITERIA[criterion]
+    expected = _reference_greedy(intervals, key)
+    for engine in _greedy_engines(key):
+        for sort_engine in SORT_ENGINES:
+            try:
+                resolve_sort_engine(KEYS[key](intervals), sort_engine)
+            except ValueError:
+                continue  # radix / counting need integer keys of bounded range
+            res = fn(intervals, return_selected=True, engine=engine, sort_engine=sort_engine)
+            assert res.count == expected.size, (engine, sort_engine)
+            np.testing.assert_array_equal(res.selected, expected, err_msg=f"{engine}/{sort_engine}")
+            assert fn(intervals, engine=engine, sort_engine=sort_engine).count == res.count
+    res = fn(IntervalSet.from_array(intervals, dtype=intervals.dtype), return_selected=True)
+    np.testing.assert_array_equal(res.selected, expected)
+    assert_selection(intervals, expected, expected.size)
+
+@pytest.mark.parametrize("name,intervals", OPT_DATA, ids=_ids(OPT_DATA))
+def test_eft_dominates(name, intervals):
+    eft = greedy_earliest_finish(intervals).count
+    assert greedy_earliest_start(intervals).count <= eft
+    assert greedy_shortest_duration(intervals).count <= eft
+
+@pytest.mark.parametrize("criterion", tuple(CRITERIA))
+def test_batch_matches_single(criterion):
+    fn, _ = CRITERIA[criterion]
+    instances = [intervals for _, intervals in GREEDY_DATA if intervals.dtype == np.float64]
+    offsets = np.concatenate([[0], np.cumsum([len(a) for a in instances])])
+    flat = np.concatenate(instances)
+    ragged = greedy_batch(flat, criterion, offsets=offsets, return_selected=True)
+
+    padded = np.full((len(instances), max(len(a) for a in instances), 2), np.nan)
+    for b, intervals in enumerate(instances):
+        padded[b, :len(intervals)] = intervals
+    dense = greedy_batch(padded, criterion, return_selected=True)
+
+    for res in (ragged, dense):
+        for b, intervals in enumerate(instances):
+            single = fn(intervals, return_selected=True)
+            assert res.counts[b] == single.count
+            o = res.selected_offsets
+            np.testing.assert_array_equal(res.selected[o[b]:o[b + 1]], single.selected)
+    np.testing.assert_array_equal(greedy_batch(padded, criterion).counts, dense.counts)
+
+@pytest.mark.parametrize("criterion", tuple(CRITERIA))
+def test_service_matches_single(criterion):
+    fn, _ = CRITERIA[criterion]
+    instances = [intervals for _, intervals in GREEDY_DATA if intervals.dtype == np.float64]
+
+    async def run():
+        async with BatchingScheduler(criterion, max_batch=16) as scheduler:
+            return await asyncio.gather(*(scheduler.solve(a) for a in instances))
+
+    for intervals, reply in zip(instances, asyncio.run(run())):
+        single = fn(intervals, return_selected=True)
+        assert reply.count == single.count
+        np.testing.assert_array_equal(reply.selected, single.selected)
+
+@pytest.mark.parametrize("alpha", (0.3, 1.0))
+@pytest.mark.parametrize("D", (3, 7, 10, 100))
+@pytest.mark.parametrize("dtype", INTERVAL_DTYPES)
+def test_adversarial_gadgets(dtype, D, alpha):
+    # Whole gadgets only: the counts per gadget are exact when touching endpoints are
+    units = FAMILY_PARAMS["adversarial"]["units"]
+    gadgets = 50
+    intervals, _ = generate_intervals("adversarial", gadgets * (units + 4), D, alpha, SEED, dtype=dtype)
+    assert greedy_earliest_finish(intervals).count == (units + 2) * gadgets
+    assert greedy_earliest_start(intervals).count == 3 * gadgets
+    assert greedy_shortest_duration(intervals).count == units * gadgets + 1
+
+def test_float32_tick_range():
+    # Past 2^24 float32 rounds s + d onto s and the instance gains zero-length intervals
+    with pytest.raises(ValueError, match="float32"):
+        generate_cell_intervals(1000, 10000, 5.0, SEED, trial=0, dtype="float32")
+    with pytest.raises(ValueError, match="float32"):
+        generate_intervals("uniform", 1000, 10000, 5.0, SEED, dtype="float32")
+    intervals, _ = generate_cell_intervals(1000, 10000, 1.0, SEED, trial=0, dtype="float32")
+    assert np.all(intervals[:, 1] > intervals[:, 0])
+
+# -- out-of-core and online variants ------------------------------------------------------
+
+@pytest.mark.parametrize("name,intervals", GREEDY_DATA, ids=_ids(GREEDY_DATA))
+@pytest.mark.parametrize("criterion", tuple(CRITERIA))
+def test_external_greedy_matches(criterion, name, intervals, tmp_path):
+    fn, key = CRITERIA[criterion]
+    expected = fn(intervals, return_selected=True)
+    # ~97 rows per spilled run, so the larger datasets merge many runs
+    res = external_greedy(intervals, key=key, memory_limit=97 * 64, run_dir=str(tmp_path), return_selected=True)
+    assert res.count == expected.count
+    np.testing.assert_array_equal(res.selected, expected.selected)
+
+def test_external_greedy_from_file(tmp_path):
+    intervals, _ = generate_cell_intervals(5000, 10, 1.0, SEED, trial=1)
+    path = str(tmp_path / "intervals.npy")
+    np.save(path, intervals)
+    res = external_greedy(path, memory_limit=1 << 16, run_dir=str(tmp_path), return_selected=True)
+    np.testing.assert_array_equal(res.selected, greedy_earliest_finish(intervals, return_selected=True).selected)
+
+@pytest.mark.parametrize("name,intervals", GREEDY_DATA, ids=_ids(GREEDY_DATA))
+def test_streaming_matches_eft(name, intervals, tmp_path):
+    expected = greedy_earliest_finish(intervals, return_selected=True).selected
+
+    def collect(selections):
+        picked = [sel.indices for sel in selections]
+        return np.concatenate(picked) if picked else np.empty(0, dtype=np.intp)
+
+    unsorted = collect(streaming_earliest_finish(iter_chunks(intervals, 50), sorted_input=False,
+                                                 run_dir=str(tmp_path), merge_block=16))
+    np.testing.assert_array_equal(unsorted, expected)
+
+    order = np.argsort(intervals[:, 1], kind="mergesort")
+    presorted = collect(streaming_earliest_finish(iter_chunks(intervals[order], 50)))
+    np.testing.assert_array_equal(order[presorted], expected)
+
+@pytest.mark.parametrize("name,intervals", GREEDY_DATA[:len(GREEDY_DATA) // 2], ids=_ids(GREEDY_DATA[:len(GREEDY_DATA) // 2]))
+def test_incremental_matches_recompute(name, intervals):
+    rng = np.random.default_rng(SEED)
+    sched = IncrementalEFT(intervals, block_size=16)
+    live = list(range(len(intervals)))
+
+    def check():
+        handles, rows = sched.to_array()
+        expected = greedy_earliest_finish(rows, return_selected=True)
+        assert sched.count == expected.count
+        np.testing.assert_array_equal(sched.current_schedule(), handles[expected.selected])
+
+    check()
+    span = float(intervals[:, 1].max())
+    for step in range(60):
+        if live and rng.random() < 0.4:
+            sched.remove(live.pop(int(rng.integers(len(live)))))
+        else:
+            s = float(rng.integers(0, int(span) + 1))
+            live.append(sched.insert(s, s + float(rng.integers(0, 4))))
+        if step % 10 == 9:
+            check()
+    check()
+
+# -- optimal solvers ---------------------------------------------------------------------
+
+def _exhaustive_cases(data, engines):
+    return [pytest.param(engine, intervals, id=f"{engine}-{name}") for name, intervals in data for engine in engines]
+
+@pytest.mark.parametrize("engine,intervals",
+                         _exhaustive_cases(SMALL_DATA, EXHAUSTIVE_ENGINES) +
+                         _exhaustive_cases(MEDIUM_DATA, ("dp", "bnb")))
+def test_exhaustive_engines_reach_optimum(engine, intervals):
+    opt = greedy_earliest_finish(intervals).count
+    res = exhaustive_optimal(intervals, engine=engine, workers=2)
+    assert res.count == opt
+    assert res.selected.shape == (opt, 2)
+    assert_feasible(res.selected)
+    assert exhaustive_optimal(intervals, return_selected=False, engine=engine, workers=2).count == opt
+
+def test_parallel_exhaustive_medium():
+    # One larger instance through the process pool; the others above go through the same search
+    intervals = dict(MEDIUM_DATA)["uniform-n36-a0.3-float64"]
+    res = exhaustive_optimal(intervals, engine="parallel", workers=2)
+    assert res.count == greedy_earliest_finish(intervals).count
+    assert_feasible(res.selected)
+
+@pytest.mark.parametrize("name,intervals", OPT_DATA, ids=_ids(OPT_DATA))
+def test_weighted_unit_weights_is_eft(name, intervals):
+    res = weighted_interval_scheduling(intervals.astype(float), np.ones(len(intervals)))
+    assert res.total == greedy_earliest_finish(intervals).count
+    assert_selection(intervals, res.selected, res.count)
+
+@pytest.mark.parametrize("name,intervals", GREEDY_DATA, ids=_ids(GREEDY_DATA))
+def test_weighted_dominates_greedy(name, intervals):
+    weights = np.random.default_rng(SEED).integers(1, 10, size=len(intervals)).astype(float)
+    res = weighted_interval_scheduling(intervals.astype(float), weights)
+    assert_selection(intervals, res.selected, res.count)
+    assert res.total == pytest.approx(weights[res.selected].sum())
+    for fn, _ in CRITERIA.values():
+        assert res.total >= weights[fn(intervals, return_selected=True).selected].sum() - 1e-9
+
+# -- partitioning and compatibility structures --------------------------------------------
+
+@pytest.mark.parametrize("name,intervals", GREEDY_DATA, ids=_ids(GREEDY_DATA))
+def test_partitioning_engines_agree(name, intervals):
+    s, f = intervals[:, 0], intervals[:, 1]
+    # Depth at every start point: intervals [s_j, f_j) covering it; the minimum machine count
+    # when no interval is zero-length, a lower bound otherwise
+    depth = int(np.max(np.sum((s[None, :] <= s[:, None]) & (f[None, :] > s[:, None]), axis=1)))
+    results = [interval_partitioning(intervals, engine=engine, return_assignment=True)
+               for engine in PARTITION_ENGINES]
+    for res in results:
+        assert res.machines == results[0].machines
+        assert res.machines == depth if np.all(f > s) else res.machines >= depth
+        assert res.assignment.shape == (len(intervals),)
+        assert res.assignment.min() >= 0 and res.assignment.max() < res.machines
+        for m in np.unique(res.assignment):
+            assert_feasible(intervals[res.assignment == m])
+
+@pytest.mark.parametrize("name,intervals", SMALL_DATA + MEDIUM_DATA, ids=_ids(SMALL_DATA + MEDIUM_DATA))
+def test_compat_structures_match_matrix(name, intervals):
+    compat = _compat_matrix(intervals)
+    np.fill_diagonal(compat, False)
+    packed = PackedCompat.from_intervals(intervals)
+    np.testing.assert_array_equal(packed.to_bool(), compat)
+    np.testing.assert_array_equal(packed.degrees(), compat.sum(axis=1))
+    banded = BandedCompat(intervals)
+    conflicts = ~compat
+    np.fill_diagonal(conflicts, False)
+    np.testing.assert_array_equal(banded.degrees(), conflicts.sum(axis=1))
+    for i in range(len(intervals)):
+        np.testing.assert_array_equal(np.sort(banded.conflicts(i)), np.flatnonzero(conflicts[i]))
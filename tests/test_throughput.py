@@ -0,0 +1,75 @@
+"""
+Throughput cases at fixed n, compared with tests/throughput_baselines.json (see conftest.py).
+Skipped unless pytest runs with --throughput; --save-throughput-baselines re-records them.
+Each case also checks its answer, so a faster engine cannot pass by being wrong.
+"""
+from __future__ import annotations
+import numpy as np
+import pytest
+
+from datasets import generate_cell_intervals
+from exhaustive import exhaustive_optimal
+from generators import generate_cell_family
+from greedy import greedy_batch, greedy_earliest_finish, greedy_earliest_start, greedy_shortest_duration
+from partitioning import interval_partitioning
+from streaming import external_greedy
+from weighted import weighted_interval_scheduling
+
+pytestmark = pytest.mark.throughput
+
+N = 1 << 16
+SEED = 125970
+GREEDY = {"EFT": greedy_earliest_finish, "EST": greedy_earliest_start, "SD": greedy_shortest_duration}
+
+def _uniform(n=N, dtype="float64", alpha=1.0):
+    return generate_cell_intervals(n, 10, alpha, SEED, trial=0, dtype=dtype)[0]
+
+@pytest.mark.parametrize("dtype", ["float64", "int64"])
+@pytest.mark.parametrize("criterion", tuple(GREEDY))
+def test_greedy(throughput, criterion, dtype):
+    intervals = _uniform(dtype=dtype)
+    res = throughput(GREEDY[criterion], intervals, items=N)
+    assert res.count <= greedy_earliest_finish(intervals).count
+
+@pytest.mark.parametrize("family", ["heavy_tailed", "adversarial"])
+def test_greedy_eft_family(throughput, family):
+    intervals = generate_cell_family(family, N, 10, 1.0, SEED, trial=0)[0]
+    res = throughput(greedy_earliest_finish, intervals, items=N)
+    assert res.count == weighted_interval_scheduling(intervals, np.ones(N)).total
+
+def test_greedy_batch(throughput):
+    # 1024 service-sized instances of 64 intervals each
+    intervals = _uniform(1024 * 64).reshape(1024, 64, 2)
+    res = throughput(greedy_batch, intervals, "EFT", items=1024)
+    assert res.counts[0] == greedy_earliest_finish(intervals[0]).count
+
+def test_external_greedy(throughput, tmp_path):
+    intervals = _uniform()
+
+    def run():
+        return external_greedy(intervals, memory_limit=1 << 20, run_dir=str(tmp_path))
+
+    res = throughput(run, items=N)
+    assert res.count == greedy_earliest_finish(intervals).count
+
+def test_exhaustive_dp(throughput):
+    intervals = _uniform()
+    res = throughput(exhaustive_optimal, intervals, False, "dp", items=N)
+    assert res.count == greedy_earliest_finish(intervals).count
+
+def test_exhaustive_bnb(throughput):
+    intervals = _uniform(32, alpha=0.3)
+    res = throughput(exhaustive_optimal, intervals, False, "bnb", items=1)
+    assert res.count == greedy_earliest_finish(intervals).count
+
+def test_weighted(throughput):
+    intervals = _uniform()
+    weights = np.random.default_rng(SEED).integers(1, 10, size=N).astype(float)
+    res = throughput(weighted_interval_scheduling, intervals, weights, items=N)
+    assert res.total >= weights[greedy_earliest_finish(intervals, return_selected=True).selected].sum()
+
+@pytest.mark.parametrize("engine", ["sweep", "heap"])
+def test_partitioning(throughput, engine):
+    intervals = _uniform()
+    res = throughput(interval_partitioning, intervals, engine, items=N)
+    assert res.machines == interval_partitioning(intervals).machines
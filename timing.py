@@ -0,0 +1,105 @@
+from __future__ import annotations
+from dataclasses import dataclass
+import gc, time, tracemalloc
+import numpy as np
+
+# Per-measurement CSV columns, stored alongside the existing t_<name> column (which holds the median)
+STAT_SUFFIXES = ("min", "q1", "q3")
+EXTRA_PREFIXES = ("cpu", "mem", "reps")
+
+@dataclass(frozen=True)
+class Timing:
+    median: float      # seconds per call (wall, perf_counter)
+    min: float
+    q1: float
+    q3: float
+    cpu: float         # median seconds per call (process_time)
+    peak_bytes: int    # tracemalloc peak of one extra call, -1 if not measured
+    repeats: int       # samples taken
+    number: int        # calls per sample
+    outliers: int      # samples outside the Tukey fences [q1 - 1.5 IQR, q3 + 1.5 IQR]
+
+    @property
+    def iqr(self) -> float:
+        return self.q3 - self.q1
+
+    def stats(self) -> list:
+        """Values for stat_columns(name), in the same order."""
+        return [self.min, self.q1, self.q3, self.cpu, self.peak_bytes, self.repeats]
+
+def stat_columns(name: str) -> list[str]:
+    """Extra CSV columns for one measured function: t_EFT_min, t_EFT_q1, t_EFT_q3, cpu_EFT, mem_EFT, reps_EFT."""
+    return [f"t_{name}_{s}" for s in STAT_SUFFIXES] + [f"{p}_{name}" for p in EXTRA_PREFIXES]
+
+def _run_batch(fn, args, number: int):
+    c0 = time.process_time()
+    t0 = time.perf_counter()
+    for _ in range(number):
+        fn(*args)
+    t1 = time.perf_counter()
+    c1 = time.process_time()
+    return t1 - t0, c1 - c0
+
+def _calibrate(fn, args, min_sample: float):
+    """
+    Smallest power-of-two call count whose batch takes at least min_sample (cf. timeit.autorange).
+    Returns (number, wall, cpu) of the final batch, which doubles as the first sample.
+    """
+    number = 1
+    while True:
+        wall, cpu = _run_batch(fn, args, number)
+        if wall >= min_sample or number >= 1 << 20:
+            return number, wall, cpu
+        number *= 2
+
+def peak_memory(fn, *args) -> int:
+    """Peak bytes allocated (as seen by tracemalloc, which NumPy reports to) during one call."""
+    if tracemalloc.is_tracing():
+        return -1  # someone else owns tracing; don't disturb their snapshot
+    tracemalloc.start()
+    try:
+        fn(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def measure(fn, *args, warmup: bool=True, min_time: float=0.2, max_time: float=10.0,
+            min_repeat: int=5, min_sample: float=1e-3, track_memory: bool=True) -> Timing:
+    """
+    Time fn(*args) robustly.
+
+    - warm-up: one untimed call on the same input
+    - calibration: each sample runs fn `number` times so it lasts >= min_sample
+    - sampling: at least min_repeat samples and min_time of wall time, stopping early
+      only once max_time is exceeded (so one very slow call is measured once)
+    - GC is disabled while sampling; wall (perf_counter) and CPU (process_time) are both kept
+    - peak memory comes from a separate tracemalloc run, so tracing never skews the timings
+    """
+    if warmup:
+        fn(*args)
+    gc_was_enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        number, w, c = _calibrate(fn, args, min_sample)
+        wall, cpu = [w / number], [c / number]
+        while True:
+            elapsed = time.perf_counter() - start
+            if elapsed >= max_time or (len(wall) >= min_repeat and elapsed >= min_time):
+                break
+            w, c = _run_batch(fn, args, number)
+            wall.append(w / number)
+            cpu.append(c / number)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    wall = np.array(wall)
+    q1, med, q3 = np.percentile(wall, [25, 50, 75])
+    fence = 1.5 * (q3 - q1)
+    outliers = int(np.count_nonzero((wall < q1 - fence) | (wall > q3 + fence)))
+    peak = peak_memory(fn, *args) if track_memory else -1
+    return Timing(median=float(med), min=float(wall.min()), q1=float(q1), q3=float(q3),
+                  cpu=float(np.median(cpu)), peak_bytes=int(peak), repeats=len(wall),
+                  number=number, outliers=outliers)
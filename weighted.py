@@ -0,0 +1,76 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Optional
+import numpy as np
+
+from intervals import finish_predecessors
+
+try:
+    import numba
+except ImportError:  # optional: compiled DP loop
+    numba = None
+
+@dataclass(frozen=True)
+class WeightedResult:
+    total: float
+    order: np.ndarray = field(repr=False)  # finish-time order of the input rows
+    pred: np.ndarray = field(repr=False)   # pred[j] = number of rows (in order) compatible before row j
+    opt: np.ndarray = field(repr=False)    # opt[j] = best total over the first j rows (in order)
+
+    @cached_property
+    def selected(self) -> np.ndarray:
+        """Indices into the input rows of an optimal schedule, in schedule order (built on first access)."""
+        picked = []
+        opt, pred = self.opt, self.pred
+        j = opt.shape[0] - 1
+        while j > 0:
+            if opt[j] == opt[j - 1]:
+                j -= 1
+            else:
+                picked.append(j - 1)
+                j = int(pred[j - 1])
+        return self.order[np.array(picked[::-1], dtype=np.intp)]
+
+    @property
+    def count(self) -> int:
+        return int(self.selected.size)
+
+def _dp_loop(pred, weights, opt):
+    # OPT(j+1) = max(OPT(j), w_j + OPT(p(j)))
+    for j in range(len(weights)):
+        take = weights[j] + opt[pred[j]]
+        prev = opt[j]
+        opt[j + 1] = take if take > prev else prev
+    return opt
+
+_dp_compiled = numba.njit(cache=True)(_dp_loop) if numba is not None else None
+
+def _split_weights(intervals: np.ndarray, weights: Optional[np.ndarray]):
+    if weights is None:
+        if intervals.ndim != 2 or intervals.shape[1] != 3:
+            raise ValueError("Expected (n,3) [start, finish, weight] rows or an explicit weights array")
+        return intervals[:, :2], intervals[:, 2]
+    weights = np.asarray(weights, dtype=float)
+    if weights.shape != (intervals.shape[0],):
+        raise ValueError(f"weights must have shape ({intervals.shape[0]},), got {weights.shape}")
+    return intervals, weights
+
+def weighted_interval_scheduling(intervals: np.ndarray, weights: Optional[np.ndarray]=None) -> WeightedResult:
+    """
+    Maximum-weight set of pairwise-compatible intervals (f_i <= s_j), O(n log n).
+    intervals is (n,3) [start, finish, weight], or (n,2) with weights passed separately.
+    Predecessors come from one vectorized searchsorted over the sorted finish times;
+    the DP runs compiled with numba when available. The selection is reconstructed
+    only when WeightedResult.selected is accessed.
+    """
+    intervals, weights = _split_weights(intervals, weights)
+    n = intervals.shape[0]
+    order, _, _, pred = finish_predecessors(intervals)
+    w = weights[order]
+
+    if _dp_compiled is not None:
+        opt = _dp_compiled(pred, w, np.zeros(n + 1))
+    else:
+        opt = np.array(_dp_loop(pred.tolist(), w.tolist(), [0.0] * (n + 1)))
+    return WeightedResult(total=float(opt[n]), order=order, pred=pred, opt=opt)